@@ -7,116 +7,996 @@ PPT生成器
 import os
 import sys
 import json
+import time
+import random
+import shutil
+import struct
+import hashlib
 import argparse
+import threading
+import multiprocessing
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
 
+# 风格文件中「页面类型模板」各小节与页面类型的对应关系
+PAGE_TYPE_SECTIONS = {
+    "cover": "封面页模板",
+    "content": "内容页模板",
+    "data": "数据页模板",
+}
+
+# 未提供页面类型模板的风格文件沿用的默认版式说明（{content} 为页面文字）
+DEFAULT_PAGE_PROMPTS = {
+    "cover": "请根据视觉平衡美学，生成封面页。在中心放置一个巨大的复杂3D玻璃物体，并覆盖粗体大字：\n\n{content}\n\n背景有延伸的极光波浪。",
+    "data": "请生成数据页或总结页。使用分屏设计，左侧排版以下文字，右侧悬浮巨大的发光3D数据可视化图表：\n\n{content}",
+    "content": "请生成内容页。使用Bento网格布局，将以下内容组织在模块化的圆角矩形容器中，容器材质必须是带有模糊效果的磨砂玻璃：\n\n{content}",
+}
+
+# 启用 --style-layouts 且风格文件提供页面类型模板时使用的版式说明
+STYLE_PAGE_PROMPTS = {
+    "cover": "请根据视觉平衡美学，生成封面页。构图：{layout}\n\n封面文字：\n\n{content}",
+    "data": "请生成数据页或总结页。构图：{layout}\n\n页面文字：\n\n{content}",
+    "content": "请生成内容页。构图：{layout}\n\n页面内容：\n\n{content}",
+}
+
+
+def _extract_section(content, heading, level="##"):
+    """提取 markdown 中指定标题下、下一个同级标题之前的内容"""
+    marker = f"{level} {heading}"
+    start_idx = content.find(marker)
+    if start_idx == -1:
+        return None
+    body_start = start_idx + len(marker)
+    end_idx = content.find(f"\n{level} ", body_start)
+    return content[body_start:end_idx if end_idx != -1 else len(content)].strip()
+
+
+def _extract_layout(section):
+    """从页面类型小节中提取「构图逻辑」，没有该字段时使用除「使用场景」外的全部文字"""
+    lines = [line.strip() for line in section.splitlines() if line.strip()]
+    for line in lines:
+        if line.startswith("构图逻辑"):
+            return line.split("：", 1)[-1].strip()
+    return " ".join(line for line in lines if not line.startswith("使用场景")) or None
+
+
+class StyleTemplate:
+    """解析后的风格模板
+
+    包含基础提示词模板与「页面类型模板」中各页面类型的构图逻辑。
+    每种页面类型的提示词在构造时预先拆分为前缀与后缀，生成单页提示词时
+    只需拼接页面文字。默认使用内置版式说明（与解析缓存引入前的提示词
+    完全一致，渲染缓存与续跑哈希不受影响）；use_layouts=True 时改用
+    风格文件中的构图逻辑。
+    """
+
+    def __init__(self, base, page_layouts=None, path=None):
+        self.path = path
+        self.base = base
+        self.page_layouts = page_layouts or {}
+        self._parts = {}
+        self._layout_parts = {}
+        for page_type in PAGE_TYPE_SECTIONS:
+            self._parts[page_type] = self._split(DEFAULT_PAGE_PROMPTS[page_type])
+            layout = self.page_layouts.get(page_type)
+            if layout:
+                self._layout_parts[page_type] = self._split(
+                    STYLE_PAGE_PROMPTS[page_type].replace("{layout}", layout)
+                )
+
+    def _split(self, body):
+        head, tail = body.split("{content}", 1)
+        return f"{self.base}\n\n{head}", tail
+
+    @classmethod
+    def parse(cls, content, path=None):
+        """从风格文件内容解析模板"""
+        base = _extract_section(content, "基础提示词模板")
+        page_section = _extract_section(content, "页面类型模板")
+        if base is None or page_section is None:
+            print(f"警告: 无法解析风格模板{f' ({path})' if path else ''}，使用完整文件内容")
+            return cls(content, path=path)
+
+        page_layouts = {}
+        for page_type, heading in PAGE_TYPE_SECTIONS.items():
+            section = _extract_section(page_section, heading, level="###")
+            if section:
+                layout = _extract_layout(section)
+                if layout:
+                    page_layouts[page_type] = layout
+        return cls(base, page_layouts, path=path)
+
+    def build_prompt(self, page_type, content_text, use_layouts=False):
+        """拼接指定页面类型的完整提示词
+
+        use_layouts 为 True 且风格文件提供了该页面类型的构图逻辑时使用
+        风格文件版式，否则使用内置版式说明。
+        """
+        page_type = page_type if page_type in self._parts else "content"
+        parts = self._layout_parts.get(page_type) if use_layouts else None
+        head, tail = parts or self._parts[page_type]
+        return f"{head}{content_text}{tail}"
+
+
+# 已解析的风格模板：{绝对路径: ((mtime_ns, size), StyleTemplate)}
+_STYLE_CACHE = {}
+_STYLE_CACHE_LOCK = threading.Lock()
+
+
+def load_style(style_path):
+    """加载并解析风格模板，同一进程内按文件修改时间缓存复用"""
+    path = os.path.abspath(style_path)
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    with _STYLE_CACHE_LOCK:
+        cached = _STYLE_CACHE.get(path)
+        if cached and cached[0] == version:
+            return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        style = StyleTemplate.parse(f.read(), path=style_path)
+
+    with _STYLE_CACHE_LOCK:
+        _STYLE_CACHE[path] = (version, style)
+    return style
+
+
 def load_style_template(style_path):
-    """加载风格模板"""
-    with open(style_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    """加载风格模板，返回基础提示词模板文本"""
+    return load_style(style_path).base
+
 
-    # 提取基础提示词模板部分
-    start_marker = "## 基础提示词模板"
-    end_marker = "## 页面类型模板"
+def validate_plan(slides_plan):
+    """校验slides规划结构，返回错误信息列表（为空表示通过）"""
+    if not isinstance(slides_plan, dict) or not isinstance(slides_plan.get('slides'), list):
+        return ["缺少 slides 列表"]
 
-    start_idx = content.find(start_marker)
-    end_idx = content.find(end_marker)
+    errors = []
+    seen = set()
+    for index, slide_info in enumerate(slides_plan['slides'], start=1):
+        if not isinstance(slide_info, dict):
+            errors.append(f"第 {index} 项不是对象")
+            continue
+        slide_number = slide_info.get('slide_number')
+        if not isinstance(slide_number, int):
+            errors.append(f"第 {index} 项缺少整数 slide_number")
+        elif slide_number in seen:
+            errors.append(f"slide_number 重复: {slide_number}")
+        else:
+            seen.add(slide_number)
+        if not slide_info.get('content'):
+            errors.append(f"第 {index} 项缺少 content")
 
-    if start_idx == -1 or end_idx == -1:
-        print("警告: 无法解析风格模板，使用完整文件内容")
-        return content
+    if not slides_plan['slides']:
+        errors.append("slides 列表为空")
+    return errors
 
-    template = content[start_idx + len(start_marker):end_idx].strip()
-    return template
 
+def generate_prompt(style_template, page_type, content_text, slide_number, total_slides, use_layouts=False):
+    """生成单页提示词
 
-def generate_prompt(style_template, page_type, content_text, slide_number, total_slides):
-    """生成单页提示词"""
-    prompt = f"{style_template}\n\n"
+    style_template 为 load_style() 返回的 StyleTemplate；传入字符串时按
+    仅含基础提示词模板处理。use_layouts 见 StyleTemplate.build_prompt()。
+    """
+    if not isinstance(style_template, StyleTemplate):
+        style_template = StyleTemplate(style_template)
 
     if page_type == "cover" or slide_number == 1:
         # 封面页
-        prompt += f"""请根据视觉平衡美学，生成封面页。在中心放置一个巨大的复杂3D玻璃物体，并覆盖粗体大字：
+        return style_template.build_prompt("cover", content_text, use_layouts)
+    elif page_type == "data" or slide_number == total_slides:
+        # 数据页/总结页
+        return style_template.build_prompt("data", content_text, use_layouts)
+    else:
+        # 内容页
+        return style_template.build_prompt("content", content_text, use_layouts)
 
-{content_text}
 
-背景有延伸的极光波浪。"""
+# 图片生成模型参数
+MODEL_NAME = "gemini-3-pro-image-preview"
+ASPECT_RATIO = "16:9"
 
-    elif page_type == "data" or slide_number == total_slides:
-        # 数据页/总结页
-        prompt += f"""请生成数据页或总结页。使用分屏设计，左侧排版以下文字，右侧悬浮巨大的发光3D数据可视化图表：
 
-{content_text}"""
+# 渲染缓存默认配置
+DEFAULT_CACHE_DIR = os.path.join("outputs", ".render_cache")
+DEFAULT_CACHE_SIZE_MB = 2048
 
-    else:
-        # 内容页
-        prompt += f"""请生成内容页。使用Bento网格布局，将以下内容组织在模块化的圆角矩形容器中，容器材质必须是带有模糊效果的磨砂玻璃：
 
-{content_text}"""
+def render_cache_key(prompt, model, resolution, aspect_ratio):
+    """计算渲染缓存键（最终提示词 + 模型 + 分辨率 + 宽高比的SHA-256）"""
+    payload = json.dumps([prompt, model, resolution, aspect_ratio], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
 
-    return prompt
 
+class RenderCache:
+    """按内容寻址的幻灯片图片磁盘缓存
 
-def generate_slide(prompt, slide_number, output_dir, resolution="2K"):
-    """生成单页PPT图片（使用Nano Banana API）"""
-    try:
-        from google import genai
-        from google.genai import types
-    except ImportError:
-        print("错误: 未安装 google-genai 库")
-        print("请运行: pip install google-genai")
-        sys.exit(1)
+    以 render_cache_key() 为文件名保存已生成的PNG。命中时刷新文件修改时间，
+    总大小超过上限时按修改时间淘汰最久未使用的条目（LRU）。
+    """
 
-    # 获取API密钥
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        print("错误: 未设置 GEMINI_API_KEY 环境变量")
-        print("请设置: export GEMINI_API_KEY='your-api-key'")
-        sys.exit(1)
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_SIZE_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = None
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
 
-    print(f"正在生成第 {slide_number} 页...")
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.png")
 
-    try:
-        client = genai.Client(api_key=api_key)
+    def get(self, key, dest_path):
+        """命中时将缓存图片复制到 dest_path 并返回 True"""
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, dest_path)
+            os.utime(path)  # 刷新最近使用时间
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def put(self, key, src_path):
+        """将新生成的图片存入缓存，必要时淘汰旧条目"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # 先写临时文件再原子替换，避免并发读取到不完整的图片
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                shutil.copyfile(src_path, tmp_path)
+                # 覆盖已有条目时先扣除旧文件大小，避免重复计入
+                try:
+                    replaced_size = os.path.getsize(path)
+                except FileNotFoundError:
+                    replaced_size = 0
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"  ⚠ 写入渲染缓存失败: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+
+            if self._size is not None:
+                self._size += os.path.getsize(path) - replaced_size
+            self._evict()
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".png"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield stat.st_mtime, stat.st_size, path
+
+    def _evict(self):
+        """总大小超过上限时删除最久未使用的条目（调用方需持有锁）"""
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        if self._size <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(self._entries()):
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= size
+            self.evictions += 1
+
+    def stats(self):
+        """返回缓存命中统计"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "cache_dir": self.cache_dir
+        }
+
+
+# 可重试的HTTP状态码：限流与服务端错误
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def _error_status_code(error):
+    """从API异常中提取HTTP状态码（google-genai 的 APIError 使用 code 属性）"""
+    for attr in ("code", "status_code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def is_retryable_error(error):
+    """判断异常是否为可重试的临时错误（429/5xx、连接中断、超时）"""
+    if _error_status_code(error) in RETRYABLE_STATUS_CODES:
+        return True
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    # httpx 的网络异常不继承内置 ConnectionError，按类名识别
+    return type(error).__name__ in ("ConnectError", "ReadTimeout", "ConnectTimeout", "RemoteProtocolError")
+
+
+class RequestScheduler:
+    """图片API请求调度器
+
+    令牌桶按每分钟请求数（rpm）发放请求许可，遇到429/5xx等临时错误时
+    使用带抖动的指数退避重试，并统计吞吐量，供并发生成时共享。
+    rpm 为 None 时不限流，只做重试。
+    """
+
+    def __init__(self, rpm=None, max_retries=4, base_delay=2.0, max_delay=60.0):
+        self.rpm = rpm
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        # 令牌桶容量为1：请求严格按 60/rpm 秒的间隔发出
+        self._tokens = 1.0
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+        self.backoff_seconds = 0.0
+
+    def acquire(self):
+        """阻塞直到令牌桶允许发出下一个请求，返回等待秒数"""
+        if not self.rpm:
+            return 0.0
+
+        rate = self.rpm / 60.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(1.0, self._tokens + (now - self._last_refill) * rate)
+                self._last_refill = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    self.throttled_seconds += waited
+                    return waited
+                delay = (1.0 - self._tokens) / rate
+            time.sleep(delay)
+            waited += delay
+
+    def backoff(self, attempt):
+        """第 attempt 次重试前的等待时间（full jitter 指数退避）"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, fn, label=""):
+        """在限流与重试策略下调用 fn，最终失败时抛出最后一次异常"""
+        attempt = 0
+        while True:
+            self.acquire()
+            with self._lock:
+                self.requests += 1
+            try:
+                result = fn()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable_error(e):
+                    with self._lock:
+                        self.failed += 1
+                    raise
+                delay = self.backoff(attempt)
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                    self.backoff_seconds += delay
+                print(f"  ↻ {label}临时错误，{delay:.1f}s 后重试 ({attempt}/{self.max_retries}): {e}")
+                time.sleep(delay)
+                continue
+
+            with self._lock:
+                self.succeeded += 1
+            return result
+
+    def stats(self):
+        """返回吞吐量统计"""
+        elapsed = time.monotonic() - self.started_at
+        return {
+            "rpm_limit": self.rpm,
+            "requests": self.requests,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retries": self.retries,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "backoff_seconds": round(self.backoff_seconds, 3),
+            "images_per_minute": round(self.succeeded / elapsed * 60, 2) if elapsed > 0 else 0.0
+        }
+
+
+def write_image_bytes(image_path, data):
+    """将图片字节直接写入磁盘（经 memoryview 写出，不复制缓冲区）
+
+    先写临时文件再原子替换，进程中断时不会留下半张图片。
+    """
+    tmp_path = f"{image_path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(memoryview(data))
+    os.replace(tmp_path, image_path)
+
+
+class RendererSetupError(RuntimeError):
+    """无法创建API客户端（未安装 google-genai 或未设置 GEMINI_API_KEY）"""
+
+
+class SlideRenderer:
+    """幻灯片图片渲染器（使用Nano Banana API）
+
+    整个运行期间只创建一个 genai.Client，所有页面（包括并发线程）共享其
+    底层HTTP连接池与keep-alive连接，避免每页重复建立TLS连接。
+    客户端在第一页真正需要调用API时才创建：全部命中缓存或续跑跳过时
+    无需安装 google-genai，也无需设置 GEMINI_API_KEY。
+    """
+
+    def __init__(self, resolution="2K", model=MODEL_NAME, aspect_ratio=ASPECT_RATIO, api_key=None,
+                 cache=None, scheduler=None, write_mode="raw"):
+        self.resolution = resolution
+        self.write_mode = write_mode
+        self.model = model
+        self.aspect_ratio = aspect_ratio
+        self.api_key = api_key
+        self.cache = cache
+        self.scheduler = scheduler or RequestScheduler()
+        self._client = None
+        self._types = None
+        self.setup_error = None
+        self._lock = threading.Lock()
+
+    def connect(self):
+        """导入 google-genai 并创建共享客户端（重复调用无副作用）
+
+        无法创建时抛出 RendererSetupError；错误只提示一次，之后的调用
+        直接抛出同一异常。
+        """
+        with self._lock:
+            if self._client is not None:
+                return self._client
+            if self.setup_error is not None:
+                raise self.setup_error
+
+            try:
+                from google import genai
+                from google.genai import types
+            except ImportError:
+                self.setup_error = RendererSetupError("未安装 google-genai 库")
+                print("错误: 未安装 google-genai 库")
+                print("请运行: pip install google-genai")
+                raise self.setup_error
+
+            # 获取API密钥
+            api_key = self.api_key or os.environ.get("GEMINI_API_KEY")
+            if not api_key:
+                self.setup_error = RendererSetupError("未设置 GEMINI_API_KEY 环境变量")
+                print("错误: 未设置 GEMINI_API_KEY 环境变量")
+                print("请设置: export GEMINI_API_KEY='your-api-key'")
+                raise self.setup_error
+
+            self._types = types
+            self._client = genai.Client(api_key=api_key)
+            return self._client
+
+    def close(self):
+        """释放共享客户端及其连接池"""
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None and hasattr(client, "close"):
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    def cache_key(self, prompt):
+        """当前渲染参数下提示词对应的缓存键"""
+        return render_cache_key(prompt, self.model, self.resolution, self.aspect_ratio)
+
+    def render(self, prompt, slide_number, output_dir):
+        """生成单页PPT图片，返回图片路径；失败时返回 None"""
+        image_path = os.path.join(output_dir, "images", f"slide-{slide_number:02d}.png")
+
+        key = None
+        if self.cache is not None:
+            key = self.cache_key(prompt)
+            if self.cache.get(key, image_path):
+                print(f"✓ 第 {slide_number} 页命中缓存: {image_path}")
+                return image_path
+
+        print(f"正在生成第 {slide_number} 页...")
+
+        try:
+            # 首次真正调用API时才创建客户端
+            self.connect()
+            saved = self.scheduler.call(
+                lambda: self._generate(prompt, image_path),
+                label=f"第 {slide_number} 页"
+            )
+        except Exception as e:
+            print(f"✗ 第 {slide_number} 页生成失败: {e}")
+            return None
+
+        if not saved:
+            print(f"✗ 第 {slide_number} 页生成失败: 未收到图片数据")
+            return None
+
+        if key is not None:
+            self.cache.put(key, image_path)
+
+        print(f"✓ 第 {slide_number} 页已保存: {image_path}")
+        return image_path
+
+    def _generate(self, prompt, image_path):
+        """调用图片API并保存结果，未收到图片数据时返回 False"""
+        client = self.connect()
+        types = self._types
 
         response = client.models.generate_content(
-            model="gemini-3-pro-image-preview",
+            model=self.model,
             contents=prompt,
             config=types.GenerateContentConfig(
                 response_modalities=['IMAGE'],
                 image_config=types.ImageConfig(
-                    aspect_ratio="16:9",
-                    image_size=resolution
+                    aspect_ratio=self.aspect_ratio,
+                    image_size=self.resolution
                 )
             )
         )
 
         for part in response.parts:
-            if part.inline_data is not None:
-                image = part.as_image()
-                image_path = os.path.join(output_dir, "images", f"slide-{slide_number:02d}.png")
-                image.save(image_path)
-                print(f"✓ 第 {slide_number} 页已保存: {image_path}")
-                return image_path
+            inline_data = part.inline_data
+            if inline_data is None:
+                continue
+
+            if self.write_mode == "raw" and inline_data.data and inline_data.mime_type == "image/png":
+                # 直接落盘API返回的PNG字节，省去一次解码与重新编码
+                write_image_bytes(image_path, inline_data.data)
+            else:
+                # 非PNG数据或显式要求解码时，经PIL转存为PNG
+                part.as_image().save(image_path)
+            return True
+
+        return False
+
+
+def _placeholder_png():
+    """1x1 灰色PNG，供 --dry-run 的桩渲染器写出占位图"""
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 0, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(b"\x00\x80"))
+            + chunk(b"IEND", b""))
 
-        print(f"✗ 第 {slide_number} 页生成失败: 未收到图片数据")
-        return None
 
-    except Exception as e:
-        print(f"✗ 第 {slide_number} 页生成失败: {e}")
+PLACEHOLDER_PNG = _placeholder_png()
+
+
+class StubRenderer(SlideRenderer):
+    """本地桩渲染器（--dry-run）
+
+    不导入 google-genai、不调用API，也不读写渲染缓存：每页随机等待
+    latency 的 0.5~1.5 倍后写入一张占位PNG，并记录同时生成的最大页数，
+    用于在本地检查页面顺序、render_seconds 与 --workers 并发上限。
+    """
+
+    def __init__(self, latency=0.5, **kwargs):
+        kwargs["cache"] = None
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.active = 0
+        self.peak_active = 0
+
+    # 占位图的哈希与真实渲染不同，--resume 不会把占位图当作已完成的页面
+    MODEL = "dry-run-stub"
+
+    def connect(self):
         return None
 
+    def cache_key(self, prompt):
+        return render_cache_key(prompt, self.MODEL, self.resolution, self.aspect_ratio)
+
+    def _generate(self, prompt, image_path):
+        with self._lock:
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+        try:
+            # 随机耗时使完成顺序与规划顺序不同
+            time.sleep(self.latency * random.uniform(0.5, 1.5))
+            write_image_bytes(image_path, PLACEHOLDER_PNG)
+        finally:
+            with self._lock:
+                self.active -= 1
+        return True
+
+
+def render_slides(jobs, output_dir, renderer, workers=1, on_complete=None, executor=None):
+    """并发生成多页图片
+
+    jobs 为 [{"slide_number": N, "prompt": "..."}] 列表；renderer 需提供
+    render(prompt, slide_number, output_dir) 方法，测试时可传入本地桩对象。
+    传入 executor 时页面提交到该共享线程池（批量模式下跨PPT共享并发上限）。
+    每页完成时（在调用线程中）回调 on_complete(job, result)。
+    返回 {slide_number: 结果}，结果包含 image_path 与耗时（秒）。
+    """
+    def run(job):
+        started = time.perf_counter()
+        image_path = renderer.render(job["prompt"], job["slide_number"], output_dir)
+        return {
+            "image_path": image_path,
+            "elapsed": round(time.perf_counter() - started, 3)
+        }
+
+    def finish(job, result):
+        results[job["slide_number"]] = result
+        if result["elapsed"] is not None:
+            print(f"  ⏱ 第 {job['slide_number']} 页耗时 {result['elapsed']:.1f}s")
+        if on_complete is not None:
+            on_complete(job, result)
+
+    results = {}
+    workers = max(1, workers)
+
+    if executor is None and workers == 1:
+        # 串行模式：保持原有的逐页输出顺序
+        for job in jobs:
+            finish(job, run(job))
+            print()
+        return results
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=workers)
+
+    try:
+        futures = {executor.submit(run, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"✗ 第 {job['slide_number']} 页生成失败: {e}")
+                result = {"image_path": None, "elapsed": None}
+            finish(job, result)
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    return results
+
+
+class RenderJournal:
+    """逐页追加写入的生成日志（manifest.jsonl）
+
+    每页完成后立即追加一行并刷盘，进程中途退出时已完成的页面不会丢失，
+    --resume 据此跳过提示词未变且图片仍存在的页面。图片路径相对于输出目录
+    记录，从其他工作目录续跑同一输出目录时仍能找到。
+    """
+
+    FILENAME = "manifest.jsonl"
+
+    def __init__(self, output_dir, resume=False, dry_run=False):
+        self.output_dir = output_dir
+        self.dry_run = dry_run
+        self.path = os.path.join(output_dir, self.FILENAME)
+        if not resume and os.path.exists(self.path):
+            # 非续跑模式下重新开始记录
+            os.remove(self.path)
+
+    def record(self, job, result):
+        """追加一页的生成结果"""
+        image_path = result.get("image_path")
+        if image_path is not None:
+            image_path = Path(os.path.relpath(image_path, self.output_dir)).as_posix()
+        entry = {
+            "slide_number": job["slide_number"],
+            "prompt_hash": job.get("prompt_hash"),
+            "image_path": image_path,
+            "render_seconds": result.get("elapsed"),
+            "completed_at": datetime.now().isoformat()
+        }
+        if self.dry_run:
+            entry["dry_run"] = True
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self):
+        """读取日志，返回 {slide_number: 最后一次记录}"""
+        return self.read(self.path)
+
+    @staticmethod
+    def read(path):
+        """读取指定的日志文件，返回 {slide_number: 最后一次记录}"""
+        entries = {}
+        if not os.path.exists(path):
+            return entries
+
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 进程中断可能留下不完整的最后一行
+                    continue
+                entries[entry["slide_number"]] = entry
+        return entries
+
+
+def load_previous_results(output_dir, journal):
+    """汇总上次运行的结果（prompts.json + manifest.jsonl，后者优先）"""
+    previous = {}
+
+    prompts_path = os.path.join(output_dir, "prompts.json")
+    if os.path.exists(prompts_path):
+        try:
+            with open(prompts_path, 'r', encoding='utf-8') as f:
+                prompts_data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"警告: 无法读取 {prompts_path}: {e}")
+            prompts_data = {}
+
+        resolution = prompts_data.get("metadata", {}).get("resolution")
+        for slide in prompts_data.get("slides", []):
+            prompt_hash = slide.get("prompt_hash")
+            if prompt_hash is None and slide.get("prompt") and resolution:
+                # 旧版 prompts.json 没有记录哈希，按当时的参数补算
+                prompt_hash = render_cache_key(slide["prompt"], MODEL_NAME, resolution, ASPECT_RATIO)
+            previous[slide["slide_number"]] = {
+                "prompt_hash": prompt_hash,
+                "image_path": slide.get("image_path"),
+                "render_seconds": slide.get("render_seconds")
+            }
+
+    previous.update(journal.load())
+    for entry in previous.values():
+        entry["image_path"] = resolve_image_path(output_dir, entry.get("image_path"))
+    return previous
+
+
+def resolve_image_path(output_dir, image_path):
+    """把记录中的图片路径解析为可访问的路径
+
+    manifest.jsonl 记录相对于输出目录的路径；prompts.json 与旧版日志记录的是
+    相对于当时工作目录的路径，此时按文件名在输出目录的 images/ 下查找。
+    """
+    if image_path is None or os.path.isabs(image_path):
+        return image_path
+    candidate = os.path.join(output_dir, image_path)
+    if os.path.exists(candidate):
+        return candidate
+    return os.path.join(output_dir, "images", os.path.basename(image_path))
+
+
+def has_rendered_output(output_dir):
+    """输出目录中是否已有真实渲染（非 --dry-run）的结果"""
+    entries = RenderJournal.read(os.path.join(output_dir, RenderJournal.FILENAME))
+    if any(not entry.get("dry_run") for entry in entries.values()):
+        return True
+
+    prompts_path = os.path.join(output_dir, "prompts.json")
+    if not entries and os.path.exists(prompts_path):
+        # 没有日志的旧版输出目录
+        try:
+            with open(prompts_path, 'r', encoding='utf-8') as f:
+                return not json.load(f).get("metadata", {}).get("dry_run")
+        except (OSError, json.JSONDecodeError):
+            return True
+    return False
+
+
+def is_reusable(job, previous_entry):
+    """上次结果可复用：提示词哈希一致且图片文件仍然存在"""
+    if not previous_entry:
+        return False
+    image_path = previous_entry.get("image_path")
+    return (
+        image_path is not None
+        and previous_entry.get("prompt_hash") == job["prompt_hash"]
+        and os.path.exists(image_path)
+    )
+
+
+# 播放网页使用的派生图片配置
+DEFAULT_DERIVATIVE_WIDTHS = (640, 1280, 1920)
+THUMBNAIL_WIDTH = 320
+DERIVATIVE_MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+
+
+def avif_supported():
+    """当前Pillow是否可以编码AVIF（Pillow 11.3+ 内置，或安装了 pillow-avif-plugin）"""
+    try:
+        from PIL import features
+        if features.check("avif"):
+            return True
+    except Exception:
+        pass
+    try:
+        import pillow_avif  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _is_fresh(path, source_mtime):
+    """派生文件存在且不早于原图时可直接复用"""
+    try:
+        return os.path.getmtime(path) >= source_mtime
+    except OSError:
+        return False
+
+
+def make_slide_derivatives(image_path, widths, formats):
+    """为单页原图生成缩略图与多尺寸WebP/AVIF版本（在子进程中执行）
+
+    返回 {"thumb": 缩略图路径, "variants": {格式: [(路径, 宽度), ...]}}，
+    路径均为绝对/原始形式，由调用方转换为网页相对路径。
+    """
+    from PIL import Image
+
+    base, _ = os.path.splitext(image_path)
+    thumbs_dir = os.path.join(os.path.dirname(image_path), "thumbs")
+    os.makedirs(thumbs_dir, exist_ok=True)
+    source_mtime = os.path.getmtime(image_path)
+
+    with Image.open(image_path) as image:
+        image.load()
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB")
+        original_width, original_height = image.size
+
+        def resized(width):
+            if width >= original_width:
+                return image
+            height = round(original_height * width / original_width)
+            return image.resize((width, height), Image.LANCZOS)
+
+        # 只生成不超过原图宽度的尺寸，并始终包含原图宽度
+        target_widths = sorted({w for w in widths if w < original_width} | {original_width})
+
+        result = {"thumb": None, "variants": {}}
+
+        thumb_path = os.path.join(thumbs_dir, os.path.basename(base) + ".webp")
+        if not _is_fresh(thumb_path, source_mtime):
+            resized(min(THUMBNAIL_WIDTH, original_width)).save(thumb_path, "WEBP", quality=70)
+        result["thumb"] = thumb_path
+
+        for fmt in formats:
+            variants = []
+            for width in target_widths:
+                path = f"{base}-{width}w.{fmt}"
+                if not _is_fresh(path, source_mtime):
+                    if fmt == "avif":
+                        resized(width).save(path, "AVIF", quality=55)
+                    else:
+                        resized(width).save(path, "WEBP", quality=82, method=4)
+                variants.append((path, width))
+            result["variants"][fmt] = variants
+
+    return result
+
+
+def derivative_pool(max_workers=None):
+    """派生图片使用的进程池
+
+    固定使用 spawn 启动子进程：进程池在渲染线程与API客户端线程运行时创建，
+    fork 会把其他线程持有的锁复制进子进程，可能导致子进程死锁。
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def generate_derivatives(image_paths, output_dir, widths=DEFAULT_DERIVATIVE_WIDTHS, avif=False, workers=None,
+                         executor=None):
+    """渲染后处理：在进程池中为每页生成缩略图与WebP/AVIF版本
+
+    image_paths 为 {slide_number: 原图路径}；executor 为可选的共享进程池。返回
+    {slide_number: {"thumb": 相对路径, "sources": [{"type", "srcset"}]}}，
+    供 generate_viewer_html() 生成 <picture>/srcset 标记。
+    """
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        print("警告: 未安装 pillow，跳过派生图片生成")
+        print("请运行: pip install pillow")
+        return {}
+
+    formats = []
+    if avif:
+        if avif_supported():
+            formats.append("avif")
+        else:
+            print("警告: 当前Pillow不支持AVIF编码，仅生成WebP（可安装 pillow-avif-plugin）")
+    formats.append("webp")
+
+    def relative(path):
+        return Path(os.path.relpath(path, output_dir)).as_posix()
+
+    derivatives = {}
+    started = time.perf_counter()
+    own_executor = executor is None
+    if own_executor:
+        executor = derivative_pool(workers)
+
+    try:
+        futures = {
+            executor.submit(make_slide_derivatives, path, tuple(widths), tuple(formats)): slide_number
+            for slide_number, path in image_paths.items()
+            if path and os.path.exists(path)
+        }
+        for future in as_completed(futures):
+            slide_number = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"✗ 第 {slide_number} 页派生图片生成失败: {e}")
+                continue
 
-def generate_viewer_html(output_dir, slide_count, template_path):
-    """生成播放网页"""
+            # AVIF 在前：浏览器按顺序选择第一个支持的格式
+            derivatives[slide_number] = {
+                "thumb": relative(result["thumb"]),
+                "sources": [
+                    {
+                        "type": DERIVATIVE_MIME_TYPES[fmt],
+                        "srcset": ", ".join(f"{relative(path)} {width}w" for path, width in result["variants"][fmt])
+                    }
+                    for fmt in formats
+                ]
+            }
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    print(f"✓ 派生图片已生成: {len(derivatives)} 页（{'/'.join(formats)}），耗时 {time.perf_counter() - started:.1f}s")
+    return derivatives
+
+
+def generate_viewer_html(output_dir, slide_count, template_path, derivatives=None):
+    """生成播放网页
+
+    derivatives 来自 generate_derivatives()，存在时该页以 <picture> 形式
+    提供多格式、多尺寸图片，浏览器按屏幕宽度选择最小的合适版本。
+    """
     # 读取HTML模板
     with open(template_path, 'r', encoding='utf-8') as f:
         html_template = f.read()
 
     # 生成图片列表
-    slides_list = [f"'images/slide-{i:02d}.png'" for i in range(1, slide_count + 1)]
+    derivatives = derivatives or {}
+    slides_list = []
+    for i in range(1, slide_count + 1):
+        src = f"images/slide-{i:02d}.png"
+        if i in derivatives:
+            entry = {"src": src, **derivatives[i]}
+            slides_list.append(json.dumps(entry, ensure_ascii=False))
+        else:
+            slides_list.append(json.dumps(src))
 
     # 替换占位符
     html_content = html_template.replace(
@@ -141,69 +1021,40 @@ def save_prompts(output_dir, prompts_data):
     print(f"✓ 提示词已保存: {prompts_path}")
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description='PPT生成器 - 使用Nano Banana Pro生成PPT图片',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-示例用法:
-  python generate_ppt.py --plan slides_plan.json --style styles/gradient-glass.md --resolution 2K
-
-环境变量:
-  GEMINI_API_KEY: Google AI API密钥（必需）
-"""
-    )
+def load_plan(plan_path):
+    """读取并校验slides规划，规划无效时抛出 ValueError"""
+    with open(plan_path, 'r', encoding='utf-8') as f:
+        slides_plan = json.load(f)
 
-    parser.add_argument(
-        '--plan',
-        required=True,
-        help='slides规划JSON文件路径（由Skill生成）'
-    )
-    parser.add_argument(
-        '--style',
-        required=True,
-        help='风格模板文件路径'
-    )
-    parser.add_argument(
-        '--resolution',
-        choices=['2K', '4K'],
-        default='2K',
-        help='图片分辨率 (默认: 2K)'
-    )
-    parser.add_argument(
-        '--output',
-        help='输出目录路径（默认: outputs/TIMESTAMP）'
-    )
-    parser.add_argument(
-        '--template',
-        default='templates/viewer.html',
-        help='HTML模板路径（默认: templates/viewer.html）'
-    )
+    errors = validate_plan(slides_plan)
+    if errors:
+        raise ValueError(f"slides规划无效 ({plan_path}): " + "；".join(errors))
+    return slides_plan
 
-    args = parser.parse_args()
 
-    # 读取slides规划
-    with open(args.plan, 'r', encoding='utf-8') as f:
-        slides_plan = json.load(f)
+def build_deck(slides_plan, style_path, output_dir, renderer, args, executor=None, derivative_executor=None):
+    """生成单个PPT：提示词、图片、prompts.json、派生图片与播放网页
 
-    # 加载风格模板
-    style_template = load_style_template(args.style)
+    renderer（及其客户端、限流器、缓存）与 executor 可在多个PPT之间共享。
+    返回本次生成的统计摘要。
+    """
+    dry_run = isinstance(renderer, StubRenderer)
+    if dry_run and has_rendered_output(output_dir):
+        # 占位图会覆盖已生成的图片
+        raise ValueError(f"输出目录已包含真实生成的结果，--dry-run 请使用其他 --output: {output_dir}")
 
-    # 创建输出目录
-    if args.output:
-        output_dir = args.output
-    else:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_dir = f"outputs/{timestamp}"
+    # 加载风格模板（同一进程内按文件修改时间复用解析结果）
+    style_template = load_style(style_path)
 
     os.makedirs(os.path.join(output_dir, "images"), exist_ok=True)
 
     print("=" * 60)
     print("PPT生成器启动")
     print("=" * 60)
-    print(f"风格: {args.style}")
-    print(f"分辨率: {args.resolution}")
+    print(f"风格: {style_path}")
+    print(f"分辨率: {renderer.resolution}")
     print(f"页数: {len(slides_plan['slides'])}")
+    print(f"并发数: {args.workers}")
     print(f"输出目录: {output_dir}")
     print("=" * 60)
     print()
@@ -213,8 +1064,8 @@ def main():
         "metadata": {
             "title": slides_plan.get("title", "未命名演示"),
             "total_slides": len(slides_plan['slides']),
-            "resolution": args.resolution,
-            "style": args.style,
+            "resolution": renderer.resolution,
+            "style": style_path,
             "generated_at": datetime.now().isoformat()
         },
         "slides": []
@@ -222,6 +1073,8 @@ def main():
 
     total_slides = len(slides_plan['slides'])
 
+    # 先生成全部提示词，再统一调度图片生成
+    jobs = []
     for slide_info in slides_plan['slides']:
         slide_number = slide_info['slide_number']
         page_type = slide_info.get('page_type', 'content')
@@ -233,29 +1086,439 @@ def main():
             page_type,
             content_text,
             slide_number,
-            total_slides
+            total_slides,
+            use_layouts=args.style_layouts
         )
 
-        # 生成图片
-        image_path = generate_slide(prompt, slide_number, output_dir, args.resolution)
-
-        # 记录提示词
-        prompts_data['slides'].append({
+        jobs.append({
             "slide_number": slide_number,
             "page_type": page_type,
             "content": content_text,
             "prompt": prompt,
-            "image_path": image_path
+            "prompt_hash": renderer.cache_key(prompt)
         })
 
+    # 续跑：复用提示词未变且图片仍存在的页面
+    journal = RenderJournal(output_dir, resume=args.resume, dry_run=dry_run)
+    results = {}
+    pending = jobs
+    if args.resume:
+        previous = load_previous_results(output_dir, journal)
+        pending = []
+        for job in jobs:
+            entry = previous.get(job['slide_number'])
+            if is_reusable(job, entry):
+                results[job['slide_number']] = {
+                    "image_path": entry['image_path'],
+                    "elapsed": entry.get('render_seconds')
+                }
+            else:
+                pending.append(job)
+        print(f"续跑: 跳过 {len(jobs) - len(pending)} 页，待生成 {len(pending)} 页")
         print()
 
+    # 生成图片
+    started = time.perf_counter()
+    if pending:
+        results.update(render_slides(
+            pending, output_dir, renderer,
+            workers=args.workers,
+            on_complete=journal.record,
+            executor=executor
+        ))
+    elapsed = time.perf_counter() - started
+
+    # 按规划顺序记录提示词，保证页码与并发完成顺序无关
+    for job in jobs:
+        result = results.get(job['slide_number'], {})
+        prompts_data['slides'].append({
+            "slide_number": job['slide_number'],
+            "page_type": job['page_type'],
+            "content": job['content'],
+            "prompt": job['prompt'],
+            "prompt_hash": job['prompt_hash'],
+            "image_path": result.get('image_path'),
+            "render_seconds": result.get('elapsed')
+        })
+
+    prompts_data['metadata']['workers'] = args.workers
+    if dry_run:
+        prompts_data['metadata']['dry_run'] = True
+    prompts_data['metadata']['render_seconds'] = round(elapsed, 3)
+    prompts_data['metadata']['api'] = renderer.scheduler.stats()
+    if renderer.cache is not None:
+        prompts_data['metadata']['cache'] = renderer.cache.stats()
+
+    print()
+    print(f"图片生成耗时: {elapsed:.1f}s（{len(pending)} 页，并发 {args.workers}）")
+    print()
+
     # 保存提示词
     save_prompts(output_dir, prompts_data)
 
+    # 渲染后处理：缩略图与WebP/AVIF派生图片
+    derivatives = None
+    if args.derivatives or args.avif:
+        image_paths = {number: result.get('image_path') for number, result in results.items()}
+        derivatives = generate_derivatives(
+            image_paths,
+            output_dir,
+            widths=args.derivative_widths,
+            avif=args.avif,
+            executor=derivative_executor
+        )
+
     # 生成播放网页
-    generate_viewer_html(output_dir, total_slides, args.template)
+    generate_viewer_html(output_dir, total_slides, args.template, derivatives)
+
+    failed = [job['slide_number'] for job in jobs if not results.get(job['slide_number'], {}).get('image_path')]
+    return {
+        "output_dir": output_dir,
+        "total_slides": total_slides,
+        "rendered": sum(1 for job in pending if results.get(job['slide_number'], {}).get('image_path')),
+        "reused": len(jobs) - len(pending),
+        "failed_slides": failed,
+        "render_seconds": round(elapsed, 3)
+    }
+
+
+def print_api_stats(renderer):
+    """打印API请求与缓存统计"""
+    api_stats = renderer.scheduler.stats()
+    if api_stats['requests']:
+        print(f"API请求: {api_stats['requests']} 次（重试 {api_stats['retries']} 次，失败 {api_stats['failed']} 次），"
+              f"限流等待 {api_stats['throttled_seconds']:.1f}s，吞吐 {api_stats['images_per_minute']:.1f} 张/分钟")
+    if renderer.cache is not None:
+        print(f"渲染缓存: 命中 {renderer.cache.hits} 页，未命中 {renderer.cache.misses} 页")
+    if isinstance(renderer, StubRenderer):
+        print(f"桩渲染（--dry-run）: 最大同时生成 {renderer.peak_active} 页")
+
+
+def collect_batch_decks(args, batch_root):
+    """解析批量模式的PPT列表，返回 [{"plan", "style", "output"}]"""
+    decks = []
+
+    if args.plans_dir:
+        plan_files = sorted(Path(args.plans_dir).glob("*.json"))
+        if not plan_files:
+            raise ValueError(f"目录中没有规划文件: {args.plans_dir}")
+        for plan_file in plan_files:
+            decks.append({
+                "plan": str(plan_file),
+                "style": args.style,
+                "output": os.path.join(batch_root, plan_file.stem)
+            })
+        return decks
+
+    # 清单文件：JSON列表，或 {"decks": [...]}；每项至少包含 plan，可覆盖 style/output
+    with open(args.manifest, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    entries = manifest.get("decks", []) if isinstance(manifest, dict) else manifest
+
+    for index, entry in enumerate(entries, start=1):
+        if isinstance(entry, str):
+            entry = {"plan": entry}
+        if not isinstance(entry, dict) or not entry.get("plan"):
+            raise ValueError(f"清单第 {index} 项缺少 plan")
+        style = entry.get("style") or args.style
+        if not style:
+            raise ValueError(f"清单第 {index} 项缺少 style，且未指定 --style")
+        decks.append({
+            "plan": entry["plan"],
+            "style": style,
+            "output": entry.get("output") or os.path.join(batch_root, Path(entry["plan"]).stem)
+        })
+    return decks
+
+
+def run_batch(args, renderer):
+    """批量模式：在同一进程内生成多个PPT，共享客户端、风格缓存与全局并发上限"""
+    if args.output:
+        batch_root = args.output
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        batch_root = f"outputs/batch_{timestamp}"
+
+    try:
+        decks = collect_batch_decks(args, batch_root)
+    except (OSError, ValueError) as e:
+        print(f"错误: {e}")
+        sys.exit(1)
+
+    outputs = [deck["output"] for deck in decks]
+    if len(set(outputs)) != len(outputs):
+        print("错误: 多个PPT使用了相同的输出目录，请在清单中指定 output")
+        sys.exit(1)
+
+    print("=" * 60)
+    print(f"批量生成: {len(decks)} 个PPT，全局并发 {args.workers}")
+    print(f"输出根目录: {batch_root}")
+    print("=" * 60)
+    print()
+
+    summaries = []
+    started = time.perf_counter()
+
+    def run_deck(deck):
+        deck_started = time.perf_counter()
+        try:
+            slides_plan = load_plan(deck["plan"])
+            summary = build_deck(
+                slides_plan, deck["style"], deck["output"], renderer, args,
+                executor=slide_executor,
+                derivative_executor=derivative_executor
+            )
+            summary["status"] = "success" if not summary["failed_slides"] else "partial"
+        except Exception as e:
+            print(f"✗ PPT生成失败 ({deck['plan']}): {e}")
+            summary = {"output_dir": deck["output"], "status": "error", "error": str(e)}
+        summary["plan"] = deck["plan"]
+        summary["elapsed"] = round(time.perf_counter() - deck_started, 3)
+        return summary
+
+    # 页面统一提交到共享线程池，--workers 即所有PPT合计的并发请求上限；
+    # PPT级线程只负责准备提示词和汇总结果
+    derivative_executor = derivative_pool() if (args.derivatives or args.avif) else None
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as slide_executor:
+            with ThreadPoolExecutor(max_workers=args.workers) as deck_executor:
+                summaries = list(deck_executor.map(run_deck, decks))
+    finally:
+        if derivative_executor is not None:
+            derivative_executor.shutdown()
+
+    elapsed = time.perf_counter() - started
+    rendered = sum(s.get("rendered", 0) for s in summaries)
+    report = {
+        "decks": len(decks),
+        "succeeded": sum(1 for s in summaries if s["status"] == "success"),
+        "partial": sum(1 for s in summaries if s["status"] == "partial"),
+        "failed": sum(1 for s in summaries if s["status"] == "error"),
+        "slides_rendered": rendered,
+        "slides_reused": sum(s.get("reused", 0) for s in summaries),
+        "elapsed_seconds": round(elapsed, 3),
+        "slides_per_second": round(rendered / elapsed, 3) if elapsed > 0 else 0.0,
+        "api": renderer.scheduler.stats(),
+        "cache": renderer.cache.stats() if renderer.cache is not None else None,
+        "results": summaries
+    }
+
+    os.makedirs(batch_root, exist_ok=True)
+    report_path = os.path.join(batch_root, "batch_summary.json")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print()
+    print("=" * 60)
+    print("批量生成完成！")
+    print("=" * 60)
+    print(f"PPT: 成功 {report['succeeded']}，部分失败 {report['partial']}，失败 {report['failed']}（共 {len(decks)}）")
+    print(f"页面: 生成 {rendered} 页，复用 {report['slides_reused']} 页，"
+          f"耗时 {elapsed:.1f}s，{report['slides_per_second']:.2f} 页/秒")
+    print_api_stats(renderer)
+    print(f"汇总报告: {report_path}")
+    print()
+
+    if report["failed"] or report["partial"]:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='PPT生成器 - 使用Nano Banana Pro生成PPT图片',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例用法:
+  python generate_ppt.py --plan slides_plan.json --style styles/gradient-glass.md --resolution 2K
+  python generate_ppt.py --plans-dir plans/ --style styles/gradient-glass.md --workers 8 --output outputs/nightly
+
+  python generate_ppt.py --plan slides_plan.json --style styles/gradient-glass.md --workers 4 --dry-run
+
+环境变量:
+  GEMINI_API_KEY: Google AI API密钥（有页面需要调用API时必需；--dry-run 时不需要）
+"""
+    )
+
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        '--plan',
+        help='slides规划JSON文件路径（由Skill生成）'
+    )
+    source.add_argument(
+        '--plans-dir',
+        help='批量模式：为目录下每个 *.json 规划生成一个PPT'
+    )
+    source.add_argument(
+        '--manifest',
+        help='批量模式：清单JSON，列出 {"plan", "style", "output"}（style/output 可省略）'
+    )
+    parser.add_argument(
+        '--style',
+        help='风格模板文件路径（单个PPT与 --plans-dir 必需；清单模式下作为默认风格）'
+    )
+    parser.add_argument(
+        '--resolution',
+        choices=['2K', '4K'],
+        default='2K',
+        help='图片分辨率 (默认: 2K)'
+    )
+    parser.add_argument(
+        '--style-layouts',
+        action='store_true',
+        help='使用风格文件「页面类型模板」中的构图逻辑作为各页版式说明（默认使用内置版式说明）'
+    )
+    parser.add_argument(
+        '--output',
+        help='输出目录路径（默认: outputs/TIMESTAMP；批量模式下为各PPT子目录的上级目录）'
+    )
+    parser.add_argument(
+        '--template',
+        default='templates/viewer.html',
+        help='HTML模板路径（默认: templates/viewer.html）'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='并发生成的页数上限，批量模式下为所有PPT合计的上限 (默认: 1，即逐页生成)'
+    )
+    parser.add_argument(
+        '--write-mode',
+        choices=['raw', 'decode'],
+        default='raw',
+        help='图片保存方式：raw 直接写入API返回的PNG字节，decode 经PIL解码后重新保存（默认: raw）'
+    )
+    parser.add_argument(
+        '--derivatives',
+        action='store_true',
+        help='生成缩略图与多尺寸WebP版本，播放网页按屏幕选择最小的合适图片'
+    )
+    parser.add_argument(
+        '--avif',
+        action='store_true',
+        help='同时生成AVIF版本（需要Pillow支持AVIF，隐含 --derivatives）'
+    )
+    parser.add_argument(
+        '--derivative-widths',
+        default=','.join(str(w) for w in DEFAULT_DERIVATIVE_WIDTHS),
+        help=f"派生图片宽度列表，逗号分隔（默认: {','.join(str(w) for w in DEFAULT_DERIVATIVE_WIDTHS)}）"
+    )
+    parser.add_argument(
+        '--rpm',
+        type=int,
+        help='图片API每分钟请求数上限（默认不限）'
+    )
+    parser.add_argument(
+        '--max-retries',
+        type=int,
+        default=4,
+        help='429/5xx等临时错误的最大重试次数（默认: 4）'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='续跑 --output 指定的目录：跳过已完成且提示词未变的页面，只重试失败页'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='不读取也不写入渲染缓存，强制重新生成所有页面'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        default=DEFAULT_CACHE_DIR,
+        help=f'渲染缓存目录（默认: {DEFAULT_CACHE_DIR}）'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='不调用API：用本地桩渲染器写入占位图，检查页面顺序、耗时记录与并发上限（不读写渲染缓存）'
+    )
+    parser.add_argument(
+        '--dry-run-latency',
+        type=float,
+        default=0.5,
+        help='--dry-run 时每页的模拟耗时，单位秒（默认: 0.5）'
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=DEFAULT_CACHE_SIZE_MB,
+        help=f'渲染缓存容量上限，单位MB（默认: {DEFAULT_CACHE_SIZE_MB}）'
+    )
+
+    args = parser.parse_args()
+
+    if not args.style and not args.manifest:
+        parser.error('--style 为必需参数')
+    if args.workers < 1:
+        parser.error('--workers 必须大于等于 1')
+    if args.rpm is not None and args.rpm < 1:
+        parser.error('--rpm 必须大于等于 1')
+    if args.dry_run_latency < 0:
+        parser.error('--dry-run-latency 不能为负数')
+    if args.resume and not args.output:
+        parser.error('--resume 需要同时指定 --output')
+    try:
+        args.derivative_widths = [int(w) for w in args.derivative_widths.split(',') if w.strip()]
+    except ValueError:
+        parser.error('--derivative-widths 必须是逗号分隔的整数')
+    if not args.derivative_widths or min(args.derivative_widths) < 1:
+        parser.error('--derivative-widths 必须是正整数')
+
+    # 读取并校验slides规划（在创建API客户端之前完成）
+    slides_plan = None
+    if args.plan:
+        try:
+            slides_plan = load_plan(args.plan)
+        except ValueError as e:
+            print(f"错误: {e}")
+            sys.exit(1)
+
+    # 整个运行共享一个客户端、限流器与渲染缓存
+    scheduler = RequestScheduler(rpm=args.rpm, max_retries=args.max_retries)
+    if args.dry_run:
+        renderer = StubRenderer(
+            latency=args.dry_run_latency,
+            resolution=args.resolution,
+            scheduler=scheduler
+        )
+    else:
+        cache = None
+        if not args.no_cache:
+            cache = RenderCache(args.cache_dir, max_bytes=args.cache_size * 1024 * 1024)
+
+        renderer = SlideRenderer(
+            resolution=args.resolution,
+            cache=cache,
+            scheduler=scheduler,
+            write_mode=args.write_mode
+        )
+
+    try:
+        if slides_plan is None:
+            run_batch(args, renderer)
+            return
+
+        # 创建输出目录
+        if args.output:
+            output_dir = args.output
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_dir = f"outputs/{timestamp}"
+
+        try:
+            build_deck(slides_plan, args.style, output_dir, renderer, args)
+        except ValueError as e:
+            print(f"错误: {e}")
+            sys.exit(1)
+    finally:
+        renderer.close()
+
+    if renderer.setup_error is not None:
+        sys.exit(1)
 
+    print_api_stats(renderer)
     print()
     print("=" * 60)
     print("生成完成！")
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Answer Cache for NotebookLM
+Local SQLite cache of answers keyed by notebook URL and normalized question
+
+Agents often re-ask the same question against the same notebook. A cache
+hit returns the stored answer without starting a browser at all. Entries
+expire after ANSWER_CACHE_TTL_HOURS, the cache is capped at
+ANSWER_CACHE_MAX_ENTRIES (least recently used entries go first), and
+upload_sources.py invalidates a notebook's entries whenever it adds sources.
+"""
+
+import argparse
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import ANSWER_CACHE_FILE, ANSWER_CACHE_TTL_HOURS, ANSWER_CACHE_MAX_ENTRIES
+
+
+def normalize_question(question: str) -> str:
+    """Case, whitespace and trailing punctuation do not change the question"""
+    text = unicodedata.normalize("NFKC", question).casefold()
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.rstrip(" ?!.。？！")
+
+
+def normalize_notebook_url(notebook_url: str) -> str:
+    """Drop query string, fragment and trailing slash (e.g. ?authuser=1)"""
+    return re.split(r"[?#]", notebook_url.strip(), 1)[0].rstrip("/")
+
+
+class AnswerCache:
+    """
+    SQLite-backed answer cache
+
+    Hit/miss counters are stored in the database, so they accumulate across
+    runs and can be inspected with `answer_cache.py stats`.
+    """
+
+    def __init__(self, db_path: Path = ANSWER_CACHE_FILE, ttl_hours: float = ANSWER_CACHE_TTL_HOURS,
+                 max_entries: int = ANSWER_CACHE_MAX_ENTRIES):
+        """
+        Initialize the cache
+
+        Args:
+            db_path: SQLite database file
+            ttl_hours: Entries older than this are treated as missing
+            max_entries: Maximum number of cached answers
+        """
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS answers (
+                notebook_url TEXT NOT NULL,
+                question_key TEXT NOT NULL,
+                question TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (notebook_url, question_key)
+            );
+            CREATE INDEX IF NOT EXISTS answers_last_used ON answers (last_used);
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    def _count(self, name: str):
+        self.conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,)
+        )
+
+    def get(self, notebook_url: str, question: str) -> Optional[str]:
+        """Return the cached answer, or None on a miss (expired entries are removed)"""
+        key = (normalize_notebook_url(notebook_url), normalize_question(question))
+        now = time.time()
+
+        row = self.conn.execute(
+            "SELECT answer, created_at FROM answers WHERE notebook_url = ? AND question_key = ?",
+            key
+        ).fetchone()
+
+        if row and now - row[1] > self.ttl_seconds:
+            self.conn.execute("DELETE FROM answers WHERE notebook_url = ? AND question_key = ?", key)
+            row = None
+
+        if row:
+            self.conn.execute(
+                "UPDATE answers SET last_used = ?, hits = hits + 1 WHERE notebook_url = ? AND question_key = ?",
+                (now,) + key
+            )
+            self._count("hits")
+        else:
+            self._count("misses")
+        self.conn.commit()
+
+        return row[0] if row else None
+
+    def put(self, notebook_url: str, question: str, answer: str):
+        """Store an answer and enforce the size limit"""
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO answers "
+            "(notebook_url, question_key, question, answer, created_at, last_used, hits) "
+            "VALUES (?, ?, ?, ?, ?, ?, 0)",
+            (normalize_notebook_url(notebook_url), normalize_question(question), question, answer, now, now)
+        )
+        self._evict(now)
+        self.conn.commit()
+
+    def _evict(self, now: float) -> int:
+        """Drop expired entries, then least recently used ones above max_entries"""
+        removed = self.conn.execute(
+            "DELETE FROM answers WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+
+        excess = self.conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0] - self.max_entries
+        if excess > 0:
+            removed += self.conn.execute(
+                "DELETE FROM answers WHERE rowid IN "
+                "(SELECT rowid FROM answers ORDER BY last_used ASC LIMIT ?)",
+                (excess,)
+            ).rowcount
+        return removed
+
+    def prune(self) -> int:
+        """Remove expired and excess entries now"""
+        removed = self._evict(time.time())
+        self.conn.commit()
+        return removed
+
+    def invalidate(self, notebook_url: str) -> int:
+        """Forget all answers for a notebook (its sources changed)"""
+        removed = self.conn.execute(
+            "DELETE FROM answers WHERE notebook_url = ?", (normalize_notebook_url(notebook_url),)
+        ).rowcount
+        self.conn.commit()
+        return removed
+
+    def clear(self) -> int:
+        """Remove all answers and reset the counters"""
+        removed = self.conn.execute("DELETE FROM answers").rowcount
+        self.conn.execute("DELETE FROM counters")
+        self.conn.commit()
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry count, notebooks and hit/miss counters"""
+        entries, notebooks = self.conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT notebook_url) FROM answers"
+        ).fetchone()
+        counters = dict(self.conn.execute("SELECT name, value FROM counters").fetchall())
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        return {
+            "entries": entries,
+            "notebooks": notebooks,
+            "max_entries": self.max_entries,
+            "ttl_hours": self.ttl_seconds / 3600,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    """Command-line interface for the answer cache"""
+    parser = argparse.ArgumentParser(description='Manage the NotebookLM answer cache')
+
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+
+    # Stats command
+    subparsers.add_parser('stats', help='Show cache statistics')
+
+    # Clear command
+    clear_parser = subparsers.add_parser('clear', help='Remove cached answers')
+    clear_parser.add_argument('--notebook-url', help='Only clear answers for this notebook')
+
+    # Prune command
+    subparsers.add_parser('prune', help='Remove expired and excess entries')
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return 0
+
+    cache = AnswerCache()
+
+    if args.command == 'stats':
+        stats = cache.get_stats()
+        print("\n💾 Answer Cache:")
+        print(f"  Entries: {stats['entries']}/{stats['max_entries']} ({stats['notebooks']} notebooks)")
+        print(f"  TTL: {stats['ttl_hours']:.0f} hours")
+        print(f"  Hits: {stats['hits']}  Misses: {stats['misses']}  Hit rate: {stats['hit_rate']:.0%}")
+
+    elif args.command == 'clear':
+        if args.notebook_url:
+            removed = cache.invalidate(args.notebook_url)
+        else:
+            removed = cache.clear()
+        print(f"🧹 Removed {removed} cached answer(s)")
+
+    elif args.command == 'prune':
+        print(f"🧹 Removed {cache.prune()} expired/excess answer(s)")
+
+    cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
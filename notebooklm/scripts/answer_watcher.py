@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Answer Detection for NotebookLM
+Event-driven completion detection with a polling fallback
+
+Instead of polling the DOM every 0.5-1s and waiting for three identical
+reads, AnswerWatcher injects a MutationObserver into the page before the
+question is submitted. The observer tracks the newest response node and
+marks the answer done once the thinking indicator is gone and the text has
+not changed for ANSWER_SETTLE_MS. Python blocks in page.wait_for_function()
+until that flag flips, so an answer is picked up as soon as it settles.
+
+If the script cannot be injected (or the page navigates and the observer
+state is lost), the watcher falls back to the old stable-text polling. When
+the observer never reports completion in time, one stable-text polling pass
+runs before giving up, so an answer the observer missed is still returned.
+
+stream() yields the answer incrementally as the response node grows, so
+callers can start at time-to-first-token instead of at completion.
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional
+
+from patchright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import (
+    RESPONSE_SELECTORS, THINKING_SELECTOR, ANSWER_SETTLE_MS,
+    ANSWER_POLL_INTERVAL_SECONDS, QUERY_TIMEOUT_SECONDS
+)
+
+
+# Installs window.__nlmAnswerWatch = {done, text, ...} and returns the baseline
+# (response count and latest text before the question is submitted)
+_OBSERVER_JS = """
+(args) => {
+    const previous = window.__nlmAnswerWatch;
+    if (previous && previous.observer) previous.observer.disconnect();
+
+    const latest = () => {
+        for (const selector of args.responseSelectors) {
+            const nodes = document.querySelectorAll(selector);
+            if (nodes.length) {
+                return {count: nodes.length, text: (nodes[nodes.length - 1].innerText || '').trim()};
+            }
+        }
+        return {count: 0, text: ''};
+    };
+    const thinking = () => {
+        const el = document.querySelector(args.thinkingSelector);
+        return !!(el && el.getClientRects().length);
+    };
+
+    const baseline = latest();
+    const state = {
+        done: false,
+        text: '',
+        baselineCount: baseline.count,
+        baselineText: baseline.text,
+        updatedAt: Date.now(),
+        timer: null,
+        observer: null
+    };
+
+    const check = () => {
+        if (state.done) return;
+        const current = latest();
+        const isNew = current.count > state.baselineCount || current.text !== state.baselineText;
+        if (!isNew || !current.text) return;
+        if (current.text !== state.text) {
+            state.text = current.text;
+            state.updatedAt = Date.now();
+        }
+        if (state.timer) clearTimeout(state.timer);
+        state.timer = setTimeout(settle, args.settleMs);
+    };
+    const settle = () => {
+        state.timer = null;
+        // Still thinking: check again later instead of relying on the
+        // indicator's removal to produce a mutation
+        if (thinking()) {
+            state.timer = setTimeout(settle, args.settleMs);
+            return;
+        }
+        if (latest().text === state.text) {
+            state.done = true;
+            state.observer.disconnect();
+        } else {
+            check();
+        }
+    };
+
+    state.observer = new MutationObserver(check);
+    // Attributes too: the thinking indicator may be hidden rather than removed
+    state.observer.observe(document.body, {
+        childList: true, subtree: true, characterData: true,
+        attributes: true, attributeFilter: ['class', 'style', 'hidden', 'aria-hidden']
+    });
+    window.__nlmAnswerWatch = state;
+    return baseline;
+}
+"""
+
+_STATE_JS = """
+() => {
+    const state = window.__nlmAnswerWatch;
+    return state ? {done: state.done, text: state.text} : null;
+}
+"""
+
+_DONE_JS = "() => !window.__nlmAnswerWatch || window.__nlmAnswerWatch.done"
+
+_CHANGED_JS = """
+(seen) => {
+    const state = window.__nlmAnswerWatch;
+    return !state || state.done || state.text !== seen;
+}
+"""
+
+_STOP_JS = """
+() => {
+    const state = window.__nlmAnswerWatch;
+    if (state && state.observer) state.observer.disconnect();
+}
+"""
+
+
+class AnswerWatcher:
+    """
+    Detects when NotebookLM has finished answering the next question
+
+    Usage:
+        watcher = AnswerWatcher(page)
+        watcher.start()            # before submitting the question
+        page.keyboard.press("Enter")
+        answer = watcher.wait()
+    """
+
+    def __init__(self, page: Page, response_selectors: Optional[List[str]] = None,
+                 thinking_selector: str = THINKING_SELECTOR, settle_ms: int = ANSWER_SETTLE_MS):
+        """
+        Initialize the watcher
+
+        Args:
+            page: Page with the notebook chat
+            response_selectors: Selectors for response nodes (first match wins)
+            thinking_selector: Selector of the "thinking" indicator
+            settle_ms: How long the text must stay unchanged to count as complete
+        """
+        self.page = page
+        self.response_selectors = response_selectors or RESPONSE_SELECTORS
+        self.thinking_selector = thinking_selector
+        self.settle_ms = settle_ms
+
+        self.observing = False
+        self.answer: Optional[str] = None
+        self.baseline_text: Optional[str] = None
+        self.baseline_count = 0
+
+        # Polling fallback state
+        self._last_text: Optional[str] = None
+        self._stable_count = 0
+
+    def start(self):
+        """Record the current latest response and install the observer"""
+        try:
+            baseline = self.page.evaluate(_OBSERVER_JS, {
+                "responseSelectors": self.response_selectors,
+                "thinkingSelector": self.thinking_selector,
+                "settleMs": self.settle_ms
+            })
+            self.baseline_text = baseline["text"] or None
+            self.baseline_count = baseline["count"]
+            self.observing = True
+        except Exception as e:
+            print(f"  ⚠️ Answer observer unavailable ({e}), polling instead")
+            self.observing = False
+            self.baseline_count, self.baseline_text = self._latest_response()
+
+    def poll(self) -> Dict[str, Any]:
+        """
+        Non-blocking check of the answer state
+
+        Returns:
+            Dict with done (bool) and text (answer so far, may be empty)
+        """
+        if self.observing:
+            try:
+                state = self.page.evaluate(_STATE_JS)
+                if state is not None:
+                    return state
+            except Exception:
+                pass
+            # Observer state is gone (navigation, closed tab) - poll from here on
+            print("  ⚠️ Answer observer lost, polling instead")
+            self.observing = False
+
+        return self._poll_dom()
+
+    def wait(self, timeout: float = QUERY_TIMEOUT_SECONDS) -> str:
+        """
+        Block until the answer is complete
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Answer text
+
+        Raises:
+            TimeoutError: If no complete answer arrived in time
+        """
+        deadline = time.time() + timeout
+
+        if self.observing:
+            try:
+                self.page.wait_for_function(_DONE_JS, timeout=timeout * 1000, polling=100)
+            except PlaywrightTimeoutError:
+                text = self._poll_until_stable()
+                if text is None:
+                    raise TimeoutError(f"No response received within {timeout} seconds")
+                self.answer = text
+                return self.answer
+            except Exception:
+                pass
+
+            state = self.poll()
+            if state["done"]:
+                self.answer = state["text"]
+                return self.answer
+
+        while time.time() < deadline:
+            state = self.poll()
+            if state["done"]:
+                self.answer = state["text"]
+                return self.answer
+            time.sleep(ANSWER_POLL_INTERVAL_SECONDS)
+
+        raise TimeoutError(f"No response received within {timeout} seconds")
+
+    def stream(self, timeout: float = QUERY_TIMEOUT_SECONDS) -> Generator[str, None, str]:
+        """
+        Yield the answer in chunks as it grows
+
+        Each chunk is the text appended since the previous one. If NotebookLM
+        re-renders earlier text mid-answer, nothing more is yielded until the
+        answer completes; the complete text is always the generator's return
+        value (and self.answer).
+
+        Args:
+            timeout: Maximum seconds to wait for the complete answer
+
+        Returns:
+            Complete answer text
+
+        Raises:
+            TimeoutError: If no complete answer arrived in time
+        """
+        deadline = time.time() + timeout
+        emitted = ""
+        seen = ""
+
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimeoutError(f"No response received within {timeout} seconds")
+
+            if self.observing:
+                try:
+                    self.page.wait_for_function(_CHANGED_JS, arg=seen, timeout=remaining * 1000, polling=100)
+                except PlaywrightTimeoutError:
+                    text = self._poll_until_stable()
+                    if text is None:
+                        raise TimeoutError(f"No response received within {timeout} seconds")
+                    if text.startswith(emitted) and len(text) > len(emitted):
+                        yield text[len(emitted):]
+                    self.answer = text
+                    return self.answer
+                except Exception:
+                    pass
+            else:
+                time.sleep(ANSWER_POLL_INTERVAL_SECONDS)
+
+            state = self.poll()
+            seen = state["text"]
+
+            if seen.startswith(emitted) and len(seen) > len(emitted):
+                yield seen[len(emitted):]
+                emitted = seen
+
+            if state["done"]:
+                self.answer = seen
+                return self.answer
+
+    def stop(self):
+        """Disconnect the observer"""
+        if self.observing:
+            try:
+                self.page.evaluate(_STOP_JS)
+            except Exception:
+                pass
+            self.observing = False
+
+    def _latest_response(self):
+        """(count, text) of the newest response node"""
+        for selector in self.response_selectors:
+            try:
+                elements = self.page.query_selector_all(selector)
+                if elements:
+                    return len(elements), elements[-1].inner_text().strip()
+            except Exception:
+                continue
+        return 0, None
+
+    def _poll_dom(self) -> Dict[str, Any]:
+        """Fallback: answer is done after 3 identical reads with no thinking indicator"""
+        try:
+            thinking = self.page.query_selector(self.thinking_selector)
+            if thinking and thinking.is_visible():
+                return {"done": False, "text": self._last_text or ""}
+        except Exception:
+            pass
+
+        count, text = self._latest_response()
+        is_new = count > self.baseline_count or text != self.baseline_text
+        if not text or not is_new:
+            return {"done": False, "text": ""}
+
+        if text == self._last_text:
+            self._stable_count += 1
+        else:
+            self._stable_count = 1
+            self._last_text = text
+
+        return {"done": self._stable_count >= 3, "text": text}
+
+    def _poll_until_stable(self) -> Optional[str]:
+        """
+        One stable-text polling pass after the observer timed out
+
+        Returns:
+            Answer text if it settled, None if it is still changing or absent
+        """
+        self.stop()
+        for read in range(3):
+            if read:
+                time.sleep(ANSWER_POLL_INTERVAL_SECONDS)
+            state = self._poll_dom()
+            if state["done"]:
+                return state["text"]
+        return None
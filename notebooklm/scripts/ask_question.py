@@ -10,20 +10,31 @@ See: https://github.com/microsoft/playwright/issues/36139
 """
 
 import argparse
+import json
+import os
 import sys
 import time
 import re
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Dict, Generator, Iterator, List, Optional, Tuple
 
-from patchright.sync_api import sync_playwright
+from patchright.sync_api import BrowserContext, Page, sync_playwright
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from auth_manager import AuthManager
 from notebook_manager import NotebookLibrary
-from config import QUERY_INPUT_SELECTORS, RESPONSE_SELECTORS
-from browser_utils import BrowserFactory, StealthUtils
+from config import (
+    QUERY_INPUT_SELECTORS, QUERY_TIMEOUT_SECONDS, INPUT_MODES, INPUT_MODE, TIMING_PROFILES, TIMING_PROFILE
+)
+from browser_utils import BrowserFactory, ProfileInUseError, StealthUtils, timing
+from browser_daemon import DaemonClient, profile_in_use_message
+from answer_watcher import AnswerWatcher
+from session_manager import SessionManager
+from answer_cache import AnswerCache
+from telemetry import span
 
 
 # Follow-up reminder (adapted from MCP server for stateless operation)
@@ -37,27 +48,9 @@ FOLLOW_UP_REMINDER = (
 )
 
 
-def ask_notebooklm(question: str, notebook_url: str, headless: bool = True) -> str:
-    """
-    Ask a question to NotebookLM
-
-    Args:
-        question: Question to ask
-        notebook_url: NotebookLM notebook URL
-        headless: Run browser in headless mode
-
-    Returns:
-        Answer text from NotebookLM
-    """
-    auth = AuthManager()
-
-    if not auth.is_authenticated():
-        print("⚠️ Not authenticated. Run: python auth_manager.py setup")
-        return None
-
-    print(f"💬 Asking: {question}")
-    print(f"📚 Notebook: {notebook_url}")
-
+@contextmanager
+def _launch_browser(headless: bool = True) -> Iterator[BrowserContext]:
+    """Launch a one-shot persistent browser context and always clean up"""
     playwright = None
     context = None
 
@@ -66,23 +59,52 @@ def ask_notebooklm(question: str, notebook_url: str, headless: bool = True) -> s
         playwright = sync_playwright().start()
 
         # Launch persistent browser context using factory
-        context = BrowserFactory.launch_persistent_context(
-            playwright,
-            headless=headless
-        )
+        with span("browser.launch", headless=headless):
+            context = BrowserFactory.launch_persistent_context(
+                playwright,
+                headless=headless
+            )
+
+        yield context
+
+    finally:
+        # Always clean up
+        if context:
+            try:
+                context.close()
+            except:
+                pass
+
+        if playwright:
+            try:
+                playwright.stop()
+            except:
+                pass
+
 
+@contextmanager
+def _open_notebook(notebook_url: str, headless: bool = True) -> Iterator[Page]:
+    """Launch a one-shot browser and open the notebook"""
+    with _launch_browser(headless) as context:
         # Navigate to notebook
         page = context.new_page()
         print("  🌐 Opening notebook...")
-        page.goto(notebook_url, wait_until="domcontentloaded")
+        with span("notebook.goto", notebook_url=notebook_url):
+            page.goto(notebook_url, wait_until="domcontentloaded")
+
+            # Wait for NotebookLM
+            page.wait_for_url(re.compile(r"^https://notebooklm\.google\.com/"), timeout=10000)
+
+        yield page
 
-        # Wait for NotebookLM
-        page.wait_for_url(re.compile(r"^https://notebooklm\.google\.com/"), timeout=10000)
 
-        # Wait for query input (MCP approach)
-        print("  ⏳ Waiting for query input...")
-        query_element = None
+def _submit_question(page: Page, question: str, input_mode: Optional[str] = None) -> Optional[AnswerWatcher]:
+    """Type and submit the question; returns a watcher for the answer, or None if there is no input"""
+    # Wait for query input (MCP approach)
+    print("  ⏳ Waiting for query input...")
+    query_element = None
 
+    with span("question.wait_input") as attrs:
         for selector in QUERY_INPUT_SELECTORS:
             try:
                 query_element = page.wait_for_selector(
@@ -92,111 +114,666 @@ def ask_notebooklm(question: str, notebook_url: str, headless: bool = True) -> s
                 )
                 if query_element:
                     print(f"  ✓ Found input: {selector}")
+                    attrs["selector"] = selector
                     break
             except:
                 continue
 
-        if not query_element:
-            print("  ❌ Could not find query input")
-            return None
+    if not query_element:
+        print("  ❌ Could not find query input")
+        return None
 
-        # Type question (human-like, fast)
-        print("  ⏳ Typing question...")
-        
-        # Use primary selector for typing
-        input_selector = QUERY_INPUT_SELECTORS[0]
-        StealthUtils.human_type(page, input_selector, question)
+    # Watch for the answer before submitting so the baseline is the old state
+    watcher = AnswerWatcher(page)
+    watcher.start()
 
-        # Submit
-        print("  📤 Submitting...")
-        page.keyboard.press("Enter")
+    # Type question (human-like, fast)
+    print("  ⏳ Typing question...")
 
-        # Small pause
-        StealthUtils.random_delay(500, 1500)
+    # Use primary selector for typing
+    input_selector = QUERY_INPUT_SELECTORS[0]
+    with span("question.type", chars=len(question)) as attrs:
+        attrs["input_mode"] = StealthUtils.input_text(page, input_selector, question, input_mode)
 
-        # Wait for response (MCP approach: poll for stable text)
-        print("  ⏳ Waiting for answer...")
+    # Submit
+    print("  📤 Submitting...")
+    page.keyboard.press("Enter")
 
-        answer = None
-        stable_count = 0
-        last_text = None
-        deadline = time.time() + 120  # 2 minutes timeout
+    # Wait for response (event-driven, polling only as fallback)
+    print("  ⏳ Waiting for answer...")
+    return watcher
 
-        while time.time() < deadline:
-            # Check if NotebookLM is still thinking (most reliable indicator)
-            try:
-                thinking_element = page.query_selector('div.thinking-message')
-                if thinking_element and thinking_element.is_visible():
-                    time.sleep(1)
-                    continue
-            except:
-                pass
 
-            # Try to find response with MCP selectors
-            for selector in RESPONSE_SELECTORS:
-                try:
-                    elements = page.query_selector_all(selector)
-                    if elements:
-                        # Get last (newest) response
-                        latest = elements[-1]
-                        text = latest.inner_text().strip()
-
-                        if text:
-                            if text == last_text:
-                                stable_count += 1
-                                if stable_count >= 3:  # Stable for 3 polls
-                                    answer = text
-                                    break
-                            else:
-                                stable_count = 0
-                                last_text = text
-                except:
-                    continue
-
-            if answer:
-                break
-
-            time.sleep(1)
+def ask_notebooklm(question: str, notebook_url: str, headless: bool = True,
+                   input_mode: Optional[str] = None) -> str:
+    """
+    Ask a question to NotebookLM
 
-        if not answer:
-            print("  ❌ Timeout waiting for answer")
-            return None
+    Args:
+        question: Question to ask
+        notebook_url: NotebookLM notebook URL
+        headless: Run browser in headless mode
+        input_mode: Input strategy (see StealthUtils.input_text)
+
+    Returns:
+        Answer text from NotebookLM
+    """
+    auth = AuthManager()
+
+    if not auth.is_authenticated():
+        print("⚠️ Not authenticated. Run: python auth_manager.py setup")
+        return None
+
+    print(f"💬 Asking: {question}")
+    print(f"📚 Notebook: {notebook_url}")
+
+    try:
+        with span("ask", notebook_url=notebook_url), _open_notebook(notebook_url, headless) as page:
+            watcher = _submit_question(page, question, input_mode)
+            if not watcher:
+                return None
 
-        print("  ✅ Got answer!")
-        # Add follow-up reminder to encourage Claude to ask more questions
-        return answer + FOLLOW_UP_REMINDER
+            try:
+                with span("question.wait_answer"):
+                    answer = watcher.wait(QUERY_TIMEOUT_SECONDS)
+            except TimeoutError:
+                answer = None
+
+            if not answer:
+                print("  ❌ Timeout waiting for answer")
+                return None
 
+            print("  ✅ Got answer!")
+            # Add follow-up reminder to encourage Claude to ask more questions
+            return answer + FOLLOW_UP_REMINDER
+
+    except ProfileInUseError as e:
+        print(f"  ❌ {e}")
+        return None
     except Exception as e:
         print(f"  ❌ Error: {e}")
         import traceback
         traceback.print_exc()
         return None
 
-    finally:
-        # Always clean up
-        if context:
+
+def stream_notebooklm(question: str, notebook_url: str, headless: bool = True,
+                      input_mode: Optional[str] = None) -> Generator[str, None, Optional[str]]:
+    """
+    Ask a question and yield the answer in chunks as NotebookLM writes it
+
+    Args:
+        question: Question to ask
+        notebook_url: NotebookLM notebook URL
+        headless: Run browser in headless mode
+        input_mode: Input strategy (see StealthUtils.input_text)
+
+    Returns:
+        Complete answer text (generator return value), or None if the
+        question could not be asked
+
+    Raises:
+        Exception: Browser or timeout errors while waiting for the answer
+    """
+    auth = AuthManager()
+
+    if not auth.is_authenticated():
+        print("⚠️ Not authenticated. Run: python auth_manager.py setup")
+        return None
+
+    print(f"💬 Asking: {question}")
+    print(f"📚 Notebook: {notebook_url}")
+
+    with span("ask", notebook_url=notebook_url, stream=True), _open_notebook(notebook_url, headless) as page:
+        watcher = _submit_question(page, question, input_mode)
+        if not watcher:
+            return None
+        with span("question.wait_answer", stream=True):
+            return (yield from watcher.stream(QUERY_TIMEOUT_SECONDS))
+
+
+def ask_via_daemon(question: str, notebook_url: str, input_mode: Optional[str] = None) -> Optional[str]:
+    """
+    Ask through a running browser daemon (warm browser, no Chrome cold start)
+
+    There is no local fallback when the daemon cannot answer: it holds the
+    browser profile, so a new browser could not start anyway.
+
+    Returns:
+        Answer text, or None if no daemon is reachable or the request failed
+    """
+    client = DaemonClient.from_info_file()
+    if not client or not client.health():
+        return None
+
+    print(f"💬 Asking: {question}")
+    print(f"📚 Notebook: {notebook_url}")
+    print(f"  ⚡ Using browser daemon at {client.base_url}")
+
+    try:
+        with span("daemon.ask", notebook_url=notebook_url):
+            result = client.ask(question, notebook_url, input_mode=input_mode)
+    except Exception as e:
+        print(f"  ❌ Daemon request failed ({e})")
+        return None
+
+    if result.get("status") != "success":
+        print(f"  ❌ Daemon could not answer ({result.get('error', 'unknown error')})")
+        return None
+
+    print("  ✅ Got answer!")
+    return result["answer"] + FOLLOW_UP_REMINDER
+
+
+def stream_via_daemon(question: str, notebook_url: str,
+                      input_mode: Optional[str] = None) -> Generator[str, None, Optional[str]]:
+    """
+    Stream an answer through a running browser daemon
+
+    Returns:
+        Complete answer (generator return value), or None if no daemon is
+        reachable or the request failed
+    """
+    client = DaemonClient.from_info_file()
+    if not client or not client.health():
+        return None
+
+    print(f"💬 Asking: {question}")
+    print(f"📚 Notebook: {notebook_url}")
+    print(f"  ⚡ Using browser daemon at {client.base_url}")
+
+    try:
+        result = yield from client.ask_stream(question, notebook_url, input_mode=input_mode)
+    except Exception as e:
+        print(f"\n  ❌ Daemon request failed ({e})")
+        return None
+
+    if result.get("status") != "success":
+        print(f"\n  ❌ Daemon could not answer ({result.get('error', 'unknown error')})")
+        return None
+
+    return result["answer"]
+
+
+def print_stream(question: str, chunks: Generator[str, None, Optional[str]]) -> Tuple[Optional[str], bool]:
+    """
+    Print answer chunks as they arrive
+
+    Returns:
+        (complete answer or None, whether any chunk was printed)
+    """
+    streamed = ""
+    answer = None
+
+    try:
+        while True:
+            chunk = next(chunks)
+            if not streamed:
+                print("\n" + "=" * 60)
+                print(f"Question: {question}")
+                print("=" * 60)
+                print()
+            print(chunk, end="", flush=True)
+            streamed += chunk
+    except StopIteration as stop:
+        answer = stop.value
+    except Exception as e:
+        print(f"\n  ❌ Error: {e}")
+        return None, bool(streamed)
+
+    if answer and answer != streamed:
+        # NotebookLM re-rendered earlier text while streaming - show the final version
+        if streamed:
+            print("\n\n[Answer was reformatted while streaming - complete answer:]\n")
+        else:
+            print("\n" + "=" * 60)
+            print(f"Question: {question}")
+            print("=" * 60)
+            print()
+        print(answer, end="")
+
+    if answer:
+        print(FOLLOW_UP_REMINDER)
+        print()
+        print("=" * 60)
+
+    return answer, bool(streamed)
+
+
+def ask_many_notebooks(question: str, notebook_urls: List[str], headless: bool = True,
+                       input_mode: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Ask the same question in several notebooks with one shared browser
+
+    One tab per notebook; the question is submitted in all of them before
+    the answers are collected (see SessionManager.ask_many).
+
+    Returns:
+        Result dict per notebook URL (empty if not authenticated)
+    """
+    auth = AuthManager()
+
+    if not auth.is_authenticated():
+        print("⚠️ Not authenticated. Run: python auth_manager.py setup")
+        return {}
+
+    print(f"💬 Asking {len(notebook_urls)} notebooks: {question}")
+
+    results = {}
+    try:
+        with span("ask.many", notebooks=len(notebook_urls)), _launch_browser(headless) as context:
+            sessions = SessionManager(context)
             try:
-                context.close()
-            except:
-                pass
+                results = sessions.ask_many(notebook_urls, question, input_mode=input_mode)
+            finally:
+                sessions.close_all()
+    except Exception as e:
+        print(f"  ❌ Error: {e}")
 
-        if playwright:
+    # Anything not answered (browser failed to start) counts as an error
+    for url in notebook_urls:
+        results.setdefault(url, {"status": "error", "question": question, "error": "Browser failed",
+                                 "notebook_url": url, "latency_seconds": 0.0})
+    return results
+
+
+def ask_many_via_daemon(question: str, notebook_urls: List[str],
+                        input_mode: Optional[str] = None) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Fan out through a running browser daemon
+
+    Returns:
+        Result dict per notebook URL, or None if no daemon is reachable
+    """
+    client = DaemonClient.from_info_file()
+    if not client or not client.health():
+        return None
+
+    print(f"💬 Asking {len(notebook_urls)} notebooks: {question}")
+    print(f"  ⚡ Using browser daemon at {client.base_url}")
+
+    try:
+        result = client.ask_many(question, notebook_urls, input_mode=input_mode)
+    except Exception as e:
+        print(f"  ❌ Daemon request failed ({e})")
+        return None
+
+    if result.get("status") != "ok":
+        print(f"  ❌ Daemon could not answer ({result.get('error', 'unknown error')})")
+        return None
+
+    return result["results"]
+
+
+def print_fan_out(question: str, notebooks: List[Dict[str, Any]],
+                  results: Dict[str, Dict[str, Any]], elapsed: float) -> int:
+    """Print per-notebook answers and a summary; returns the number of answers"""
+    print("\n" + "=" * 60)
+    print(f"Question: {question}")
+    print("=" * 60)
+
+    answered = 0
+    for notebook in notebooks:
+        result = results.get(notebook['url'], {})
+        latency = result.get("latency_seconds", 0.0)
+        if result.get("status") == "success":
+            answered += 1
+            source = "cached" if result.get("cached") else f"{latency:.1f}s"
+            print(f"\n📚 [{notebook['id']}] {notebook['name']} ({source})\n")
+            print(result["answer"])
+        else:
+            print(f"\n❌ [{notebook['id']}] {notebook['name']} failed after {latency:.1f}s: "
+                  f"{result.get('error', 'no result')}")
+
+    latencies = [r.get("latency_seconds", 0.0) for r in results.values()
+                 if r.get("status") == "success" and not r.get("cached")]
+    print("\n" + "-" * 60)
+    summary = f"✅ {answered}/{len(notebooks)} notebooks answered in {elapsed:.1f}s"
+    if latencies:
+        summary += f" (fastest {min(latencies):.1f}s, slowest {max(latencies):.1f}s)"
+    print(summary)
+
+    if answered:
+        print(FOLLOW_UP_REMINDER)
+    print()
+    print("=" * 60)
+    return answered
+
+
+def _strip_reminder(answer: str) -> str:
+    """The answer as NotebookLM gave it, without FOLLOW_UP_REMINDER"""
+    return answer[:-len(FOLLOW_UP_REMINDER)] if answer.endswith(FOLLOW_UP_REMINDER) else answer
+
+
+def _cached_chunks(answer: str) -> Generator[str, None, str]:
+    """A cached answer as a one-chunk stream"""
+    yield answer
+    return answer
+
+
+def load_question_batch(questions_file: Path, library: NotebookLibrary,
+                        default_notebook_url: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Read a JSONL questions file
+
+    Each non-empty line is an object with "question" and optionally "id",
+    "notebook_id" (library ID) or "notebook_url". Lines without a notebook
+    use default_notebook_url.
+
+    Returns:
+        Jobs with index (position among non-empty lines), id, question and
+        notebook_url (None plus an error if the notebook cannot be resolved)
+
+    Raises:
+        ValueError: If a line is not a JSON object with a question
+    """
+    jobs = []
+    with open(questions_file, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
             try:
-                playwright.stop()
-            except:
-                pass
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{questions_file}:{line_number}: invalid JSON ({e})")
+            if not isinstance(entry, dict) or not isinstance(entry.get("question"), str) or not entry["question"].strip():
+                raise ValueError(f"{questions_file}:{line_number}: expected an object with a \"question\" string")
+
+            job = {"index": len(jobs), "id": entry.get("id"), "question": entry["question"].strip(),
+                   "notebook_url": entry.get("notebook_url") or default_notebook_url, "error": None}
+            if entry.get("notebook_id") and not entry.get("notebook_url"):
+                notebook = library.get_notebook(entry["notebook_id"])
+                job["notebook_url"] = notebook['url'] if notebook else None
+                if not notebook:
+                    job["error"] = f"Notebook '{entry['notebook_id']}' not found"
+            if not job["notebook_url"] and not job["error"]:
+                job["error"] = "No notebook given and no active notebook set"
+            jobs.append(job)
+    return jobs
+
+
+def load_completed_indices(out_file: Path) -> set:
+    """
+    Indices already answered successfully in the answers file
+
+    Failed questions are asked again on the next run; their new line
+    supersedes the old one. A line cut off by a crash is dropped from the
+    file so that appending continues on a clean line boundary.
+    """
+    if not out_file.exists():
+        return set()
+
+    with open(out_file, 'rb') as f:
+        data = f.read()
+    complete = data[:data.rfind(b"\n") + 1]
+    if len(complete) != len(data):
+        print(f"  ⚠️ Dropping incomplete last line of {out_file}")
+        with open(out_file, 'r+b') as f:
+            f.truncate(len(complete))
+
+    done = set()
+    for line in complete.decode("utf-8").splitlines():
+        try:
+            record = json.loads(line)
+            if record.get("status") == "success":
+                done.add(record["index"])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            continue
+    return done
+
+
+def _write_result_line(out, record: Dict[str, Any]):
+    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    out.flush()
+    os.fsync(out.fileno())
+
+
+def _run_question_jobs(jobs: List[Dict[str, Any]], ask, out,
+                       cache: Optional[AnswerCache] = None) -> Tuple[int, int]:
+    """
+    Ask each job with ask(notebook_url, question) and append its result
+
+    Jobs with a cached_answer are written without asking; new answers are
+    stored in the cache.
+
+    Returns:
+        (answered, failed)
+    """
+    answered = failed = 0
+    started = time.time()
+
+    for position, job in enumerate(jobs, 1):
+        print(f"\n[{position}/{len(jobs)}] {job['question']}")
+        job_started = time.time()
+
+        if job["error"]:
+            result = {"status": "error", "error": job["error"]}
+        elif job.get("cached_answer") is not None:
+            print("  💾 Answer from cache")
+            result = {"status": "success", "answer": job["cached_answer"], "cached": True}
+        else:
+            try:
+                result = ask(job["notebook_url"], job["question"])
+            except Exception as e:
+                result = {"status": "error", "error": str(e)}
+            if cache and result.get("status") == "success":
+                cache.put(job["notebook_url"], job["question"], result["answer"])
+
+        record = {
+            "index": job["index"],
+            "id": job["id"],
+            "question": job["question"],
+            "notebook_url": job["notebook_url"],
+            "status": result.get("status", "error"),
+            "cached": bool(result.get("cached")),
+            "latency_seconds": round(time.time() - job_started, 2)
+        }
+        if record["status"] == "success":
+            record["answer"] = result["answer"]
+            answered += 1
+        else:
+            record["error"] = result.get("error", "unknown error")
+            failed += 1
+            print(f"  ❌ {record['error']}")
+        _write_result_line(out, record)
+
+        elapsed = time.time() - started
+        print(f"  📈 {position / max(elapsed / 60, 1e-9):.1f} questions/min")
+
+    return answered, failed
+
+
+def run_question_batch(questions_file: str, out_file: str, library: NotebookLibrary,
+                       default_notebook_url: Optional[str], headless: bool = True,
+                       use_daemon: bool = True, cache: Optional[AnswerCache] = None,
+                       read_cache: bool = True, input_mode: Optional[str] = None) -> int:
+    """
+    Answer every question in a JSONL file, appending results to out_file
+
+    One browser (the daemon's or a one-shot context) and one tab per
+    notebook are reused for all questions. Questions already answered in
+    out_file are skipped, so an interrupted run resumes where it stopped.
+    Cached answers are used without starting a browser (unless read_cache
+    is False); new answers are added to the cache.
+
+    Returns:
+        Process exit code
+    """
+    questions_path = Path(questions_file)
+    out_path = Path(out_file)
+
+    try:
+        jobs = load_question_batch(questions_path, library, default_notebook_url)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read questions: {e}")
+        return 1
+
+    done = load_completed_indices(out_path)
+    todo = [job for job in jobs if job["index"] not in done]
+    print(f"📋 {len(jobs)} questions: {len(jobs) - len(todo)} already answered, {len(todo)} to go")
+    if not todo:
+        return 0
+
+    if cache and read_cache:
+        for job in todo:
+            if not job["error"]:
+                job["cached_answer"] = cache.get(job["notebook_url"], job["question"])
+    to_ask = [job for job in todo if not job["error"] and job.get("cached_answer") is None]
+    cached_count = sum(1 for job in todo if job.get("cached_answer") is not None)
+    if cached_count:
+        print(f"💾 {cached_count} answered from cache, {len(to_ask)} need the browser")
+
+    client = DaemonClient.from_info_file() if use_daemon and to_ask else None
+    if client and not client.health():
+        client = None
+
+    started = time.time()
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, 'a', encoding='utf-8') as out:
+        if not to_ask:
+            answered, failed = _run_question_jobs(todo, None, out, cache)
+        elif client:
+            print(f"  ⚡ Using browser daemon at {client.base_url}")
+            answered, failed = _run_question_jobs(
+                todo, lambda url, question: client.ask(question, url, input_mode=input_mode), out, cache
+            )
+        else:
+            if not AuthManager().is_authenticated():
+                print("⚠️ Not authenticated. Run: python auth_manager.py setup")
+                return 1
+            with _launch_browser(headless) as context:
+                sessions = SessionManager(context)
+                try:
+                    answered, failed = _run_question_jobs(
+                        todo, lambda url, question: sessions.ask(url, question, input_mode), out, cache
+                    )
+                finally:
+                    sessions.close_all()
+
+    elapsed = time.time() - started
+    print("\n" + "=" * 60)
+    print(f"✅ {answered} answered, {failed} failed in {elapsed / 60:.1f} min "
+          f"({len(todo) / max(elapsed / 60, 1e-9):.1f} questions/min)")
+    print(f"📄 Results: {out_path}")
+    print("=" * 60)
+    return 0 if not failed else 1
 
 
 def main():
     parser = argparse.ArgumentParser(description='Ask NotebookLM a question')
 
-    parser.add_argument('--question', required=True, help='Question to ask')
+    parser.add_argument('--question', help='Question to ask')
+    parser.add_argument('--questions-file', help='JSONL file with one {"question": ...} per line')
+    parser.add_argument('--out', help='JSONL answers file for --questions-file (appended, resumable)')
     parser.add_argument('--notebook-url', help='NotebookLM notebook URL')
     parser.add_argument('--notebook-id', help='Notebook ID from library')
+    parser.add_argument('--notebook-ids', help='Comma-separated library IDs to ask in parallel')
+    parser.add_argument('--all-notebooks', action='store_true', help='Ask every notebook in the library in parallel')
     parser.add_argument('--show-browser', action='store_true', help='Show browser')
+    parser.add_argument('--no-daemon', action='store_true',
+                        help='Launch a new browser instead of using browser_daemon.py '
+                             '(refused while the daemon is running - it holds the browser profile)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Print the answer incrementally while NotebookLM is writing it')
+    parser.add_argument('--input-mode', choices=INPUT_MODES, default=None,
+                        help=f'How the question is entered: human (per character), burst (short typed prefix, '
+                             f'rest inserted at once) or adaptive by length (default: {INPUT_MODE})')
+    parser.add_argument('--timing-profile', choices=list(TIMING_PROFILES), default=TIMING_PROFILE,
+                        help=f'How long to pause between UI steps (default: {TIMING_PROFILE})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ask NotebookLM even if a cached answer exists (the new answer is still cached)')
 
     args = parser.parse_args()
 
+    if not args.question and not args.questions_file:
+        parser.error("one of --question or --questions-file is required")
+    if args.questions_file and (args.question or args.stream or args.notebook_ids or args.all_notebooks):
+        parser.error("--questions-file cannot be combined with --question, --stream or fan-out options")
+    if args.questions_file and not args.out:
+        parser.error("--questions-file requires --out")
+
+    timing.set_profile(args.timing_profile)
+
+    # A running daemon owns the browser profile: everything goes through it
+    daemon = DaemonClient.running()
+    if daemon and (args.no_daemon or args.show_browser):
+        print(f"❌ {profile_in_use_message(daemon)}")
+        print("   Or drop --no-daemon/--show-browser to ask through the daemon.")
+        return 1
+    use_daemon = daemon is not None
+    cache = AnswerCache()
+    read_cache = not args.no_cache
+
+    # Batch: questions file -> answers file
+    if args.questions_file:
+        library = NotebookLibrary()
+        default_url = args.notebook_url
+        if not default_url and args.notebook_id:
+            notebook = library.get_notebook(args.notebook_id)
+            if not notebook:
+                print(f"❌ Notebook '{args.notebook_id}' not found")
+                return 1
+            default_url = notebook['url']
+        if not default_url:
+            active = library.get_active_notebook()
+            default_url = active['url'] if active else None
+
+        return run_question_batch(
+            args.questions_file, args.out, library, default_url,
+            headless=not args.show_browser, use_daemon=use_daemon,
+            cache=cache, read_cache=read_cache, input_mode=args.input_mode
+        )
+
+    # Fan-out: same question to several library notebooks
+    if args.notebook_ids or args.all_notebooks:
+        if args.stream:
+            parser.error("--stream cannot be combined with --notebook-ids/--all-notebooks")
+
+        library = NotebookLibrary()
+        if args.all_notebooks:
+            notebooks = library.list_notebooks()
+        else:
+            notebooks = []
+            for notebook_id in [n.strip() for n in args.notebook_ids.split(',') if n.strip()]:
+                notebook = library.get_notebook(notebook_id)
+                if not notebook:
+                    print(f"❌ Notebook '{notebook_id}' not found")
+                    return 1
+                notebooks.append(notebook)
+
+        if not notebooks:
+            print("❌ No notebooks in library")
+            return 1
+
+        started = time.time()
+        results = {}
+        for nb in notebooks:
+            cached = cache.get(nb['url'], args.question) if read_cache else None
+            if cached is not None:
+                results[nb['url']] = {"status": "success", "question": args.question, "answer": cached,
+                                      "notebook_url": nb['url'], "latency_seconds": 0.0, "cached": True}
+
+        urls = [nb['url'] for nb in notebooks if nb['url'] not in results]
+        if results:
+            print(f"💾 {len(results)} notebook(s) answered from cache")
+        if urls:
+            if use_daemon:
+                fresh = ask_many_via_daemon(args.question, urls, args.input_mode) or {
+                    url: {"status": "error", "question": args.question, "error": "Daemon could not answer",
+                          "notebook_url": url, "latency_seconds": 0.0}
+                    for url in urls
+                }
+            else:
+                fresh = ask_many_notebooks(args.question, urls, headless=not args.show_browser,
+                                           input_mode=args.input_mode)
+            for url, result in fresh.items():
+                if result.get("status") == "success":
+                    cache.put(url, args.question, result["answer"])
+            results.update(fresh)
+
+        answered = print_fan_out(args.question, notebooks, results, time.time() - started)
+        return 0 if answered else 1
+
     # Resolve notebook URL
     notebook_url = args.notebook_url
 
@@ -231,12 +808,48 @@ def main():
                 print("python scripts/run.py notebook_manager.py add --url URL --name NAME --description DESC --topics TOPICS")
             return 1
 
-    # Ask the question
-    answer = ask_notebooklm(
-        question=args.question,
-        notebook_url=notebook_url,
-        headless=not args.show_browser
-    )
+    cached = cache.get(notebook_url, args.question) if read_cache else None
+
+    if args.stream:
+        if cached is not None:
+            print("💾 Answer from cache")
+            print_stream(args.question, _cached_chunks(cached))
+            return 0
+
+        if use_daemon:
+            answer, streamed = print_stream(
+                args.question, stream_via_daemon(args.question, notebook_url, args.input_mode)
+            )
+        else:
+            answer, streamed = print_stream(
+                args.question,
+                stream_notebooklm(args.question, notebook_url, headless=not args.show_browser,
+                                  input_mode=args.input_mode)
+            )
+        if not answer:
+            print("\n❌ Failed to get answer")
+            return 1
+        cache.put(notebook_url, args.question, answer)
+        return 0
+
+    # Ask the question (cache first, then the daemon's warm browser if it runs, else a new browser)
+    answer = None
+    if cached is not None:
+        print("💾 Answer from cache")
+        answer = cached + FOLLOW_UP_REMINDER
+
+    if answer is None and use_daemon:
+        answer = ask_via_daemon(args.question, notebook_url, args.input_mode)
+    elif answer is None:
+        answer = ask_notebooklm(
+            question=args.question,
+            notebook_url=notebook_url,
+            headless=not args.show_browser,
+            input_mode=args.input_mode
+        )
+
+    if answer and cached is None:
+        cache.put(notebook_url, args.question, _strip_reminder(answer))
 
     if answer:
         print("\n" + "=" * 60)
@@ -253,4 +866,6 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    exit_code = main()
+    timing.report()
+    sys.exit(exit_code)
@@ -26,6 +26,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from config import BROWSER_STATE_DIR, STATE_FILE, AUTH_INFO_FILE, DATA_DIR
 from browser_utils import BrowserFactory
+from telemetry import span
 
 
 class AuthManager:
@@ -104,14 +105,16 @@ class AuthManager:
             playwright = sync_playwright().start()
 
             # Launch using factory
-            context = BrowserFactory.launch_persistent_context(
-                playwright,
-                headless=headless
-            )
+            with span("browser.launch", headless=headless):
+                context = BrowserFactory.launch_persistent_context(
+                    playwright,
+                    headless=headless
+                )
 
             # Navigate to NotebookLM
             page = context.new_page()
-            page.goto("https://notebooklm.google.com", wait_until="domcontentloaded")
+            with span("notebook.goto", notebook_url="https://notebooklm.google.com"):
+                page.goto("https://notebooklm.google.com", wait_until="domcontentloaded")
 
             # Check if already authenticated
             if "notebooklm.google.com" in page.url and "accounts.google.com" not in page.url:
@@ -126,7 +129,8 @@ class AuthManager:
             try:
                 # Wait for URL to change to NotebookLM (regex ensures it's the actual domain, not a parameter)
                 timeout_ms = int(timeout_minutes * 60 * 1000)
-                page.wait_for_url(re.compile(r"^https://notebooklm\.google\.com/"), timeout=timeout_ms)
+                with span("auth.login"):
+                    page.wait_for_url(re.compile(r"^https://notebooklm\.google\.com/"), timeout=timeout_ms)
 
                 print(f"  ✅ Login successful!")
 
@@ -250,14 +254,16 @@ class AuthManager:
             playwright = sync_playwright().start()
 
             # Launch using factory
-            context = BrowserFactory.launch_persistent_context(
-                playwright,
-                headless=True
-            )
+            with span("browser.launch", headless=True):
+                context = BrowserFactory.launch_persistent_context(
+                    playwright,
+                    headless=True
+                )
 
             # Try to access NotebookLM
             page = context.new_page()
-            page.goto("https://notebooklm.google.com", wait_until="domcontentloaded", timeout=30000)
+            with span("notebook.goto", notebook_url="https://notebooklm.google.com"):
+                page.goto("https://notebooklm.google.com", wait_until="domcontentloaded", timeout=30000)
 
             # Check if we can access NotebookLM
             if "notebooklm.google.com" in page.url and "accounts.google.com" not in page.url:
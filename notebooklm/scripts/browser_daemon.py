@@ -0,0 +1,685 @@
+#!/usr/bin/env python3
+"""
+Browser Daemon for NotebookLM
+Keeps a warm persistent browser context open between questions
+
+ask_question.py normally starts Playwright, launches Chrome, asks one
+question and tears everything down again. The daemon owns a single
+BrowserContext from BrowserFactory.launch_persistent_context() and serves
+questions over a localhost HTTP endpoint. Notebook tabs are pooled by
+SessionManager, so a follow-up question to the same notebook skips both the
+browser launch and the page load. ask_question.py talks to it through DaemonClient and
+falls back to the one-shot path when no daemon is running.
+
+While it runs, the daemon holds the lock on the Chrome profile, so no other
+script can launch a browser of its own: BrowserFactory refuses with
+ProfileInUseError, and ask_question.py sends every question through the
+daemon instead of launching one.
+
+Requests are accepted on HTTP worker threads, so /health answers even while
+a question is running. All browser work is queued to the daemon's main
+thread because the sync Playwright API is not thread-safe. Browser requests
+therefore still run one at a time, and /health reports "busy" meanwhile.
+"""
+
+import argparse
+import json
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import (
+    DATA_DIR, DAEMON_INFO_FILE, DAEMON_LOG_FILE, DAEMON_HOST, DAEMON_PORT,
+    DAEMON_IDLE_TIMEOUT_MINUTES, DAEMON_STARTUP_TIMEOUT_SECONDS, QUERY_TIMEOUT_SECONDS,
+    MAX_SESSIONS
+)
+
+
+class DaemonClient:
+    """
+    Thin HTTP client for a running browser daemon
+
+    Connection details (port and access token) are read from DAEMON_INFO_FILE,
+    which the daemon writes on startup and removes on shutdown.
+    """
+
+    def __init__(self, host: str, port: int, token: str, pid: Optional[int] = None):
+        self.base_url = f"http://{host}:{port}"
+        self.token = token
+        self.pid = pid
+
+    @classmethod
+    def from_info_file(cls) -> Optional["DaemonClient"]:
+        """Return a client for the running daemon, or None if none is registered"""
+        if not DAEMON_INFO_FILE.exists():
+            return None
+        try:
+            with open(DAEMON_INFO_FILE, 'r') as f:
+                info = json.load(f)
+            return cls(info.get("host", DAEMON_HOST), int(info["port"]), info["token"], info.get("pid"))
+        except Exception:
+            return None
+
+    @classmethod
+    def running(cls) -> Optional["DaemonClient"]:
+        """Return a client for the daemon if one is registered and answers /health"""
+        client = cls.from_info_file()
+        return client if client and client.health() else None
+
+    def _build_request(self, method: str, path: str,
+                       payload: Optional[Dict[str, Any]] = None) -> urllib.request.Request:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        return urllib.request.Request(
+            self.base_url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json", "X-Daemon-Token": self.token}
+        )
+
+    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None,
+                 timeout: float = 5) -> Dict[str, Any]:
+        request = self._build_request(method, path, payload)
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            # Error responses still carry a JSON body with details
+            try:
+                return json.loads(e.read().decode("utf-8"))
+            except Exception:
+                return {"status": "error", "error": f"HTTP {e.code}"}
+
+    def health(self) -> Optional[Dict[str, Any]]:
+        """
+        Return daemon status, or None if it is not reachable
+
+        /health is answered off the browser thread, so a daemon that is busy
+        with a question still responds (with "busy": true).
+        """
+        try:
+            return self._request("GET", "/health", timeout=2)
+        except Exception:
+            return None
+
+    def ask(self, question: str, notebook_url: str, timeout: float = QUERY_TIMEOUT_SECONDS + 60,
+            input_mode: Optional[str] = None) -> Dict[str, Any]:
+        """Ask a question through the daemon's warm browser"""
+        return self._request(
+            "POST", "/ask",
+            {"question": question, "notebook_url": notebook_url, "input_mode": input_mode},
+            timeout=timeout
+        )
+
+    def ask_many(self, question: str, notebook_urls: List[str],
+                 input_mode: Optional[str] = None) -> Dict[str, Any]:
+        """Ask the same question in several notebooks; results are keyed by notebook URL"""
+        waves = -(-len(notebook_urls) // MAX_SESSIONS)
+        return self._request(
+            "POST", "/ask/many",
+            {"question": question, "notebook_urls": notebook_urls, "input_mode": input_mode},
+            timeout=(QUERY_TIMEOUT_SECONDS + 60) * max(waves, 1)
+        )
+
+    def ask_stream(self, question: str, notebook_url: str, timeout: float = QUERY_TIMEOUT_SECONDS + 60,
+                   input_mode: Optional[str] = None) -> Generator[str, None, Dict[str, Any]]:
+        """
+        Stream an answer through the daemon
+
+        Yields answer chunks; the generator's return value is the final
+        result dict (same shape as ask()).
+        """
+        request = self._build_request(
+            "POST", "/ask/stream",
+            {"question": question, "notebook_url": notebook_url, "input_mode": input_mode}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                for line in response:
+                    message = json.loads(line.decode("utf-8"))
+                    if "chunk" in message:
+                        yield message["chunk"]
+                    else:
+                        return message
+        except urllib.error.HTTPError as e:
+            try:
+                return json.loads(e.read().decode("utf-8"))
+            except Exception:
+                return {"status": "error", "error": f"HTTP {e.code}"}
+
+        return {"status": "error", "error": "Daemon closed the stream without a result"}
+
+    def list_sessions(self) -> Dict[str, Any]:
+        """List pooled notebook sessions and pool statistics"""
+        return self._request("GET", "/sessions")
+
+    def reset_session(self, notebook_url: str) -> Dict[str, Any]:
+        """Clear the conversation of a pooled session"""
+        return self._request("POST", "/sessions/reset", {"notebook_url": notebook_url}, timeout=60)
+
+    def close_session(self, notebook_url: Optional[str] = None) -> Dict[str, Any]:
+        """Close one pooled session, or all of them when notebook_url is None"""
+        return self._request("POST", "/sessions/close", {"notebook_url": notebook_url}, timeout=30)
+
+    def shutdown(self) -> bool:
+        """Ask the daemon to exit"""
+        try:
+            self._request("POST", "/shutdown", {})
+            return True
+        except Exception:
+            return False
+
+
+def profile_in_use_message(client: DaemonClient) -> str:
+    """Explain that the daemon holds the browser profile and how to release it"""
+    pid = f" (pid {client.pid})" if client.pid else ""
+    return (f"The browser daemon{pid} is using the browser profile. "
+            f"Stop it first: python scripts/run.py browser_daemon.py stop")
+
+
+class BrowserDaemon:
+    """
+    Long-lived owner of one persistent browser context
+
+    Serves /health, /ask, /ask/stream, /ask/many, /sessions and /shutdown on
+    localhost. Requests must carry the
+    random token stored in DAEMON_INFO_FILE. The daemon exits on its own after
+    idle_timeout_minutes without requests.
+    """
+
+    def __init__(self, host: str = DAEMON_HOST, port: int = DAEMON_PORT, headless: bool = True,
+                 idle_timeout_minutes: float = DAEMON_IDLE_TIMEOUT_MINUTES):
+        self.host = host
+        self.port = port
+        self.headless = headless
+        self.idle_timeout_seconds = idle_timeout_minutes * 60
+        self.token = secrets.token_urlsafe(24)
+        self.started_at = time.time()
+        self.last_activity = time.time()
+        self.requests_served = 0
+        self.running = False
+        self.busy = False
+        # Browser work queued by HTTP threads for the main thread: (fn, outcome, done)
+        self._tasks: "queue.Queue" = queue.Queue()
+        self.playwright = None
+        self.context = None
+        self.sessions = None
+
+    def start_browser(self):
+        """Launch the shared persistent context"""
+        from patchright.sync_api import sync_playwright
+        from browser_utils import BrowserFactory
+        from session_manager import SessionManager
+
+        print("🚀 Launching browser context...")
+        self.playwright = sync_playwright().start()
+        self.context = BrowserFactory.launch_persistent_context(
+            self.playwright,
+            headless=self.headless
+        )
+        self.sessions = SessionManager(self.context)
+        print("✅ Browser ready")
+
+    def stop_browser(self):
+        """Close the context and stop Playwright"""
+        if self.sessions:
+            self.sessions.close_all()
+            self.sessions = None
+
+        if self.context:
+            try:
+                self.context.close()
+            except Exception:
+                pass
+            self.context = None
+
+        if self.playwright:
+            try:
+                self.playwright.stop()
+            except Exception:
+                pass
+            self.playwright = None
+
+    def handle_ask(self, question: str, notebook_url: str, input_mode: Optional[str] = None) -> Dict[str, Any]:
+        """Answer one question in the notebook's pooled tab"""
+        return self.sessions.ask(notebook_url, question, input_mode)
+
+    def submit(self, fn: Callable[[], Any]) -> Dict[str, Any]:
+        """
+        Queue fn for the browser (main) thread without waiting
+
+        Returns:
+            Outcome dict; its "done" event is set once fn has finished, with
+            "result" or "error" filled in
+        """
+        outcome = {"done": threading.Event()}
+        self._tasks.put((fn, outcome))
+        return outcome
+
+    def run_in_browser(self, fn: Callable[[], Any]) -> Any:
+        """Run fn on the browser thread and return its result (re-raising its exception)"""
+        outcome = self.submit(fn)
+        outcome["done"].wait()
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    def _run_next_task(self, timeout: float):
+        """Run one queued browser task, waiting up to timeout seconds for it"""
+        try:
+            fn, outcome = self._tasks.get(timeout=timeout)
+        except queue.Empty:
+            return
+
+        self.busy = True
+        self.last_activity = time.time()
+        try:
+            outcome["result"] = fn()
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            if "result" not in outcome and "error" not in outcome:
+                outcome["error"] = RuntimeError("Daemon is shutting down")
+            self.busy = False
+            self.last_activity = time.time()
+            outcome["done"].set()
+
+    def _cancel_pending_tasks(self):
+        """Fail tasks still queued at shutdown so their HTTP threads do not hang"""
+        while True:
+            try:
+                _, outcome = self._tasks.get_nowait()
+            except queue.Empty:
+                return
+            outcome["error"] = RuntimeError("Daemon is shutting down")
+            outcome["done"].set()
+
+    def get_info(self) -> Dict[str, Any]:
+        """Status information returned by /health"""
+        return {
+            "status": "ok",
+            "busy": self.busy,
+            "queued": self._tasks.qsize(),
+            "pid": os.getpid(),
+            "uptime_seconds": time.time() - self.started_at,
+            "idle_seconds": time.time() - self.last_activity,
+            "requests_served": self.requests_served,
+            "headless": self.headless,
+            "sessions": self.sessions.get_stats() if self.sessions else None
+        }
+
+    def _write_info_file(self):
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        info = {
+            "host": self.host,
+            "port": self.port,
+            "token": self.token,
+            "pid": os.getpid(),
+            "started_at": self.started_at
+        }
+        # The token grants browser access - keep the file private
+        fd = os.open(str(DAEMON_INFO_FILE), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(info, f, indent=2)
+
+    def _remove_info_file(self):
+        try:
+            with open(DAEMON_INFO_FILE, 'r') as f:
+                info = json.load(f)
+            if info.get("pid") == os.getpid():
+                DAEMON_INFO_FILE.unlink()
+        except Exception:
+            pass
+
+    def serve_forever(self):
+        """Run the browser task loop until shutdown or idle timeout"""
+        server = ThreadingHTTPServer((self.host, self.port), _make_handler(self))
+        server.daemon_threads = True
+        # Port 0 lets the OS pick a free port
+        self.port = server.server_address[1]
+
+        self.start_browser()
+        self._write_info_file()
+        self.running = True
+        # HTTP requests are accepted on their own threads; browser work comes back here
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.5}, daemon=True).start()
+        print(f"🟢 Daemon listening on http://{self.host}:{self.port} (pid {os.getpid()})")
+
+        try:
+            while self.running:
+                self._run_next_task(timeout=1)
+                if self.sessions:
+                    self.sessions.evict_expired()
+                idle = not self.busy and self._tasks.empty()
+                if idle and time.time() - self.last_activity > self.idle_timeout_seconds:
+                    print(f"💤 Idle for {self.idle_timeout_seconds / 60:.0f} minutes, shutting down")
+                    break
+        except KeyboardInterrupt:
+            print("\n⚠️ Interrupted")
+        finally:
+            server.shutdown()
+            server.server_close()
+            self._cancel_pending_tasks()
+            self._remove_info_file()
+            self.stop_browser()
+            print("🛑 Daemon stopped")
+
+
+def _make_handler(daemon: BrowserDaemon):
+    """Build a request handler bound to the daemon instance"""
+
+    class DaemonRequestHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            print(f"  {self.address_string()} - {format % args}")
+
+        def _send(self, status: int, body: Dict[str, Any]):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _start_stream(self):
+            # HTTP/1.0 without Content-Length: the body ends when the connection closes
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+            self.end_headers()
+
+        def _send_line(self, body: Dict[str, Any]):
+            self.wfile.write((json.dumps(body, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+        def _authorized(self) -> bool:
+            if secrets.compare_digest(self.headers.get("X-Daemon-Token", ""), daemon.token):
+                return True
+            self._send(403, {"status": "error", "error": "Invalid daemon token"})
+            return False
+
+        def _read_json(self) -> Dict[str, Any]:
+            length = int(self.headers.get("Content-Length") or 0)
+            if not length:
+                return {}
+            return json.loads(self.rfile.read(length).decode("utf-8"))
+
+        def _serve(self, fn: Callable[[], Any]) -> Any:
+            """Run a question on the browser thread, counting it as a served request"""
+            def task():
+                result = fn()
+                daemon.requests_served += 1
+                return result
+            return daemon.run_in_browser(task)
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            if self.path == "/health":
+                # Answered on this thread, so it works while the browser is busy
+                self._send(200, daemon.get_info())
+            elif self.path == "/sessions":
+                try:
+                    sessions = daemon.run_in_browser(daemon.sessions.list_sessions)
+                    self._send(200, {
+                        "status": "ok",
+                        "sessions": sessions,
+                        "stats": daemon.sessions.get_stats()
+                    })
+                except Exception as e:
+                    self._send(500, {"status": "error", "error": str(e)})
+            else:
+                self._send(404, {"status": "error", "error": f"Unknown path: {self.path}"})
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            try:
+                payload = self._read_json()
+            except ValueError:
+                self._send(400, {"status": "error", "error": "Invalid JSON body"})
+                return
+
+            if self.path == "/ask/stream":
+                self._stream_answer(payload)
+                return
+
+            try:
+                self._handle_post(payload)
+            except Exception as e:
+                self._send(500, {"status": "error", "error": str(e)})
+
+        def _handle_post(self, payload: Dict[str, Any]):
+            if self.path == "/ask":
+                question = payload.get("question")
+                notebook_url = payload.get("notebook_url")
+                if not question or not notebook_url:
+                    self._send(400, {"status": "error", "error": "question and notebook_url are required"})
+                    return
+
+                result = self._serve(lambda: daemon.handle_ask(question, notebook_url, payload.get("input_mode")))
+                self._send(200, result)
+
+            elif self.path == "/ask/many":
+                question = payload.get("question")
+                notebook_urls = payload.get("notebook_urls")
+                if not question or not notebook_urls or not isinstance(notebook_urls, list):
+                    self._send(400, {"status": "error", "error": "question and notebook_urls are required"})
+                    return
+
+                results = self._serve(
+                    lambda: daemon.sessions.ask_many(notebook_urls, question, input_mode=payload.get("input_mode"))
+                )
+                self._send(200, {"status": "ok", "results": results})
+
+            elif self.path == "/sessions/reset":
+                notebook_url = payload.get("notebook_url")
+                if daemon.run_in_browser(lambda: daemon.sessions.reset_session(notebook_url)):
+                    self._send(200, {"status": "ok", "message": f"Session reset for {notebook_url}"})
+                else:
+                    self._send(404, {"status": "error", "error": f"No open session for {notebook_url}"})
+
+            elif self.path == "/sessions/close":
+                notebook_url = payload.get("notebook_url")
+                if not notebook_url:
+                    def close_all():
+                        count = len(daemon.sessions.sessions)
+                        daemon.sessions.close_all()
+                        return count
+                    count = daemon.run_in_browser(close_all)
+                    self._send(200, {"status": "ok", "message": f"Closed {count} session(s)"})
+                elif daemon.run_in_browser(lambda: daemon.sessions.close_session(notebook_url)):
+                    self._send(200, {"status": "ok", "message": f"Session closed for {notebook_url}"})
+                else:
+                    self._send(404, {"status": "error", "error": f"No open session for {notebook_url}"})
+
+            elif self.path == "/shutdown":
+                daemon.running = False
+                self._send(200, {"status": "ok", "message": "Shutting down"})
+
+            else:
+                self._send(404, {"status": "error", "error": f"Unknown path: {self.path}"})
+
+        def _stream_answer(self, payload: Dict[str, Any]):
+            question = payload.get("question")
+            notebook_url = payload.get("notebook_url")
+            if not question or not notebook_url:
+                self._send(400, {"status": "error", "error": "question and notebook_url are required"})
+                return
+
+            # The browser thread produces lines, this thread writes them out
+            lines: "queue.Queue" = queue.Queue()
+            cancelled = threading.Event()
+
+            def produce():
+                chunks = daemon.sessions.ask_stream(notebook_url, question, payload.get("input_mode"))
+                try:
+                    while not cancelled.is_set():
+                        lines.put({"chunk": next(chunks)})
+                except StopIteration as stop:
+                    lines.put({
+                        "status": "success",
+                        "question": question,
+                        "answer": stop.value,
+                        "notebook_url": notebook_url
+                    })
+                except Exception as e:
+                    lines.put({"status": "error", "question": question, "error": str(e)})
+                finally:
+                    chunks.close()
+                    daemon.requests_served += 1
+                    lines.put(None)
+
+            outcome = daemon.submit(produce)
+            self._start_stream()
+            try:
+                while True:
+                    try:
+                        line = lines.get(timeout=1)
+                    except queue.Empty:
+                        # Shutdown cancelled the task before it started
+                        if outcome["done"].is_set() and lines.empty():
+                            self._send_line({"status": "error", "question": question,
+                                             "error": str(outcome.get("error", "Stream ended"))})
+                            break
+                        continue
+                    if line is None:
+                        break
+                    self._send_line(line)
+            except (BrokenPipeError, ConnectionResetError):
+                cancelled.set()
+                print("  ⚠️ Client disconnected during stream")
+
+    return DaemonRequestHandler
+
+
+def start_daemon_process(port: int = DAEMON_PORT, headless: bool = True,
+                         idle_timeout_minutes: float = DAEMON_IDLE_TIMEOUT_MINUTES) -> bool:
+    """Spawn the daemon in the background and wait until it answers /health"""
+    client = DaemonClient.from_info_file()
+    if client and client.health():
+        print("✅ Daemon is already running")
+        return True
+
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    cmd = [
+        sys.executable, str(Path(__file__).resolve()), "start", "--foreground",
+        "--port", str(port), "--idle-timeout", str(idle_timeout_minutes)
+    ]
+    if not headless:
+        cmd.append("--show-browser")
+
+    print("🚀 Starting browser daemon...")
+    with open(DAEMON_LOG_FILE, 'a') as log:
+        kwargs = {"stdout": log, "stderr": subprocess.STDOUT, "stdin": subprocess.DEVNULL}
+        if os.name == 'nt':
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
+        else:
+            kwargs["start_new_session"] = True
+        process = subprocess.Popen(cmd, **kwargs)
+
+    deadline = time.time() + DAEMON_STARTUP_TIMEOUT_SECONDS
+    while time.time() < deadline:
+        if process.poll() is not None:
+            print(f"❌ Daemon exited during startup (see {DAEMON_LOG_FILE})")
+            return False
+        client = DaemonClient.from_info_file()
+        if client and client.health():
+            print(f"✅ Daemon running at {client.base_url} (pid {process.pid})")
+            return True
+        time.sleep(0.5)
+
+    print(f"❌ Daemon did not become ready within {DAEMON_STARTUP_TIMEOUT_SECONDS}s (see {DAEMON_LOG_FILE})")
+    return False
+
+
+def main():
+    """Command-line interface for the browser daemon"""
+    parser = argparse.ArgumentParser(description='Manage the NotebookLM browser daemon')
+
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+
+    # Start command
+    start_parser = subparsers.add_parser('start', help='Start the daemon in the background')
+    start_parser.add_argument('--port', type=int, default=DAEMON_PORT,
+                              help=f'Localhost port (default: {DAEMON_PORT}, 0 = any free port)')
+    start_parser.add_argument('--idle-timeout', type=float, default=DAEMON_IDLE_TIMEOUT_MINUTES,
+                              help=f'Exit after this many idle minutes (default: {DAEMON_IDLE_TIMEOUT_MINUTES})')
+    start_parser.add_argument('--show-browser', action='store_true', help='Show browser')
+    start_parser.add_argument('--foreground', action='store_true', help='Run in the current process')
+
+    # Status command
+    subparsers.add_parser('status', help='Show daemon status')
+
+    # Stop command
+    subparsers.add_parser('stop', help='Stop the daemon')
+
+    args = parser.parse_args()
+
+    if args.command == 'start':
+        if args.foreground:
+            from auth_manager import AuthManager
+            if not AuthManager().is_authenticated():
+                print("⚠️ Not authenticated. Run: python auth_manager.py setup")
+                return 1
+            BrowserDaemon(
+                port=args.port,
+                headless=not args.show_browser,
+                idle_timeout_minutes=args.idle_timeout
+            ).serve_forever()
+            return 0
+
+        ok = start_daemon_process(
+            port=args.port,
+            headless=not args.show_browser,
+            idle_timeout_minutes=args.idle_timeout
+        )
+        return 0 if ok else 1
+
+    elif args.command == 'status':
+        client = DaemonClient.from_info_file()
+        info = client.health() if client else None
+        if not info:
+            print("⚪ Daemon is not running")
+            return 1
+        print("\n🟢 Browser Daemon:")
+        print(f"  URL: {client.base_url}")
+        print(f"  PID: {info['pid']}")
+        print(f"  Uptime: {info['uptime_seconds'] / 60:.1f} minutes")
+        print(f"  Idle: {info['idle_seconds'] / 60:.1f} minutes")
+        print(f"  Requests served: {info['requests_served']}")
+        if info.get("busy"):
+            print(f"  Busy: answering a request ({info.get('queued', 0)} queued)")
+        stats = info.get("sessions")
+        if stats:
+            print(f"  Sessions: {stats['open_sessions']}/{stats['max_sessions']} open "
+                  f"({stats['reused']} reused, {stats['evicted']} evicted)")
+        return 0
+
+    elif args.command == 'stop':
+        client = DaemonClient.from_info_file()
+        if not client or not client.health():
+            print("⚪ Daemon is not running")
+            return 0
+        if client.shutdown():
+            print("🛑 Daemon is shutting down")
+            return 0
+        print("❌ Could not reach daemon")
+        return 1
+
+    else:
+        parser.print_help()
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,7 @@ Based on the original NotebookLM API implementation
 
 import time
 import sys
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Generator, Optional
 from pathlib import Path
 
 from patchright.sync_api import BrowserContext, Page
@@ -15,7 +15,9 @@ from patchright.sync_api import BrowserContext, Page
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from browser_utils import StealthUtils
+from browser_utils import StealthUtils, timing
+from answer_watcher import AnswerWatcher
+from telemetry import span
 
 
 class BrowserSession:
@@ -58,18 +60,20 @@ class BrowserSession:
 
         try:
             # Navigate to notebook
-            self.page.goto(self.notebook_url, wait_until="domcontentloaded", timeout=30000)
+            with span("notebook.goto", notebook_url=self.notebook_url, session_id=self.id):
+                self.page.goto(self.notebook_url, wait_until="domcontentloaded", timeout=30000)
 
             # Check if login is needed
             if "accounts.google.com" in self.page.url:
                 raise RuntimeError("Authentication required. Please run auth_manager.py setup first.")
 
             # Wait for page to be ready
-            self._wait_for_ready()
+            with span("session.wait_ready", session_id=self.id):
+                self._wait_for_ready()
 
             # Simulate human inspection
             self.stealth.random_mouse_movement(self.page)
-            self.stealth.random_delay(300, 600)
+            timing.pause((300, 600))
 
             print(f"✅ Session {self.id} ready!")
 
@@ -88,49 +92,56 @@ class BrowserSession:
             # Try alternative selector
             self.page.wait_for_selector('textarea[aria-label="Feld für Anfragen"]', timeout=5000, state="visible")
 
-    def ask(self, question: str) -> Dict[str, Any]:
-        """
-        Ask a question in this session
-
-        Args:
-            question: The question to ask
-
-        Returns:
-            Dict with status, question, answer, session_id
-        """
-        try:
-            self.last_activity = time.time()
-            self.message_count += 1
+    def submit(self, question: str, input_mode: Optional[str] = None) -> AnswerWatcher:
+        """Type and submit a question, returning a watcher for its answer"""
+        self.last_activity = time.time()
+        self.message_count += 1
 
-            print(f"💬 [{self.id}] Asking: {question}")
+        print(f"💬 [{self.id}] Asking: {question}")
 
-            # Snapshot current answer to detect new response
-            previous_answer = self._snapshot_latest_response()
+        # Watch for the new response (baseline is the current latest answer)
+        watcher = AnswerWatcher(self.page)
+        watcher.start()
 
-            # Find chat input
-            chat_input_selector = "textarea.query-box-input"
+        # Find chat input
+        chat_input_selector = "textarea.query-box-input"
+        with span("question.wait_input", session_id=self.id):
             try:
                 self.page.wait_for_selector(chat_input_selector, timeout=5000, state="visible")
             except Exception:
                 chat_input_selector = 'textarea[aria-label="Feld für Anfragen"]'
                 self.page.wait_for_selector(chat_input_selector, timeout=5000, state="visible")
 
-            # Click and type with human-like behavior
+        # Click and type with human-like behavior
+        with span("question.type", session_id=self.id, chars=len(question)) as attrs:
             self.stealth.realistic_click(self.page, chat_input_selector)
-            self.stealth.human_type(self.page, chat_input_selector, question)
+            attrs["input_mode"] = self.stealth.input_text(self.page, chat_input_selector, question, input_mode)
+
+        # Small pause before submit
+        timing.pause((300, 800))
+
+        # Submit
+        self.page.keyboard.press("Enter")
 
-            # Small pause before submit
-            self.stealth.random_delay(300, 800)
+        print("  ⏳ Waiting for response...")
+        return watcher
 
-            # Submit
-            self.page.keyboard.press("Enter")
+    def ask(self, question: str, input_mode: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Ask a question in this session
 
-            # Wait for response
-            print("  ⏳ Waiting for response...")
-            self.stealth.random_delay(1500, 3000)
+        Args:
+            question: The question to ask
+            input_mode: Input strategy (see StealthUtils.input_text)
 
-            # Get new answer
-            answer = self._wait_for_latest_answer(previous_answer)
+        Returns:
+            Dict with status, question, answer, session_id
+        """
+        try:
+            with span("session.ask", session_id=self.id, notebook_url=self.notebook_url):
+                watcher = self.submit(question, input_mode)
+                with span("question.wait_answer", session_id=self.id):
+                    answer = watcher.wait()
 
             if not answer:
                 raise Exception("Empty response from NotebookLM")
@@ -154,57 +165,31 @@ class BrowserSession:
                 "session_id": self.id
             }
 
-    def _snapshot_latest_response(self) -> Optional[str]:
-        """Get the current latest response text"""
-        try:
-            # Use correct NotebookLM selector
-            responses = self.page.query_selector_all(".to-user-container .message-text-content")
-            if responses:
-                return responses[-1].inner_text()
-        except Exception:
-            pass
-        return None
-
-    def _wait_for_latest_answer(self, previous_answer: Optional[str], timeout: int = 120) -> str:
-        """Wait for and extract the new answer"""
-        start_time = time.time()
-        last_candidate = None
-        stable_count = 0
+    def ask_stream(self, question: str, input_mode: Optional[str] = None) -> Generator[str, None, str]:
+        """
+        Ask a question and yield the answer in chunks as it is generated
 
-        while time.time() - start_time < timeout:
-            # Check if NotebookLM is still thinking (most reliable indicator)
-            try:
-                thinking_element = self.page.query_selector('div.thinking-message')
-                if thinking_element and thinking_element.is_visible():
-                    time.sleep(0.5)
-                    continue
-            except Exception:
-                pass
+        Args:
+            question: The question to ask
+            input_mode: Input strategy (see StealthUtils.input_text)
 
-            try:
-                # Use correct NotebookLM selector
-                responses = self.page.query_selector_all(".to-user-container .message-text-content")
-
-                if responses:
-                    latest_text = responses[-1].inner_text().strip()
-
-                    # Check if it's a new response
-                    if latest_text and latest_text != previous_answer:
-                        # Check if text is stable (3 consecutive polls)
-                        if latest_text == last_candidate:
-                            stable_count += 1
-                            if stable_count >= 3:
-                                return latest_text
-                        else:
-                            stable_count = 1
-                            last_candidate = latest_text
+        Returns:
+            Complete answer text (generator return value)
 
-            except Exception:
-                pass
+        Raises:
+            Exception: If the question could not be submitted or answered
+        """
+        with span("session.ask", session_id=self.id, notebook_url=self.notebook_url, stream=True):
+            watcher = self.submit(question, input_mode)
+            with span("question.wait_answer", session_id=self.id, stream=True):
+                answer = yield from watcher.stream()
 
-            time.sleep(0.5)
+        if not answer:
+            raise Exception("Empty response from NotebookLM")
 
-        raise TimeoutError(f"No response received within {timeout} seconds")
+        self.last_activity = time.time()
+        print(f"  ✅ Got response ({len(answer)} chars)")
+        return answer
 
     def reset(self):
         """Reset the chat by reloading the page"""
@@ -4,12 +4,21 @@ Handles browser launching, stealth features, and common interactions
 """
 
 import json
+import os
 import time
 import random
-from typing import Optional, List
+from typing import Any, Callable, Optional, List, Tuple
 
 from patchright.sync_api import Playwright, BrowserContext, Page
-from config import BROWSER_PROFILE_DIR, STATE_FILE, BROWSER_ARGS, USER_AGENT
+from config import (
+    BROWSER_PROFILE_DIR, STATE_FILE, BROWSER_ARGS, USER_AGENT,
+    INPUT_MODES, INPUT_MODE, INPUT_ADAPTIVE_THRESHOLD, INPUT_BURST_PREFIX_CHARS,
+    TIMING_PROFILES, TIMING_PROFILE
+)
+
+
+class ProfileInUseError(RuntimeError):
+    """The browser profile is held by a running browser daemon"""
 
 
 class BrowserFactory:
@@ -24,7 +33,14 @@ class BrowserFactory:
         """
         Launch a persistent browser context with anti-detection features
         and cookie workaround.
+
+        Raises:
+            ProfileInUseError: If browser_daemon.py holds the profile (Chrome
+                would fail on the profile lock)
         """
+        if user_data_dir == str(BROWSER_PROFILE_DIR):
+            BrowserFactory._check_profile_free()
+
         # Launch persistent context
         context = playwright.chromium.launch_persistent_context(
             user_data_dir=user_data_dir,
@@ -42,6 +58,16 @@ class BrowserFactory:
 
         return context
 
+    @staticmethod
+    def _check_profile_free():
+        """Refuse to launch while another process's browser daemon owns the profile"""
+        # Imported here: browser_daemon imports this module when it starts its browser
+        from browser_daemon import DaemonClient, profile_in_use_message
+
+        client = DaemonClient.running()
+        if client and client.pid != os.getpid():
+            raise ProfileInUseError(profile_in_use_message(client))
+
     @staticmethod
     def _inject_cookies(context: BrowserContext):
         """Inject cookies from state.json if available"""
@@ -56,6 +82,75 @@ class BrowserFactory:
                 print(f"  ⚠️  Could not load state.json: {e}")
 
 
+class Timing:
+    """
+    Readiness waits bounded by the active timing profile
+
+    Replaces fixed random_delay() sleeps: pause() is a short human-like pause,
+    wait_for() returns as soon as the UI is ready (up to the profile's bound).
+    Each call records the midpoint of the sleep it replaces, so report() can
+    show how much time the run saved.
+    """
+
+    def __init__(self, profile: str = TIMING_PROFILE):
+        self.set_profile(profile)
+        self.legacy_seconds = 0.0
+        self.actual_seconds = 0.0
+
+    def set_profile(self, name: str):
+        """Switch to a named profile from TIMING_PROFILES"""
+        if name not in TIMING_PROFILES:
+            raise ValueError(f"Unknown timing profile '{name}' (expected one of {', '.join(TIMING_PROFILES)})")
+        self.name = name
+        self.profile = TIMING_PROFILES[name]
+
+    def _record(self, legacy_ms: Tuple[int, int], started: float):
+        self.legacy_seconds += (legacy_ms[0] + legacy_ms[1]) / 2000
+        self.actual_seconds += time.time() - started
+
+    def pause(self, legacy_ms: Tuple[int, int]):
+        """Short human-like pause in place of random_delay(*legacy_ms)"""
+        started = time.time()
+        StealthUtils.random_delay(*self.profile["pause"])
+        self._record(legacy_ms, started)
+
+    def wait_for(self, condition: Callable[[int], Any], legacy_ms: Tuple[int, int],
+                 bound: str = "ui_settle", extra_ms: int = 0) -> bool:
+        """
+        Run a readiness wait in place of random_delay(*legacy_ms)
+
+        Args:
+            condition: Called with a timeout in ms; should block until ready
+                       (e.g. a Playwright wait_for_* call) and raise on timeout
+            legacy_ms: The fixed sleep range this wait replaces
+            bound: Profile key holding the maximum wait
+            extra_ms: Added to the bound (e.g. for large uploads)
+
+        Returns:
+            True if the condition was met, False if it timed out
+        """
+        started = time.time()
+        try:
+            condition(self.profile[bound] + extra_ms)
+            ready = True
+        except Exception:
+            ready = False
+        self._record(legacy_ms, started)
+        return ready
+
+    def report(self):
+        """Print time spent in waits versus the fixed sleeps they replaced"""
+        if not self.legacy_seconds:
+            return
+        saved = self.legacy_seconds - self.actual_seconds
+        print(f"⏱️ Timing profile '{self.name}': waited {self.actual_seconds:.1f}s "
+              f"where fixed sleeps averaged {self.legacy_seconds:.1f}s (saved {saved:.1f}s)")
+
+
+# Shared per process, so report() covers the whole run
+timing = Timing()
+
+
 class StealthUtils:
     """Human-like interaction utilities"""
 
@@ -64,6 +159,23 @@ class StealthUtils:
         """Add random delay"""
         time.sleep(random.uniform(min_ms / 1000, max_ms / 1000))
 
+    @staticmethod
+    def random_mouse_movement(page: Page, moves: int = 3):
+        """Move the mouse through a few random points, like a user looking around"""
+        size = page.viewport_size
+        if not size:
+            # Persistent contexts run with no_viewport=True, so ask the window instead
+            try:
+                size = page.evaluate("() => ({width: window.innerWidth, height: window.innerHeight})")
+            except Exception:
+                size = {"width": 1280, "height": 720}
+
+        for _ in range(moves):
+            x = random.uniform(size["width"] * 0.2, size["width"] * 0.8)
+            y = random.uniform(size["height"] * 0.2, size["height"] * 0.8)
+            page.mouse.move(x, y, steps=random.randint(3, 8))
+            StealthUtils.random_delay(50, 150)
+
     @staticmethod
     def human_type(page: Page, selector: str, text: str, wpm_min: int = 320, wpm_max: int = 480):
         """Type with human-like speed"""
@@ -88,6 +200,40 @@ class StealthUtils:
             if random.random() < 0.05:
                 time.sleep(random.uniform(0.15, 0.4))
 
+    @staticmethod
+    def input_text(page: Page, selector: str, text: str, mode: Optional[str] = None) -> str:
+        """
+        Enter text using the configured input strategy
+
+        human types every character (slow for long text), burst types a short
+        human-like prefix and inserts the rest in one input event, adaptive
+        picks human for short text and burst above INPUT_ADAPTIVE_THRESHOLD.
+
+        Returns:
+            The mode that was used
+        """
+        mode = mode or INPUT_MODE
+        if mode not in INPUT_MODES:
+            raise ValueError(f"Unknown input mode '{mode}' (expected one of {', '.join(INPUT_MODES)})")
+        if mode == "adaptive":
+            mode = "burst" if len(text) > INPUT_ADAPTIVE_THRESHOLD else "human"
+
+        started = time.time()
+        if mode == "human" or len(text) <= INPUT_BURST_PREFIX_CHARS:
+            StealthUtils.human_type(page, selector, text)
+        else:
+            prefix, rest = text[:INPUT_BURST_PREFIX_CHARS], text[INPUT_BURST_PREFIX_CHARS:]
+            StealthUtils.human_type(page, selector, prefix)
+            StealthUtils.random_delay(80, 200)
+            try:
+                page.keyboard.insert_text(rest)
+            except Exception:
+                # Fall back to setting the whole value
+                page.fill(selector, text)
+
+        print(f"  ⌨️ Entered {len(text)} chars in {time.time() - started:.2f}s ({mode})")
+        return mode
+
     @staticmethod
     def realistic_click(page: Page, selector: str):
         """Click with realistic movement"""
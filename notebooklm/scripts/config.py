@@ -3,6 +3,7 @@ Configuration for NotebookLM Skill
 Centralizes constants, selectors, and paths
 """
 
+import os
 from pathlib import Path
 
 # Paths
@@ -27,6 +28,8 @@ RESPONSE_SELECTORS = [
     "[data-message-author='assistant']",
 ]
 
+THINKING_SELECTOR = "div.thinking-message"  # Shown while NotebookLM is generating
+
 # Browser Configuration
 BROWSER_ARGS = [
     '--disable-blink-features=AutomationControlled',  # Patches navigator.webdriver
@@ -38,7 +41,73 @@ BROWSER_ARGS = [
 
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 
+# Text input strategy (see StealthUtils.input_text)
+# human: type every character; burst: type a short prefix, insert the rest at once;
+# adaptive: human up to INPUT_ADAPTIVE_THRESHOLD characters, burst above
+INPUT_MODES = ("human", "burst", "adaptive")
+INPUT_MODE = os.environ.get("NOTEBOOKLM_INPUT_MODE", "adaptive")
+if INPUT_MODE not in INPUT_MODES:
+    print(f"⚠️ Ignoring NOTEBOOKLM_INPUT_MODE='{INPUT_MODE}' (expected one of {', '.join(INPUT_MODES)}), "
+          "using 'adaptive'")
+    INPUT_MODE = "adaptive"
+INPUT_ADAPTIVE_THRESHOLD = 120
+INPUT_BURST_PREFIX_CHARS = 12
+
+# Timing profiles (see browser_utils.Timing)
+# pause: human-like pause range in ms between UI actions
+# ui_settle: max ms to wait for the UI to react to an action
+# source_processing: max ms to wait for NotebookLM to accept an added source
+# Readiness waits return as soon as the UI is ready; these are upper bounds.
+TIMING_PROFILES = {
+    "fast": {"pause": (60, 180), "ui_settle": 5000, "source_processing": 30000},
+    "default": {"pause": (200, 450), "ui_settle": 8000, "source_processing": 60000},
+    "cautious": {"pause": (500, 1000), "ui_settle": 15000, "source_processing": 120000},
+}
+TIMING_PROFILE = os.environ.get("NOTEBOOKLM_TIMING_PROFILE", "default")
+if TIMING_PROFILE not in TIMING_PROFILES:
+    print(f"⚠️ Ignoring NOTEBOOKLM_TIMING_PROFILE='{TIMING_PROFILE}' "
+          f"(expected one of {', '.join(TIMING_PROFILES)}), using 'default'")
+    TIMING_PROFILE = "default"
+
 # Timeouts
 LOGIN_TIMEOUT_MINUTES = 10
 QUERY_TIMEOUT_SECONDS = 120
 PAGE_LOAD_TIMEOUT = 30000
+
+# Answer detection (see answer_watcher.py)
+ANSWER_SETTLE_MS = 1000  # Answer is complete once its text is unchanged this long
+ANSWER_POLL_INTERVAL_SECONDS = 0.5  # Fallback polling when the observer cannot run
+
+# Answer cache (see answer_cache.py)
+ANSWER_CACHE_FILE = DATA_DIR / "answer_cache.db"
+ANSWER_CACHE_TTL_HOURS = 24
+ANSWER_CACHE_MAX_ENTRIES = 2000
+
+# Session pool (warm notebook tabs inside one shared context)
+MAX_SESSIONS = 5
+SESSION_TIMEOUT_SECONDS = 900
+
+# Browser daemon (keeps a warm browser context for ask_question.py)
+DAEMON_INFO_FILE = DATA_DIR / "daemon.json"
+DAEMON_LOG_FILE = DATA_DIR / "daemon.log"
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 8765
+DAEMON_IDLE_TIMEOUT_MINUTES = 30
+DAEMON_STARTUP_TIMEOUT_SECONDS = 60
+
+# Latency telemetry (see telemetry.py)
+TELEMETRY_FILE = DATA_DIR / "telemetry.jsonl"
+TELEMETRY_ENABLED = os.environ.get("NOTEBOOKLM_TELEMETRY", "1") != "0"
+TELEMETRY_MAX_BYTES = 5 * 1024 * 1024  # Rotated to telemetry.jsonl.1 above this size
+
+# Bulk source upload (upload_sources.py --bulk)
+UPLOAD_BATCH_SIZE = 10  # Files passed to one file chooser; larger selections are chunked
+UPLOAD_TIMEOUT_MS_PER_MB = 2000  # Extra upload confirmation time per MB on top of the profile's source_processing
+
+# Parallel upload jobs (upload_sources.py jobs)
+UPLOAD_TABS = 3  # Notebooks filled at the same time, one tab each
+UPLOAD_MAX_RETRIES = 2  # Per source, before it is reported as failed
+UPLOAD_POLL_INTERVAL_SECONDS = 0.5
+
+# Upload dedup (see upload_manifest.py)
+UPLOAD_MANIFEST_DIR = DATA_DIR / "upload_manifests"  # One manifest of uploaded sources per notebook
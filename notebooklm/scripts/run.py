@@ -51,8 +51,12 @@ def main():
         print("Usage: python run.py <script_name> [args...]")
         print("\nAvailable scripts:")
         print("  ask_question.py    - Query NotebookLM")
+        print("  browser_daemon.py   - Keep a warm browser for faster queries")
         print("  notebook_manager.py - Manage notebook library")
         print("  session_manager.py  - Manage sessions")
+        print("  answer_cache.py     - Inspect or clear cached answers")
+        print("  telemetry.py        - Latency per phase (p50/p95)")
+        print("  upload_manifest.py  - Show or clear what a notebook already holds")
         print("  auth_manager.py     - Handle authentication")
         print("  cleanup_manager.py  - Clean up skill data")
         sys.exit(1)
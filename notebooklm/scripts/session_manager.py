@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Session Pool for NotebookLM
+Reuses warm BrowserSession tabs per notebook inside one shared context
+
+Opening a notebook tab (navigation + waiting for the chat input) is the
+most expensive part of a question once the browser is running. The
+SessionManager keeps one BrowserSession per notebook URL, so follow-up
+questions go straight to an already loaded tab. Open tabs are capped;
+expired sessions (BrowserSession.is_expired) are evicted first, then the
+least recently used one.
+
+The pool lives inside browser_daemon.py. The CLI below inspects and
+manages the daemon's sessions.
+"""
+
+import argparse
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import (
+    MAX_SESSIONS, SESSION_TIMEOUT_SECONDS, QUERY_TIMEOUT_SECONDS, ANSWER_POLL_INTERVAL_SECONDS
+)
+
+
+class SessionManager:
+    """
+    Pool of BrowserSession tabs keyed by notebook URL
+
+    All sessions share the BrowserContext passed in, so they share cookies
+    and the browser process. Not thread-safe: use it from the thread that
+    owns the Playwright context.
+    """
+
+    def __init__(self, context, max_sessions: int = MAX_SESSIONS,
+                 session_timeout: int = SESSION_TIMEOUT_SECONDS):
+        """
+        Initialize the session pool
+
+        Args:
+            context: Shared browser context for all session tabs
+            max_sessions: Maximum number of open tabs
+            session_timeout: Seconds of inactivity before a session expires
+        """
+        self.context = context
+        self.max_sessions = max_sessions
+        self.session_timeout = session_timeout
+        self.sessions: "OrderedDict[str, Any]" = OrderedDict()
+        self._counter = 0
+
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    def _is_usable(self, session) -> bool:
+        """A pooled session can be reused if its tab is still open and not expired"""
+        try:
+            if session.page is None or session.page.is_closed():
+                return False
+        except Exception:
+            return False
+        return not session.is_expired(self.session_timeout)
+
+    def _drop(self, notebook_url: str):
+        session = self.sessions.pop(notebook_url, None)
+        if session:
+            session.close()
+            self.evicted += 1
+
+    def evict_expired(self) -> int:
+        """Close sessions that are expired or whose tab has gone away"""
+        stale = [url for url, session in self.sessions.items() if not self._is_usable(session)]
+        for url in stale:
+            print(f"♻️ Evicting idle session for {url}")
+            self._drop(url)
+        return len(stale)
+
+    def get_session(self, notebook_url: str):
+        """
+        Return a warm session for the notebook, creating one if needed
+
+        Args:
+            notebook_url: NotebookLM notebook URL
+
+        Returns:
+            BrowserSession with its tab on the notebook
+        """
+        from browser_session import BrowserSession
+
+        self.evict_expired()
+
+        session = self.sessions.get(notebook_url)
+        if session:
+            self.sessions.move_to_end(notebook_url)
+            self.reused += 1
+            print(f"♻️ Reusing warm session {session.id}")
+            return session
+
+        # Make room: least recently used session goes first
+        while len(self.sessions) >= self.max_sessions:
+            oldest_url = next(iter(self.sessions))
+            print(f"♻️ Session limit ({self.max_sessions}) reached, closing LRU session for {oldest_url}")
+            self._drop(oldest_url)
+
+        self._counter += 1
+        session = BrowserSession(f"session-{self._counter}", self.context, notebook_url)
+        self.sessions[notebook_url] = session
+        self.created += 1
+        return session
+
+    def ask(self, notebook_url: str, question: str, input_mode: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Ask a question using the pooled session for the notebook
+
+        Returns:
+            BrowserSession.ask() result dict
+        """
+        try:
+            session = self.get_session(notebook_url)
+        except Exception as e:
+            return {"status": "error", "question": question, "error": str(e)}
+
+        result = session.ask(question, input_mode)
+
+        # A failed question may leave the tab in an unknown state - start fresh next time
+        if result.get("status") != "success":
+            self._drop(notebook_url)
+
+        return result
+
+    def ask_many(self, notebook_urls: List[str], question: str, timeout: float = QUERY_TIMEOUT_SECONDS,
+                 input_mode: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Ask the same question in several notebooks at once
+
+        The question is submitted in every notebook's tab first and the
+        answers are then collected round-robin, so NotebookLM generates them
+        concurrently. Notebooks are handled in waves of max_sessions tabs.
+        A failing notebook only affects its own result.
+
+        Args:
+            notebook_urls: Target notebook URLs
+            question: The question to ask
+            timeout: Seconds to wait for the answers of one wave
+            input_mode: Input strategy (see StealthUtils.input_text)
+
+        Returns:
+            BrowserSession.ask()-style result dict per notebook URL, each with
+            latency_seconds (tab ready + submit + answer)
+        """
+        urls = list(dict.fromkeys(notebook_urls))
+        results = {}
+        for start in range(0, len(urls), self.max_sessions):
+            results.update(self._ask_wave(urls[start:start + self.max_sessions], question, timeout, input_mode))
+        return results
+
+    def _ask_wave(self, urls: List[str], question: str, timeout: float,
+                  input_mode: Optional[str]) -> Dict[str, Dict[str, Any]]:
+        results = {}
+        pending = {}
+
+        def failed(url: str, started: float, error: Exception):
+            print(f"  ❌ [{url}] {error}")
+            results[url] = {
+                "status": "error",
+                "question": question,
+                "error": str(error),
+                "notebook_url": url,
+                "latency_seconds": time.time() - started
+            }
+            self._drop(url)
+
+        # Submit everywhere first so the answers are generated in parallel
+        for url in urls:
+            started = time.time()
+            try:
+                session = self.get_session(url)
+                pending[url] = (session, session.submit(question, input_mode), started)
+            except Exception as e:
+                failed(url, started, e)
+
+        deadline = time.time() + timeout
+        while pending:
+            for url, (session, watcher, started) in list(pending.items()):
+                try:
+                    state = watcher.poll()
+                    if not state["done"]:
+                        if time.time() < deadline:
+                            continue
+                        raise TimeoutError(f"No response received within {timeout} seconds")
+                    if not state["text"]:
+                        raise Exception("Empty response from NotebookLM")
+
+                    session.last_activity = time.time()
+                    latency = time.time() - started
+                    print(f"  ✅ [{session.id}] Got response ({len(state['text'])} chars, {latency:.1f}s)")
+                    results[url] = {
+                        "status": "success",
+                        "question": question,
+                        "answer": state["text"],
+                        "session_id": session.id,
+                        "notebook_url": url,
+                        "latency_seconds": latency
+                    }
+                except Exception as e:
+                    failed(url, started, e)
+                del pending[url]
+
+            if pending:
+                time.sleep(ANSWER_POLL_INTERVAL_SECONDS)
+
+        return results
+
+    def ask_stream(self, notebook_url: str, question: str,
+                   input_mode: Optional[str] = None) -> Generator[str, None, str]:
+        """
+        Stream an answer from the pooled session for the notebook
+
+        Yields answer chunks and returns the complete answer. Raises on failure.
+        """
+        session = self.get_session(notebook_url)
+        try:
+            return (yield from session.ask_stream(question, input_mode))
+        except Exception:
+            self._drop(notebook_url)
+            raise
+
+    def reset_session(self, notebook_url: str) -> bool:
+        """Clear the conversation in a notebook's session (reloads the tab)"""
+        session = self.sessions.get(notebook_url)
+        if not session:
+            return False
+        session.reset()
+        return True
+
+    def close_session(self, notebook_url: str) -> bool:
+        """Close the session for one notebook"""
+        if notebook_url not in self.sessions:
+            return False
+        self._drop(notebook_url)
+        return True
+
+    def close_all(self):
+        """Close every pooled session"""
+        for url in list(self.sessions):
+            self._drop(url)
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        """Info for all pooled sessions, most recently used last"""
+        return [session.get_info() for session in self.sessions.values()]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool statistics"""
+        return {
+            "open_sessions": len(self.sessions),
+            "max_sessions": self.max_sessions,
+            "created": self.created,
+            "reused": self.reused,
+            "evicted": self.evicted
+        }
+
+
+def main():
+    """Command-line interface for the daemon's session pool"""
+    from browser_daemon import DaemonClient
+
+    parser = argparse.ArgumentParser(description='Manage pooled NotebookLM sessions in the browser daemon')
+
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+
+    # List command
+    subparsers.add_parser('list', help='List open sessions')
+
+    # Reset command
+    reset_parser = subparsers.add_parser('reset', help='Clear the conversation of a session')
+    reset_parser.add_argument('--notebook-url', required=True, help='Notebook URL of the session')
+
+    # Close command
+    close_parser = subparsers.add_parser('close', help='Close session(s)')
+    close_parser.add_argument('--notebook-url', help='Notebook URL of the session')
+    close_parser.add_argument('--all', action='store_true', help='Close all sessions')
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return 0
+
+    client = DaemonClient.from_info_file()
+    if not client or not client.health():
+        print("⚪ Browser daemon is not running. Start it with: python scripts/run.py browser_daemon.py start")
+        return 1
+
+    if args.command == 'list':
+        result = client.list_sessions()
+        sessions = result.get("sessions", [])
+        stats = result.get("stats", {})
+        print(f"\n🗂️ Sessions: {stats.get('open_sessions', len(sessions))}/{stats.get('max_sessions', '?')} open "
+              f"(created {stats.get('created', 0)}, reused {stats.get('reused', 0)}, evicted {stats.get('evicted', 0)})")
+        for info in sessions:
+            print(f"\n  🧭 {info['id']}")
+            print(f"     Notebook: {info['notebook_url']}")
+            print(f"     Messages: {info['message_count']}")
+            print(f"     Idle: {info['inactive_seconds']:.0f}s")
+        return 0
+
+    elif args.command == 'reset':
+        result = client.reset_session(args.notebook_url)
+        print(result.get("message") or result.get("error"))
+        return 0 if result.get("status") == "ok" else 1
+
+    elif args.command == 'close':
+        if not args.all and not args.notebook_url:
+            print("❌ Specify --notebook-url or --all")
+            return 1
+        result = client.close_session(None if args.all else args.notebook_url)
+        print(result.get("message") or result.get("error"))
+        return 0 if result.get("status") == "ok" else 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Source File Scanner for NotebookLM
+Streams upload candidates out of a directory tree
+
+scan_files() walks the tree with os.scandir and yields each matching file
+as soon as it is found, so upload_sources.py can start uploading while the
+rest of the tree is still being scanned. Every directory is read once
+(extensions match case-insensitively), entries are visited in sorted order,
+and include/exclude patterns, size and modification time are checked from
+the directory entry before a file is yielded.
+"""
+
+import os
+import re
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Generator, Iterable, List, Optional
+
+
+_SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "kb": 1024, "m": 1024 ** 2, "mb": 1024 ** 2, "g": 1024 ** 3, "gb": 1024 ** 3}
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a size such as "500K", "20MB" or "1048576"
+
+    Raises:
+        ValueError: If the size cannot be parsed
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\s*", text)
+    if not match or match.group(2).lower() not in _SIZE_UNITS:
+        raise ValueError(f"Invalid size '{text}' (e.g. 500K, 20M, 1G)")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).lower()])
+
+
+def _matches(relative_path: str, name: str, patterns: Iterable[str]) -> bool:
+    """Glob patterns match the path relative to the scan root or just the name"""
+    return any(fnmatch(relative_path, pattern) or fnmatch(name, pattern) for pattern in patterns)
+
+
+def scan_files(
+    root: str,
+    extensions: Optional[Iterable[str]] = None,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    recursive: bool = True,
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+    modified_after: Optional[float] = None,
+    include_hidden: bool = False
+) -> Generator[str, None, None]:
+    """
+    Yield matching files under root as they are found
+
+    Args:
+        root: Directory to scan
+        extensions: Allowed extensions, with or without dot (None: any)
+        include: Glob patterns a file must match (relative path or name)
+        exclude: Glob patterns for files and directories to skip
+        recursive: Descend into subdirectories
+        min_size: Minimum file size in bytes
+        max_size: Maximum file size in bytes
+        modified_after: Only files modified after this Unix timestamp
+        include_hidden: Also scan entries whose name starts with "."
+
+    Yields:
+        Absolute file paths, depth-first in sorted order
+    """
+    root_path = Path(root).absolute()
+    exts = {f".{e.lower().lstrip('.')}" for e in extensions} if extensions else None
+    include = include or []
+    exclude = exclude or []
+
+    # Directories still to read, as (absolute path, path relative to root)
+    pending = [(str(root_path), "")]
+    while pending:
+        directory, relative_dir = pending.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            print(f"  ⚠️ Cannot read {directory}: {e}")
+            continue
+
+        subdirectories = []
+        for entry in entries:
+            if not include_hidden and entry.name.startswith("."):
+                continue
+            relative_path = f"{relative_dir}{entry.name}"
+            if _matches(relative_path, entry.name, exclude):
+                continue
+
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        subdirectories.append((entry.path, f"{relative_path}/"))
+                    continue
+                if not entry.is_file():
+                    continue
+                if exts is not None and os.path.splitext(entry.name)[1].lower() not in exts:
+                    continue
+                if include and not _matches(relative_path, entry.name, include):
+                    continue
+
+                if min_size is not None or max_size is not None or modified_after is not None:
+                    stat = entry.stat()
+                    if min_size is not None and stat.st_size < min_size:
+                        continue
+                    if max_size is not None and stat.st_size > max_size:
+                        continue
+                    if modified_after is not None and stat.st_mtime <= modified_after:
+                        continue
+            except OSError:
+                continue  # Vanished or unreadable while scanning
+
+            yield entry.path
+
+        # Reversed so the stack pops subdirectories in sorted order
+        pending.extend(reversed(subdirectories))
+
+
+def modified_within(days: float) -> float:
+    """Unix timestamp `days` ago, for scan_files(modified_after=...)"""
+    return time.time() - days * 86400
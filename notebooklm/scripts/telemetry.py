@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Latency Telemetry for NotebookLM
+Structured timing spans around each phase of a browser operation
+
+Every phase (browser launch, navigation, waiting for the chat input, typing,
+waiting for the answer, uploading a source, ...) is wrapped in span(). Each
+finished span is appended to TELEMETRY_FILE as one JSON line shaped like an
+OpenTelemetry span (trace_id, span_id, parent_span_id, name, start/end time
+in unix nanoseconds, status, attributes), so the file can be fed to an OTLP
+collector as well as read by the summary command below:
+
+    python scripts/run.py telemetry.py summary
+
+Set NOTEBOOKLM_TELEMETRY=0 to disable recording.
+"""
+
+import argparse
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import TELEMETRY_FILE, TELEMETRY_ENABLED, TELEMETRY_MAX_BYTES
+
+
+SERVICE_NAME = "notebooklm-skill"
+
+# Open spans of the current thread, innermost last: (trace_id, span_id)
+_local = threading.local()
+
+
+def _open_spans() -> List[tuple]:
+    if not hasattr(_local, "spans"):
+        _local.spans = []
+    return _local.spans
+
+
+def _write_span(record: Dict[str, Any], path: Path = TELEMETRY_FILE):
+    """Append one span; telemetry must never break the operation it measures"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Keep one rotated file so the log cannot grow without bound
+        if path.exists() and path.stat().st_size > TELEMETRY_MAX_BYTES:
+            path.replace(path.with_suffix(path.suffix + ".1"))
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except Exception:
+        pass
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Dict[str, Any]]:
+    """
+    Time a phase and record it as a span
+
+    Spans opened inside another span (in the same thread) become its
+    children and share its trace_id. Exceptions are recorded as
+    status ERROR and re-raised.
+
+    Args:
+        name: Phase name, e.g. "browser.launch" or "question.wait_answer"
+        **attributes: Extra span attributes (notebook URL, file size, ...)
+
+    Yields:
+        The attribute dict, so callers can add attributes found during the phase
+    """
+    if not TELEMETRY_ENABLED:
+        yield attributes
+        return
+
+    stack = _open_spans()
+    parent = stack[-1] if stack else None
+    trace_id = parent[0] if parent else secrets.token_hex(16)
+    entry = (trace_id, secrets.token_hex(8))
+    stack.append(entry)
+
+    status, error = "OK", None
+    start_ns = time.time_ns()
+    started = time.perf_counter()
+    try:
+        yield attributes
+    except BaseException as e:
+        # GeneratorExit means a streaming consumer stopped early, not a failure
+        if not isinstance(e, GeneratorExit):
+            status, error = "ERROR", f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        # Remove by identity: generators may close spans out of order
+        if entry in stack:
+            stack.remove(entry)
+
+        record = {
+            "trace_id": trace_id,
+            "span_id": entry[1],
+            "parent_span_id": parent[1] if parent else None,
+            "name": name,
+            "start_time_unix_nano": start_ns,
+            "end_time_unix_nano": start_ns + int(duration_ms * 1_000_000),
+            "duration_ms": round(duration_ms, 1),
+            "status": status,
+            "attributes": {k: v for k, v in attributes.items() if v is not None},
+            "resource": {"service.name": SERVICE_NAME, "process.pid": os.getpid(),
+                         "script": Path(sys.argv[0]).name}
+        }
+        if error:
+            record["error"] = error
+        _write_span(record)
+
+
+def load_spans(path: Path = TELEMETRY_FILE, since_hours: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Read recorded spans (including the rotated file)
+
+    Args:
+        path: Telemetry JSONL file
+        since_hours: Only spans that started within this many hours
+
+    Returns:
+        Span records, oldest file first
+    """
+    cutoff = time.time_ns() - int(since_hours * 3600 * 1e9) if since_hours else 0
+    spans = []
+    for file in (path.with_suffix(path.suffix + ".1"), path):
+        if not file.exists():
+            continue
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Partial line from an interrupted write
+                if record.get("start_time_unix_nano", 0) >= cutoff:
+                    spans.append(record)
+    return spans
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil without float error
+    return ordered[int(rank) - 1]
+
+
+def summarize(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Latency statistics per phase
+
+    Returns:
+        One dict per span name (count, errors, p50_ms, p95_ms, max_ms),
+        sorted by name
+    """
+    by_name: Dict[str, List[Dict[str, Any]]] = {}
+    for record in spans:
+        by_name.setdefault(record["name"], []).append(record)
+
+    rows = []
+    for name in sorted(by_name):
+        records = by_name[name]
+        durations = [r["duration_ms"] for r in records]
+        rows.append({
+            "name": name,
+            "count": len(records),
+            "errors": sum(1 for r in records if r.get("status") == "ERROR"),
+            "p50_ms": percentile(durations, 50),
+            "p95_ms": percentile(durations, 95),
+            "max_ms": max(durations)
+        })
+    return rows
+
+
+def main():
+    """Command-line interface for recorded telemetry"""
+    parser = argparse.ArgumentParser(description='Inspect NotebookLM latency telemetry')
+
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+
+    # Summary command
+    summary_parser = subparsers.add_parser('summary', help='Show p50/p95 latency per phase')
+    summary_parser.add_argument('--since-hours', type=float, help='Only spans from the last N hours')
+    summary_parser.add_argument('--phase', help='Only phases starting with this prefix (e.g. upload.)')
+    summary_parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+
+    # Clear command
+    subparsers.add_parser('clear', help='Delete recorded spans')
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return 0
+
+    if args.command == 'summary':
+        spans = load_spans(since_hours=args.since_hours)
+        if args.phase:
+            spans = [s for s in spans if s["name"].startswith(args.phase)]
+        rows = summarize(spans)
+
+        if args.json:
+            print(json.dumps(rows, indent=2))
+            return 0
+
+        if not rows:
+            print(f"📭 No spans recorded in {TELEMETRY_FILE}")
+            return 0
+
+        width = max(len(row["name"]) for row in rows)
+        print(f"\n⏱️ Latency per phase ({len(spans)} spans)\n")
+        print(f"  {'Phase':<{width}}  {'Count':>6}  {'Errors':>6}  {'p50':>9}  {'p95':>9}  {'Max':>9}")
+        for row in rows:
+            print(f"  {row['name']:<{width}}  {row['count']:>6}  {row['errors']:>6}  "
+                  f"{row['p50_ms'] / 1000:>8.2f}s  {row['p95_ms'] / 1000:>8.2f}s  {row['max_ms'] / 1000:>8.2f}s")
+
+    elif args.command == 'clear':
+        removed = 0
+        for file in (TELEMETRY_FILE, TELEMETRY_FILE.with_suffix(TELEMETRY_FILE.suffix + ".1")):
+            if file.exists():
+                file.unlink()
+                removed += 1
+        print(f"🧹 Removed {removed} telemetry file(s)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Parallel Upload Jobs for NotebookLM
+Fills several notebooks at once from a job file, one tab per notebook
+
+Job file (JSON), keyed by notebook URL or library ID:
+    {
+      "my-notebook-id": {"files": ["/docs/a.pdf"], "urls": ["https://example.com"], "texts": ["..."]},
+      "https://notebooklm.google.com/notebook/...": {"files": ["/docs/b.md"]}
+    }
+
+All tabs share one persistent browser context. Playwright's sync API is
+single-threaded, so every tab is driven by an UploadWorker state machine and
+the workers are stepped round-robin. Opening a notebook and submitting a
+source (clicking through the add source dialog) block the loop until they
+finish, so only one tab does either at a time. The slow part - NotebookLM
+processing the source - is polled without blocking, and that is where the
+tabs overlap: notebooks process their sources while another tab submits.
+"""
+
+import json
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from patchright.sync_api import BrowserContext, sync_playwright
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import (
+    UPLOAD_BATCH_SIZE, UPLOAD_TABS, UPLOAD_MAX_RETRIES, UPLOAD_POLL_INTERVAL_SECONDS, UPLOAD_TIMEOUT_MS_PER_MB
+)
+from browser_utils import BrowserFactory, timing
+from telemetry import span
+from upload_sources import SUPPORTED_EXTENSIONS, SOURCES_CHANGED_JS
+from upload_manifest import UploadManifest
+
+
+def load_upload_jobs(jobs_file: Path, manager) -> List[Dict[str, Any]]:
+    """
+    Read a job file into one job per notebook
+
+    Files are grouped into tasks of UPLOAD_BATCH_SIZE (one file chooser
+    each), all URLs of a notebook form one task, every text is its own task.
+    Sources in the notebook's upload manifest are left out unless
+    manager.force is set.
+
+    Args:
+        jobs_file: JSON job file (see module docstring)
+        manager: UploadManager used to resolve library IDs
+
+    Returns:
+        List of {"notebook_url", "tasks"} dicts
+
+    Raises:
+        ValueError: If the file is malformed or a notebook cannot be resolved
+    """
+    try:
+        with open(jobs_file, encoding="utf-8") as f:
+            data = json.load(f)
+    except ValueError as e:
+        raise ValueError(f"{jobs_file} is not valid JSON: {e}")
+    if not isinstance(data, dict) or not data:
+        raise ValueError(f"{jobs_file} must map notebook URLs or IDs to their sources")
+
+    jobs = []
+    for key, sources in data.items():
+        notebook_url = key if key.startswith("http") else manager.resolve_notebook_url(None, key)
+        if not notebook_url:
+            raise ValueError(f"Notebook '{key}' not found in library")
+        if not isinstance(sources, dict):
+            raise ValueError(f"Sources for '{key}' must be an object with files/urls/texts")
+        for kind in ("files", "urls", "texts"):
+            if not isinstance(sources.get(kind, []), list):
+                raise ValueError(f"'{kind}' for '{key}' must be a list, got {type(sources[kind]).__name__}")
+
+        files = []
+        for file_path in sources.get("files", []):
+            path = Path(file_path)
+            if not path.exists():
+                print(f"  ⚠️ File not found: {file_path}")
+                continue
+            if path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+                print(f"  ⚠️ Unsupported file type: {path.suffix} ({file_path})")
+                continue
+            files.append(str(path.absolute()))
+        urls = list(sources.get("urls", []))
+        texts = [text for text in sources.get("texts", []) if text]
+
+        if not manager.force:
+            manifest = UploadManifest(notebook_url)
+            requested = len(files) + len(urls) + len(texts)
+            groups = manifest.split_files(files)
+            files = groups["new"] + groups["modified"]
+            urls = [url for url in urls if not manifest.has_url(url)]
+            texts = [text for text in texts if not manifest.has_text(text)]
+            skipped = requested - len(files) - len(urls) - len(texts)
+            if skipped:
+                print(f"  ⏭️ [{key}] Skipping {skipped} source(s) already in the notebook")
+
+        tasks = [{"kind": "files", "items": files[start:start + UPLOAD_BATCH_SIZE]}
+                 for start in range(0, len(files), UPLOAD_BATCH_SIZE)]
+        if urls:
+            tasks.append({"kind": "urls", "items": urls})
+        tasks.extend({"kind": "text", "items": [text]} for text in texts)
+
+        if tasks:
+            jobs.append({"notebook_url": notebook_url, "tasks": tasks})
+    return jobs
+
+
+class UploadWorker:
+    """
+    Uploads one notebook's sources in its own tab
+
+    States: open (load the notebook) -> ready (submit the next task) ->
+    processing (poll until its sources are listed) -> ready ... -> done.
+    A failed step reloads the tab and retries the task, up to max_retries
+    times per task; failures of one worker never affect the others.
+    """
+
+    KIND_LABELS = {"files": "file(s)", "urls": "URL(s)", "text": "text source(s)"}
+
+    def __init__(self, manager, context: BrowserContext, notebook_url: str,
+                 tasks: List[Dict[str, Any]], max_retries: int = UPLOAD_MAX_RETRIES):
+        """
+        Initialize the worker
+
+        Args:
+            manager: UploadManager providing the dialog helpers
+            context: Shared browser context
+            notebook_url: Notebook to fill
+            tasks: Tasks from load_upload_jobs()
+            max_retries: Retries per task (and for loading the notebook)
+        """
+        self.manager = manager
+        self.context = context
+        self.notebook_url = notebook_url
+        self.tasks = deque(dict(task, attempts=0) for task in tasks)
+        self.max_retries = max_retries
+
+        self.page = None
+        self.state = "open"
+        self.current: Optional[Dict[str, Any]] = None
+        self.before: Optional[Dict[str, int]] = None
+        self.args: Dict[str, Any] = {}
+        self.deadline = 0.0
+        self.open_failures = 0
+
+        self.added: List[str] = []
+        self.confirmed: List[Dict[str, Any]] = []
+        self.likely_added: List[str] = []
+        self.errors: List[Dict[str, str]] = []
+        self.retries = 0
+
+    @property
+    def done(self) -> bool:
+        return self.state == "done"
+
+    def step(self):
+        """
+        Advance by one step
+
+        Polling a processing task returns at once; opening the notebook and
+        submitting a task block every other worker until they finish.
+        """
+        try:
+            if self.state == "open":
+                self._open()
+                self.state = "ready"
+            elif self.state == "ready":
+                if not self.tasks:
+                    self.state = "done"
+                    return
+                self.current = self.tasks.popleft()
+                self._submit(self.current)
+                self.state = "processing"
+            elif self.state == "processing":
+                self._poll()
+        except Exception as e:
+            self._fail(e)
+
+    def _open(self):
+        if self.page is None:
+            self.page = self.context.new_page()
+        print(f"  🌐 [{self.notebook_url}] Opening notebook...")
+        with span("notebook.goto", notebook_url=self.notebook_url):
+            self.page.goto(self.notebook_url, wait_until="domcontentloaded", timeout=30000)
+        if "accounts.google.com" in self.page.url:
+            raise RuntimeError("Authentication required.")
+        self.manager.wait_for_page_ready(self.page)
+
+    def _submit(self, task: Dict[str, Any]):
+        items = task["items"]
+        name = Path(items[0]).stem if task["kind"] == "files" and len(items) == 1 else None
+        self.before = self.manager.source_snapshot(self.page, name)
+
+        print(f"  📤 [{self.notebook_url}] Adding {len(items)} {self.KIND_LABELS[task['kind']]}...")
+        with span("upload.submit", kind=task["kind"], sources=len(items), attempt=task["attempts"] + 1):
+            if task["kind"] == "files":
+                self.manager.open_upload_dialog(self.page)
+                self.manager.select_files(self.page, items)
+                size_bytes = sum(Path(file_path).stat().st_size for file_path in items)
+            elif task["kind"] == "urls":
+                self.manager.submit_urls(self.page, items)
+                size_bytes = 0
+            else:
+                self.manager.submit_text(self.page, items[0])
+                size_bytes = len(items[0].encode("utf-8"))
+
+        timeout_ms = timing.profile["source_processing"] + size_bytes / (1024 * 1024) * UPLOAD_TIMEOUT_MS_PER_MB
+        self.deadline = time.time() + timeout_ms / 1000
+        self.args = {
+            "selectors": self.manager.get_selectors("source_item"),
+            "expected": self.before["count"] + len(items),
+            "name": name,
+            "named": self.before["named"]
+        }
+
+    def _poll(self):
+        task = self.current
+        if self.page.evaluate(SOURCES_CHANGED_JS, self.args):
+            print(f"  ✅ [{self.notebook_url}] Added {len(task['items'])} {self.KIND_LABELS[task['kind']]}")
+            self.added.extend(self._labels(task))
+            self.confirmed.append(task)
+        elif time.time() < self.deadline:
+            return
+        else:
+            added = self.manager.source_snapshot(self.page)["count"] - self.before["count"]
+            if added <= 0:
+                raise TimeoutError("Sources did not appear in the notebook")
+            # Some sources arrived: retrying could duplicate them
+            print(f"  ⚠️ [{self.notebook_url}] Only {added}/{len(task['items'])} source(s) appeared - check manually")
+            self.likely_added.extend(self._labels(task))
+
+        self.current = None
+        self.state = "ready"
+
+    def _fail(self, error: Exception):
+        task = self.current
+        self.current = None
+
+        if task is None:
+            # Loading the notebook failed
+            self.open_failures += 1
+            if self.open_failures <= self.max_retries:
+                print(f"  🔁 [{self.notebook_url}] Could not open notebook ({error}), retrying")
+                self.retries += 1
+                self.state = "open"
+                return
+            print(f"  ❌ [{self.notebook_url}] Giving up: {error}")
+            for remaining in self.tasks:
+                self.errors.extend({"source": label, "error": str(error)} for label in self._labels(remaining))
+            self.tasks.clear()
+            self.state = "done"
+            return
+
+        task["attempts"] += 1
+        if task["attempts"] <= self.max_retries:
+            print(f"  🔁 [{self.notebook_url}] Adding {self.KIND_LABELS[task['kind']]} failed ({error}), "
+                  f"retry {task['attempts']}/{self.max_retries}")
+            self.retries += 1
+            self.tasks.appendleft(task)
+        else:
+            print(f"  ❌ [{self.notebook_url}] Adding {self.KIND_LABELS[task['kind']]} failed after "
+                  f"{task['attempts']} attempt(s): {error}")
+            self.errors.extend({"source": label, "error": str(error)} for label in self._labels(task))
+
+        # Reload the notebook so the next attempt starts without a half-open dialog
+        self.state = "open" if self.tasks else "done"
+
+    @staticmethod
+    def _labels(task: Dict[str, Any]) -> List[str]:
+        if task["kind"] == "text":
+            return [f"text ({len(task['items'][0])} chars)"]
+        return list(task["items"])
+
+    def close(self):
+        if self.page:
+            try:
+                self.page.close()
+            except Exception:
+                pass
+
+    def get_result(self) -> Dict[str, Any]:
+        return {
+            "added": self.added,
+            "likely_added": self.likely_added,
+            "errors": self.errors,
+            "retries": self.retries
+        }
+
+
+def run_upload_jobs(jobs_file: str, manager, tabs: int = UPLOAD_TABS,
+                    max_retries: int = UPLOAD_MAX_RETRIES) -> Dict[str, Any]:
+    """
+    Run a job file with up to `tabs` notebooks in progress at once
+
+    Args:
+        jobs_file: JSON job file (see module docstring)
+        manager: UploadManager (browser visibility, dialog helpers)
+        tabs: Number of concurrent notebook tabs
+        max_retries: Retries per source
+
+    Returns:
+        Dict with status, per-notebook results and sources_per_minute
+    """
+    if not manager.auth.is_authenticated():
+        return {"status": "error", "error": "Not authenticated. Run auth_manager.py setup first."}
+
+    try:
+        jobs = load_upload_jobs(Path(jobs_file), manager)
+    except (OSError, ValueError) as e:
+        return {"status": "error", "error": str(e)}
+    if not jobs:
+        return {"status": "success", "notebooks": {}, "sources_added": 0, "message": "No new sources to upload"}
+
+    total = sum(len(task["items"]) for job in jobs for task in job["tasks"])
+    print(f"📦 Uploading {total} source(s) to {len(jobs)} notebook(s) with {min(tabs, len(jobs))} tab(s)")
+
+    playwright = None
+    context = None
+    workers = []
+    started = time.time()
+
+    try:
+        playwright = sync_playwright().start()
+        with span("browser.launch", headless=not manager.show_browser):
+            context = BrowserFactory.launch_persistent_context(
+                playwright,
+                headless=not manager.show_browser
+            )
+
+        with span("upload.jobs", notebooks=len(jobs), sources=total, tabs=tabs):
+            pending = deque(jobs)
+            active: List[UploadWorker] = []
+            while pending or active:
+                while pending and len(active) < tabs:
+                    job = pending.popleft()
+                    worker = UploadWorker(manager, context, job["notebook_url"], job["tasks"], max_retries)
+                    workers.append(worker)
+                    active.append(worker)
+
+                for worker in list(active):
+                    worker.step()
+                    if worker.done:
+                        worker.close()
+                        active.remove(worker)
+
+                # Everyone is waiting on NotebookLM - don't spin
+                if active and all(worker.state == "processing" for worker in active):
+                    time.sleep(UPLOAD_POLL_INTERVAL_SECONDS)
+
+    except Exception as e:
+        print(f"  ❌ Error: {e}")
+        return {"status": "error", "error": str(e)}
+
+    finally:
+        for worker in workers:
+            worker.close()
+        if context:
+            try:
+                context.close()
+            except Exception:
+                pass
+        if playwright:
+            try:
+                playwright.stop()
+            except Exception:
+                pass
+
+    elapsed = time.time() - started
+    results = {}
+    for worker in workers:
+        results[worker.notebook_url] = worker.get_result()
+        if worker.added or worker.likely_added:
+            manager.invalidate_cached_answers(worker.notebook_url)
+        if worker.confirmed:
+            confirmed = {kind: [item for task in worker.confirmed if task["kind"] == kind for item in task["items"]]
+                         for kind in ("files", "urls", "text")}
+            manager.record_uploaded(worker.notebook_url, files=confirmed["files"],
+                                    urls=confirmed["urls"], texts=confirmed["text"])
+
+    added = sum(len(r["added"]) + len(r["likely_added"]) for r in results.values())
+    failed = sum(len(r["errors"]) for r in results.values())
+    rate = added / (elapsed / 60) if elapsed else 0.0
+    print(f"\n✅ {added}/{total} source(s) added, {failed} failed in {elapsed / 60:.1f} min ({rate:.1f} sources/min)")
+
+    return {
+        "status": "success" if added else "error",
+        "notebooks": results,
+        "sources_added": added,
+        "sources_failed": failed,
+        "elapsed_seconds": round(elapsed, 1),
+        "sources_per_minute": round(rate, 1),
+        "message": f"Added {added}/{total} sources to {len(jobs)} notebook(s)"
+    }
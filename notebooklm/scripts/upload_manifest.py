@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Upload Manifest for NotebookLM
+Records which sources each notebook already holds, so re-runs skip them
+
+One JSON manifest per notebook under UPLOAD_MANIFEST_DIR:
+- files: keyed by SHA-256 of the content (a renamed or moved copy of an
+  uploaded file is still skipped); a path index keeps size and mtime so
+  unchanged files are not re-hashed
+- urls: added URLs
+- texts: SHA-256 of added text content
+
+Only confirmed uploads are recorded. Sources deleted in the NotebookLM UI
+are not noticed; use --force (or clear the manifest) to upload them again.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import UPLOAD_MANIFEST_DIR
+from answer_cache import normalize_notebook_url
+
+
+def hash_text(text: str) -> str:
+    """SHA-256 of text content (surrounding whitespace ignored)"""
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's content, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class UploadManifest:
+    """
+    Sources already uploaded to one notebook
+
+    Call save() after recording; nothing is written before that.
+    """
+
+    def __init__(self, notebook_url: str, manifest_dir: Path = UPLOAD_MANIFEST_DIR):
+        """
+        Load (or start) the manifest for a notebook
+
+        Args:
+            notebook_url: NotebookLM notebook URL
+            manifest_dir: Directory holding the manifests
+        """
+        self.notebook_url = normalize_notebook_url(notebook_url)
+        notebook_key = re.sub(r"[^A-Za-z0-9_-]", "_", self.notebook_url.rsplit("/", 1)[-1])
+        if not notebook_key.strip("_"):
+            notebook_key = hashlib.sha1(self.notebook_url.encode("utf-8")).hexdigest()[:16]
+        self.path = Path(manifest_dir) / f"{notebook_key}.json"
+
+        self.data: Dict[str, Any] = {"notebook_url": self.notebook_url, "files": {}, "paths": {},
+                                     "urls": {}, "texts": {}}
+        if self.path.exists():
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self.data.update(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable upload manifest {self.path}: {e}")
+
+        # Hashes computed in this run, keyed by (path, size, mtime)
+        self._hashes: Dict[tuple, str] = {}
+
+    def _file_hash(self, path: Path) -> str:
+        """Content hash, reusing the recorded one if size and mtime are unchanged"""
+        stat = path.stat()
+        known = self.data["paths"].get(str(path))
+        if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime:
+            return known["sha256"]
+        key = (str(path), stat.st_size, stat.st_mtime)
+        if key not in self._hashes:
+            self._hashes[key] = hash_file(path)
+        return self._hashes[key]
+
+    def file_status(self, file_path: str) -> str:
+        """
+        Compare a local file with the manifest
+
+        Returns:
+            "unchanged" (same content already uploaded), "modified" (this
+            path was uploaded with different content) or "new"
+        """
+        path = Path(file_path).absolute()
+        if self._file_hash(path) in self.data["files"]:
+            return "unchanged"
+        return "modified" if str(path) in self.data["paths"] else "new"
+
+    def has_url(self, url: str) -> bool:
+        return url.strip() in self.data["urls"]
+
+    def has_text(self, text: str) -> bool:
+        return hash_text(text) in self.data["texts"]
+
+    def record_file(self, file_path: str):
+        path = Path(file_path).absolute()
+        stat = path.stat()
+        sha256 = self._file_hash(path)
+        self.data["files"][sha256] = {"path": str(path), "size": stat.st_size, "uploaded_at": time.time()}
+        self.data["paths"][str(path)] = {"sha256": sha256, "size": stat.st_size, "mtime": stat.st_mtime}
+
+    def record_url(self, url: str):
+        self.data["urls"][url.strip()] = {"uploaded_at": time.time()}
+
+    def record_text(self, text: str):
+        self.data["texts"][hash_text(text)] = {"chars": len(text), "uploaded_at": time.time()}
+
+    def save(self):
+        """Write the manifest (atomically, so an interrupted run cannot corrupt it)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        tmp_path.replace(self.path)
+
+    def clear(self):
+        """Forget everything recorded for this notebook"""
+        if self.path.exists():
+            self.path.unlink()
+        self.data.update({"files": {}, "paths": {}, "urls": {}, "texts": {}})
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "notebook_url": self.notebook_url,
+            "files": len(self.data["files"]),
+            "urls": len(self.data["urls"]),
+            "texts": len(self.data["texts"]),
+            "manifest": str(self.path)
+        }
+
+    def iter_files(self, files: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        """
+        Yield (file, file_status()) as files arrive, so a streaming scan is
+        classified without being collected first. Repeated content within
+        files counts as unchanged.
+        """
+        seen = set()
+        for file_path in files:
+            status = self.file_status(file_path)
+            sha256 = self._file_hash(Path(file_path).absolute())
+            if status != "unchanged" and sha256 in seen:
+                status = "unchanged"
+            seen.add(sha256)
+            yield file_path, status
+
+    def split_files(self, files: Iterable[str]) -> Dict[str, List[str]]:
+        """Group files by file_status(); repeated content within files counts as unchanged"""
+        groups: Dict[str, List[str]] = {"new": [], "modified": [], "unchanged": []}
+        for file_path, status in self.iter_files(files):
+            groups[status].append(file_path)
+        return groups
+
+
+def main():
+    """Command-line interface for upload manifests"""
+    parser = argparse.ArgumentParser(description='Inspect the record of sources uploaded to NotebookLM notebooks')
+
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+
+    # Show command
+    show_parser = subparsers.add_parser('show', help='Show what a notebook manifest holds')
+    show_parser.add_argument('--notebook-url', required=True, help='Notebook URL')
+
+    # Clear command
+    clear_parser = subparsers.add_parser('clear', help='Forget uploads so they are sent again')
+    clear_parser.add_argument('--notebook-url', required=True, help='Notebook URL')
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return 0
+
+    manifest = UploadManifest(args.notebook_url)
+
+    if args.command == 'show':
+        stats = manifest.get_stats()
+        print(f"\n📒 Upload manifest: {stats['manifest']}")
+        print(f"  Notebook: {stats['notebook_url']}")
+        print(f"  Files: {stats['files']}  URLs: {stats['urls']}  Texts: {stats['texts']}")
+        for info in manifest.data["files"].values():
+            print(f"    📄 {info['path']}")
+        for url in manifest.data["urls"]:
+            print(f"    🔗 {url}")
+
+    elif args.command == 'clear':
+        manifest.clear()
+        print(f"🧹 Cleared upload manifest for {manifest.notebook_url}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,15 +8,19 @@ Features:
 - Add URLs (websites, YouTube videos)
 - Add pasted text content
 - Create new notebooks
-- Batch upload from directory
+- Batch upload from directory (recursive, streamed into the upload as it is scanned)
+- Fill several notebooks in parallel from a job file
+- Skip sources a notebook already holds; sync only new or modified files
 """
 
 import argparse
+import itertools
 import json
+import re
 import sys
 import time
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Sized
 
 from patchright.sync_api import sync_playwright, Page, FileChooser
 
@@ -24,8 +28,15 @@ from patchright.sync_api import sync_playwright, Page, FileChooser
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import DATA_DIR, LIBRARY_FILE
-from browser_utils import BrowserFactory, StealthUtils
+from browser_utils import BrowserFactory, StealthUtils, timing
+from config import (
+    TIMING_PROFILES, TIMING_PROFILE, UPLOAD_BATCH_SIZE, UPLOAD_TIMEOUT_MS_PER_MB, UPLOAD_TABS, UPLOAD_MAX_RETRIES
+)
 from auth_manager import AuthManager
+from answer_cache import AnswerCache
+from upload_manifest import UploadManifest
+from source_scanner import scan_files, parse_size, modified_within
+from telemetry import span
 
 
 # NotebookLM UI Selectors (discovered from browser analysis 2024-12)
@@ -132,6 +143,35 @@ SELECTORS = {
     ],
 }
 
+# Source list state: number of sources and how many of them mention args.name,
+# using the first source_item selector that matches
+_SOURCE_STATE_JS = """
+(args) => {
+    for (const selector of args.selectors) {
+        const nodes = Array.from(document.querySelectorAll(selector));
+        if (nodes.length) {
+            const named = args.name ? nodes.filter(n => (n.innerText || '').includes(args.name)).length : 0;
+            return {count: nodes.length, named: named};
+        }
+    }
+    return {count: 0, named: 0};
+}
+"""
+
+# True once the expected number of sources is listed or another entry named args.name appeared
+SOURCES_CHANGED_JS = """
+(args) => {
+    for (const selector of args.selectors) {
+        const nodes = Array.from(document.querySelectorAll(selector));
+        if (nodes.length) {
+            if (nodes.length >= args.expected) return true;
+            return !!args.name && nodes.filter(n => (n.innerText || '').includes(args.name)).length > args.named;
+        }
+    }
+    return false;
+}
+"""
+
 # Supported file extensions
 SUPPORTED_EXTENSIONS = {
     ".pdf": "PDF document",
@@ -147,43 +187,46 @@ class UploadManager:
     Manages uploading sources to NotebookLM
     """
 
-    def __init__(self, show_browser: bool = False):
+    def __init__(self, show_browser: bool = False, force: bool = False):
         """
         Initialize the upload manager
         
         Args:
             show_browser: Whether to show browser window during operations
+            force: Upload sources even if the notebook's manifest says they
+                   were already uploaded
         """
         self.show_browser = show_browser
+        self.force = force
         self.stealth = StealthUtils()
         self.auth = AuthManager()
         
         # Ensure data directory exists
         DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-    def _get_selectors(self, key: str) -> List[str]:
+    def get_selectors(self, key: str) -> List[str]:
         """Get selector list from SELECTORS dict"""
         value = SELECTORS.get(key, [])
         if isinstance(value, str):
             return [value]
         return value
 
-    def _wait_for_page_ready(self, page: Page, timeout: int = 10000):
+    def wait_for_page_ready(self, page: Page, timeout: int = 10000):
         """Wait for page to be fully loaded and interactive"""
         try:
             # Wait for network to be idle
             page.wait_for_load_state("networkidle", timeout=timeout)
         except Exception:
             pass
-        # Additional delay for dynamic content
-        self.stealth.random_delay(1000, 2000)
+        # Short pause for dynamic content
+        timing.pause((1000, 2000))
 
     def _find_element(self, page: Page, selector_key: str, timeout: int = 10000) -> Optional[str]:
         """
         Try to find an element with multiple selector options
         Returns the selector that worked, or None if not found
         """
-        selectors = self._get_selectors(selector_key)
+        selectors = self.get_selectors(selector_key)
         for sel in selectors:
             try:
                 page.wait_for_selector(sel, timeout=timeout // len(selectors), state="visible")
@@ -196,7 +239,7 @@ class UploadManager:
 
     def _click_element(self, page: Page, selector_key: str, timeout: int = 10000) -> bool:
         """Click an element, trying multiple selectors if needed"""
-        selectors = self._get_selectors(selector_key)
+        selectors = self.get_selectors(selector_key)
         
         for sel in selectors:
             try:
@@ -233,14 +276,16 @@ class UploadManager:
         
         try:
             playwright = sync_playwright().start()
-            context = BrowserFactory.launch_persistent_context(
-                playwright,
-                headless=not self.show_browser
-            )
+            with span("browser.launch", headless=not self.show_browser):
+                context = BrowserFactory.launch_persistent_context(
+                    playwright,
+                    headless=not self.show_browser
+                )
             
             page = context.new_page()
             print("  🌐 Navigating to NotebookLM...")
-            page.goto("https://notebooklm.google.com", wait_until="domcontentloaded", timeout=30000)
+            with span("notebook.goto", notebook_url="https://notebooklm.google.com"):
+                page.goto("https://notebooklm.google.com", wait_until="domcontentloaded", timeout=30000)
             
             # Check authentication
             if "accounts.google.com" in page.url:
@@ -248,20 +293,21 @@ class UploadManager:
             
             # Wait for page to be fully loaded
             print("  ⏳ Waiting for page to load...")
-            self._wait_for_page_ready(page)
+            self.wait_for_page_ready(page)
             
             # Click create button
             print("  📝 Clicking create button...")
-            self._click_element(page, "create_notebook_button")
-            self.stealth.random_delay(2000, 3000)
+            with span("notebook.create"):
+                self._click_element(page, "create_notebook_button")
+                timing.wait_for(lambda t: page.wait_for_url(re.compile(r".*/notebook/.*"), timeout=t), (2000, 3000))
             
             # Wait for notebook to be created
-            self._wait_for_page_ready(page, timeout=5000)
+            self.wait_for_page_ready(page, timeout=5000)
             
             # Close the add source modal if it opens automatically
             try:
                 self._click_element(page, "close_modal_button", timeout=3000)
-                self.stealth.random_delay(500, 1000)
+                timing.pause((500, 1000))
             except Exception:
                 pass  # Modal might not open automatically
             
@@ -271,7 +317,7 @@ class UploadManager:
                 title_selector = self._find_element(page, "title_label", timeout=5000)
                 if title_selector:
                     self.stealth.realistic_click(page, title_selector)
-                    self.stealth.random_delay(300, 500)
+                    timing.pause((300, 500))
                     
                     # Wait for input and type name
                     input_selector = self._find_element(page, "title_input", timeout=3000)
@@ -281,7 +327,7 @@ class UploadManager:
                             input_element.fill("")  # Clear existing
                             self.stealth.human_type(page, input_selector, name)
                             page.keyboard.press("Enter")
-                            self.stealth.random_delay(500, 1000)
+                            timing.pause((500, 1000))
             except Exception as e:
                 print(f"  ⚠️ Could not rename notebook: {e}")
             
@@ -315,77 +361,97 @@ class UploadManager:
 
     def upload_files(
         self,
-        files: List[str],
+        files: Iterable[str],
         notebook_url: Optional[str] = None,
         notebook_id: Optional[str] = None,
-        create_notebook: Optional[str] = None
+        create_notebook: Optional[str] = None,
+        bulk: bool = False,
+        batch_size: int = UPLOAD_BATCH_SIZE,
+        skip_uploaded: bool = True
     ) -> Dict[str, Any]:
         """
         Upload local files to a NotebookLM notebook
         
+        Files are consumed lazily: a generator (e.g. a directory scan) keeps
+        producing files while the first ones are already uploading.
+        
         Args:
-            files: List of file paths to upload
+            files: File paths to upload (list or iterator)
             notebook_url: URL of existing notebook
             notebook_id: ID of notebook from library
             create_notebook: Name for new notebook to create
+            bulk: Select up to batch_size files in one file chooser and
+                  confirm each batch once, instead of one dialog per file
+            batch_size: Files per file chooser in bulk mode
+            skip_uploaded: Leave out files the upload manifest already holds
             
         Returns:
             Dict with status, uploaded files, and any errors
         """
-        print(f"📤 Uploading {len(files)} file(s)...")
+        if batch_size < 1:
+            return {"status": "error", "error": f"batch_size must be at least 1 (got {batch_size})"}
+        
+        count = f"{len(files)} " if isinstance(files, Sized) else ""
+        print(f"📤 Uploading {count}file(s)...")
         
         if not self.auth.is_authenticated():
             return {"status": "error", "error": "Not authenticated. Run auth_manager.py setup first."}
         
-        # Validate files
-        valid_files = []
-        for file_path in files:
-            path = Path(file_path)
-            if not path.exists():
-                print(f"  ⚠️ File not found: {file_path}")
-                continue
-            if path.suffix.lower() not in SUPPORTED_EXTENSIONS:
-                print(f"  ⚠️ Unsupported file type: {path.suffix} ({file_path})")
-                continue
-            valid_files.append(str(path.absolute()))
+        # Resolve notebook URL
+        target_url = self.resolve_notebook_url(notebook_url, notebook_id)
         
-        if not valid_files:
-            return {"status": "error", "error": "No valid files to upload"}
+        # Skip files the notebook already holds (a new notebook holds nothing)
+        groups = {"new": [], "modified": [], "unchanged": []}
+        skipped = groups["unchanged"]
+        pending = self._valid_files(files)
+        if skip_uploaded and target_url and not create_notebook and not self.force:
+            pending = self._changed_files(UploadManifest(target_url), pending, groups)
         
-        # Resolve notebook URL
-        target_url = self._resolve_notebook_url(notebook_url, notebook_id)
+        # Only the first file is needed before the browser starts
+        first = next(pending, None)
+        if first is None:
+            if skipped:
+                print(f"  ⏭️ Skipping {len(skipped)} file(s) already in the notebook")
+                return {"status": "success", "uploaded": [], "likely_uploaded": [], "errors": [],
+                        "skipped": skipped, "notebook_url": target_url,
+                        "message": f"All {len(skipped)} file(s) already uploaded"}
+            return {"status": "error", "error": "No valid files to upload"}
+        pending = itertools.chain([first], pending)
         
         playwright = None
         context = None
         
         try:
             playwright = sync_playwright().start()
-            context = BrowserFactory.launch_persistent_context(
-                playwright,
-                headless=not self.show_browser
-            )
+            with span("browser.launch", headless=not self.show_browser):
+                context = BrowserFactory.launch_persistent_context(
+                    playwright,
+                    headless=not self.show_browser
+                )
             
             page = context.new_page()
             
             # Create new notebook if requested
             if create_notebook:
                 print("  🌐 Navigating to NotebookLM...")
-                page.goto("https://notebooklm.google.com", wait_until="domcontentloaded", timeout=30000)
+                with span("notebook.goto", notebook_url="https://notebooklm.google.com"):
+                    page.goto("https://notebooklm.google.com", wait_until="domcontentloaded", timeout=30000)
                 
                 if "accounts.google.com" in page.url:
                     raise RuntimeError("Authentication required.")
                 
-                self._wait_for_page_ready(page)
+                self.wait_for_page_ready(page)
                 
                 print("  📝 Creating notebook...")
-                self._click_element(page, "create_notebook_button")
-                self.stealth.random_delay(2000, 3000)
-                self._wait_for_page_ready(page, timeout=5000)
+                with span("notebook.create"):
+                    self._click_element(page, "create_notebook_button")
+                    timing.wait_for(lambda t: page.wait_for_url(re.compile(r".*/notebook/.*"), timeout=t), (2000, 3000))
+                self.wait_for_page_ready(page, timeout=5000)
                 
                 # Close modal if it opens
                 try:
                     self._click_element(page, "close_modal_button", timeout=3000)
-                    self.stealth.random_delay(500, 1000)
+                    timing.pause((500, 1000))
                 except Exception:
                     pass
                 
@@ -394,7 +460,7 @@ class UploadManager:
                     title_selector = self._find_element(page, "title_label", timeout=5000)
                     if title_selector:
                         self.stealth.realistic_click(page, title_selector)
-                        self.stealth.random_delay(300, 500)
+                        timing.pause((300, 500))
                         input_selector = self._find_element(page, "title_input", timeout=3000)
                         if input_selector:
                             input_el = page.query_selector(input_selector)
@@ -402,7 +468,7 @@ class UploadManager:
                                 input_el.fill("")
                                 self.stealth.human_type(page, input_selector, create_notebook)
                                 page.keyboard.press("Enter")
-                                self.stealth.random_delay(500, 1000)
+                                timing.pause((500, 1000))
                 except Exception as e:
                     print(f"  ⚠️ Could not rename: {e}")
                 
@@ -410,12 +476,13 @@ class UploadManager:
                 print(f"  📓 Created notebook: {target_url}")
             elif target_url:
                 print(f"  🌐 Navigating to notebook...")
-                page.goto(target_url, wait_until="domcontentloaded", timeout=30000)
+                with span("notebook.goto", notebook_url=target_url):
+                    page.goto(target_url, wait_until="domcontentloaded", timeout=30000)
                 
                 if "accounts.google.com" in page.url:
                     raise RuntimeError("Authentication required.")
                 
-                self._wait_for_page_ready(page)
+                self.wait_for_page_ready(page)
             else:
                 return {"status": "error", "error": "No notebook specified"}
             
@@ -424,35 +491,59 @@ class UploadManager:
             likely_uploaded = []
             errors = []
             
-            for file_path in valid_files:
-                try:
-                    result = self._upload_single_file(page, file_path)
-                    if result["status"] == "success":
-                        uploaded.append(file_path)
-                    elif result["status"] == "likely_success":
-                        likely_uploaded.append(file_path)
-                        print(f"    ⚠️ {result.get('message', 'Check manually')}")
-                    else:
-                        errors.append({"file": file_path, "error": result.get("error", "Unknown error")})
-                except Exception as e:
-                    errors.append({"file": file_path, "error": str(e)})
+            if bulk:
+                for batch in iter(lambda: list(itertools.islice(pending, batch_size)), []):
+                    try:
+                        with span("upload.batch", files=len(batch),
+                                  bytes=sum(Path(f).stat().st_size for f in batch)) as attrs:
+                            result = self._upload_batch(page, batch)
+                            attrs["confirmed"] = len(result["uploaded"])
+                        uploaded.extend(result["uploaded"])
+                        likely_uploaded.extend(result["likely_uploaded"])
+                        errors.extend(result["errors"])
+                    except Exception as e:
+                        errors.extend({"file": file_path, "error": str(e)} for file_path in batch)
+            else:
+                for file_path in pending:
+                    try:
+                        with span("upload.file", file=Path(file_path).name,
+                                  bytes=Path(file_path).stat().st_size) as attrs:
+                            result = self._upload_single_file(page, file_path)
+                            attrs["result"] = result["status"]
+                        if result["status"] == "success":
+                            uploaded.append(file_path)
+                        elif result["status"] == "likely_success":
+                            likely_uploaded.append(file_path)
+                            print(f"    ⚠️ {result.get('message', 'Check manually')}")
+                        else:
+                            errors.append({"file": file_path, "error": result.get("error", "Unknown error")})
+                    except Exception as e:
+                        errors.append({"file": file_path, "error": str(e)})
+            
+            if skipped:
+                print(f"  ⏭️ Skipped {len(skipped)} file(s) already in the notebook")
             
             # Build result message
             total_success = len(uploaded) + len(likely_uploaded)
             if total_success > 0:
                 status = "success"
-                message = f"Uploaded {len(uploaded)}/{len(valid_files)} files"
+                message = f"Uploaded {len(uploaded)}/{total_success + len(errors)} files"
                 if likely_uploaded:
                     message += f" ({len(likely_uploaded)} need manual verification)"
             else:
                 status = "error"
                 message = "No files were uploaded successfully"
             
+            if total_success > 0:
+                self.invalidate_cached_answers(target_url)
+                self.record_uploaded(target_url, files=uploaded)
+
             return {
                 "status": status,
                 "uploaded": uploaded,
                 "likely_uploaded": likely_uploaded,
                 "errors": errors,
+                "skipped": skipped,
                 "notebook_url": target_url,
                 "message": message
             }
@@ -473,39 +564,133 @@ class UploadManager:
                 except Exception:
                     pass
 
-    def _upload_single_file(self, page: Page, file_path: str) -> Dict[str, Any]:
-        """Upload a single file to the current notebook"""
-        file_name = Path(file_path).name
-        print(f"  📄 Uploading: {file_name}")
-        
+    def open_upload_dialog(self, page: Page):
+        """Make sure the add source dialog with the upload button is open"""
         # Try to click upload_file_button first (dialog may already be open for new notebooks)
-        upload_btn_found = False
         try:
             upload_selector = self._find_element(page, "upload_file_button", timeout=3000)
             if upload_selector:
                 print("    ✓ Dialog already open")
-                upload_btn_found = True
+                return
         except Exception:
             pass
         
         # If upload button not found, try opening the add source modal
-        if not upload_btn_found:
-            print("    → Opening add source dialog...")
-            try:
-                self._click_element(page, "add_source_button", timeout=5000)
-                self.stealth.random_delay(1000, 1500)
-            except Exception as e:
-                return {"status": "error", "error": f"Could not open add source dialog: {e}"}
+        print("    → Opening add source dialog...")
+        self._click_element(page, "add_source_button", timeout=5000)
+        timing.pause((1000, 1500))
+
+    def select_files(self, page: Page, file_paths: List[str]):
+        """Click the upload button and pass the files to its file chooser"""
+        # Increase timeout to 30 seconds for slow connections
+        with page.expect_file_chooser(timeout=30000) as fc_info:
+            self._click_element(page, "upload_file_button")
+        
+        file_chooser: FileChooser = fc_info.value
+        file_chooser.set_files(file_paths)
+
+    def source_snapshot(self, page: Page, name: Optional[str] = None) -> Dict[str, int]:
+        """Number of listed sources, and of those whose entry mentions name"""
+        try:
+            return page.evaluate(_SOURCE_STATE_JS, {"selectors": self.get_selectors("source_item"), "name": name})
+        except Exception:
+            return {"count": 0, "named": 0}
+
+    def _wait_for_new_sources(self, page: Page, before: Dict[str, int], new_sources: int,
+                              size_bytes: int, name: Optional[str] = None) -> Dict[str, int]:
+        """
+        Wait until new_sources more sources are listed than in the before
+        snapshot (or a new entry mentioning name appears)
+        
+        Returns as soon as the list changes. The wait is bounded by the
+        timing profile's source_processing plus UPLOAD_TIMEOUT_MS_PER_MB for
+        the uploaded size, so large files get time to upload.
+        
+        Returns:
+            Source list snapshot after the wait
+        """
+        args = {
+            "selectors": self.get_selectors("source_item"),
+            "expected": before["count"] + new_sources,
+            "name": name,
+            "named": before["named"]
+        }
+        timing.wait_for(
+            lambda t: page.wait_for_function(SOURCES_CHANGED_JS, arg=args, timeout=t, polling=500),
+            (8000 * new_sources, 12000 * new_sources),
+            bound="source_processing",
+            extra_ms=int(size_bytes / (1024 * 1024) * UPLOAD_TIMEOUT_MS_PER_MB)
+        )
+        return self.source_snapshot(page, name)
+
+    def _upload_batch(self, page: Page, file_paths: List[str]) -> Dict[str, Any]:
+        """
+        Upload several files through one file chooser
+        
+        The source list is counted before and after the batch; the batch is
+        confirmed once every file has shown up as a new source.
+        
+        Returns:
+            Dict with uploaded, likely_uploaded and errors (as in upload_files)
+        """
+        print(f"  📦 Uploading {len(file_paths)} file(s) in one selection")
+        before = self.source_snapshot(page)
+        
+        try:
+            self.open_upload_dialog(page)
+        except Exception as e:
+            error = f"Could not open add source dialog: {e}"
+            return {"uploaded": [], "likely_uploaded": [],
+                    "errors": [{"file": file_path, "error": error} for file_path in file_paths]}
+        
+        file_selected = False
+        try:
+            with span("upload.select_file", files=len(file_paths)):
+                self.select_files(page, file_paths)
+            file_selected = True
+            print(f"    ✓ {len(file_paths)} file(s) selected")
+        except Exception as e:
+            print(f"    ⚠️ File chooser event timeout (may still be uploading): {e}")
+        
+        # One wait for the whole batch: until all new sources are listed
+        print(f"    ⏳ Waiting for {len(file_paths)} source(s) to appear...")
+        size_bytes = sum(Path(file_path).stat().st_size for file_path in file_paths)
+        with span("upload.confirm", files=len(file_paths), bytes=size_bytes) as attrs:
+            after = self._wait_for_new_sources(page, before, len(file_paths), size_bytes)
+            added = after["count"] - before["count"]
+            attrs["added"] = added
+        
+        if added >= len(file_paths):
+            print(f"    ✅ Upload confirmed - {added} new source(s)")
+            return {"uploaded": list(file_paths), "likely_uploaded": [], "errors": []}
+        
+        if file_selected or added > 0:
+            # The list does not tell which files are missing, so none can be confirmed
+            print(f"    ⚠️ Only {max(added, 0)}/{len(file_paths)} new source(s) appeared - check notebook manually")
+            return {"uploaded": [], "likely_uploaded": list(file_paths), "errors": []}
+        
+        return {"uploaded": [], "likely_uploaded": [],
+                "errors": [{"file": file_path, "error": "Upload failed - files were not selected"}
+                           for file_path in file_paths]}
+
+    def _upload_single_file(self, page: Page, file_path: str) -> Dict[str, Any]:
+        """Upload a single file to the current notebook"""
+        file_name = Path(file_path).name
+        print(f"  📄 Uploading: {file_name}")
+        
+        # Snapshot first: on a notebook with sources, "any source visible" proves nothing
+        before = self.source_snapshot(page, Path(file_path).stem)
+        
+        try:
+            self.open_upload_dialog(page)
+        except Exception as e:
+            return {"status": "error", "error": f"Could not open add source dialog: {e}"}
         
         # Click upload file button and handle file chooser
-        # Increase timeout to 30 seconds for slow connections
         file_selected = False
         try:
-            with page.expect_file_chooser(timeout=30000) as fc_info:
-                self._click_element(page, "upload_file_button")
-            
-            file_chooser = fc_info.value
-            file_chooser.set_files(file_path)
+            with span("upload.select_file", file=file_name):
+                self.select_files(page, [file_path])
             file_selected = True
             print(f"    ✓ File selected: {file_name}")
         except Exception as e:
@@ -513,22 +698,16 @@ class UploadManager:
             # The file might still be uploading in the background
             print(f"    ⚠️ File chooser event timeout (may still be uploading): {e}")
         
-        # Wait longer for upload to complete (large files need more time)
+        # Wait until the new source is listed (returns as soon as it appears)
         print(f"    ⏳ Waiting for upload to complete...")
-        self.stealth.random_delay(8000, 12000)
-        
-        # Check if file was added (look for source items)
-        # Use multiple retries with increasing wait times
-        max_retries = 3
-        for attempt in range(max_retries):
-            source_selector = self._find_element(page, "source_item", timeout=15000)
-            if source_selector:
-                print(f"    ✅ Upload confirmed - source found")
-                return {"status": "success", "file": file_name}
-            
-            if attempt < max_retries - 1:
-                print(f"    ⏳ Waiting... (attempt {attempt + 1}/{max_retries})")
-                self.stealth.random_delay(5000, 8000)
+        size_bytes = Path(file_path).stat().st_size
+        with span("upload.confirm", file=file_name, bytes=size_bytes) as attrs:
+            after = self._wait_for_new_sources(page, before, 1, size_bytes, Path(file_path).stem)
+            confirmed = after["count"] > before["count"] or after["named"] > before["named"]
+            attrs["confirmed"] = confirmed
+        if confirmed:
+            print(f"    ✅ Upload confirmed - new source listed")
+            return {"status": "success", "file": file_name}
         
         # If we selected the file but can't confirm, report as "likely success"
         if file_selected:
@@ -563,76 +742,63 @@ class UploadManager:
         if not self.auth.is_authenticated():
             return {"status": "error", "error": "Not authenticated"}
         
-        target_url = self._resolve_notebook_url(notebook_url, notebook_id)
+        target_url = self.resolve_notebook_url(notebook_url, notebook_id)
         if not target_url:
             return {"status": "error", "error": "No notebook specified"}
         
+        # Skip URLs the notebook already holds
+        skipped = []
+        if not self.force:
+            manifest = UploadManifest(target_url)
+            skipped = [url for url in urls if manifest.has_url(url)]
+            urls = [url for url in urls if not manifest.has_url(url)]
+            if skipped:
+                print(f"  ⏭️ Skipping {len(skipped)} URL(s) already in the notebook")
+            if not urls:
+                return {"status": "success", "urls": [], "skipped": skipped, "notebook_url": target_url,
+                        "message": f"All {len(skipped)} URL(s) already added"}
+        
         playwright = None
         context = None
         
         try:
             playwright = sync_playwright().start()
-            context = BrowserFactory.launch_persistent_context(
-                playwright,
-                headless=not self.show_browser
-            )
+            with span("browser.launch", headless=not self.show_browser):
+                context = BrowserFactory.launch_persistent_context(
+                    playwright,
+                    headless=not self.show_browser
+                )
             
             page = context.new_page()
             print("  🌐 Navigating to notebook...")
-            page.goto(target_url, wait_until="domcontentloaded", timeout=30000)
+            with span("notebook.goto", notebook_url=target_url):
+                page.goto(target_url, wait_until="domcontentloaded", timeout=30000)
             
             if "accounts.google.com" in page.url:
                 raise RuntimeError("Authentication required.")
             
-            self._wait_for_page_ready(page)
-            
-            # Try to click website_button first (dialog may already be open for new notebooks)
-            print("  🔗 Looking for website option...")
-            website_btn_found = False
-            try:
-                website_selector = self._find_element(page, "website_button", timeout=3000)
-                if website_selector:
-                    print("    ✓ Dialog already open, clicking website...")
-                    self.stealth.realistic_click(page, website_selector)
-                    website_btn_found = True
-            except Exception:
-                pass
-            
-            # If website button not found, try opening the add source modal
-            if not website_btn_found:
-                print("    → Opening add source dialog...")
-                try:
-                    self._click_element(page, "add_source_button", timeout=5000)
-                    self.stealth.random_delay(1000, 1500)
-                    
-                    # Now click website button
-                    self._click_element(page, "website_button")
-                except Exception as e:
-                    raise Exception(f"Could not open add source dialog: {e}")
+            self.wait_for_page_ready(page)
             
-            self.stealth.random_delay(500, 1000)
+            url_input_selector = self.submit_urls(page, urls)
             
-            # Enter URLs (newline separated)
-            print("  📝 Entering URLs...")
-            url_text = "\n".join(urls)
-            url_input_selector = self._find_element(page, "url_input", timeout=5000)
-            if url_input_selector:
-                self.stealth.human_type(page, url_input_selector, url_text)
-            self.stealth.random_delay(500, 1000)
-            
-            # Click insert
-            print("  📤 Inserting...")
-            self._click_element(page, "insert_button")
-            
-            # Wait for processing
+            # Wait for processing (the dialog closes once NotebookLM accepts the URLs)
             print("  ⏳ Processing URLs...")
-            self.stealth.random_delay(5000, 8000)
+            if url_input_selector:
+                with span("upload.urls.process", count=len(urls)):
+                    timing.wait_for(
+                        lambda t: page.wait_for_selector(url_input_selector, timeout=t, state="hidden"),
+                        (5000, 8000),
+                        bound="source_processing"
+                    )
             
             print(f"  ✅ Added {len(urls)} URL(s)")
+            self.invalidate_cached_answers(target_url)
+            self.record_uploaded(target_url, urls=urls)
             
             return {
                 "status": "success",
                 "urls": urls,
+                "skipped": skipped,
                 "notebook_url": target_url,
                 "message": f"Added {len(urls)} URL(s)"
             }
@@ -675,79 +841,50 @@ class UploadManager:
         if not self.auth.is_authenticated():
             return {"status": "error", "error": "Not authenticated"}
         
-        target_url = self._resolve_notebook_url(notebook_url, notebook_id)
+        target_url = self.resolve_notebook_url(notebook_url, notebook_id)
         if not target_url:
             return {"status": "error", "error": "No notebook specified"}
         
+        if not self.force and UploadManifest(target_url).has_text(text):
+            print("  ⏭️ This text is already in the notebook")
+            return {"status": "success", "text_length": len(text), "skipped": True, "notebook_url": target_url,
+                    "message": "Text content already added"}
+        
         playwright = None
         context = None
         
         try:
             playwright = sync_playwright().start()
-            context = BrowserFactory.launch_persistent_context(
-                playwright,
-                headless=not self.show_browser
-            )
+            with span("browser.launch", headless=not self.show_browser):
+                context = BrowserFactory.launch_persistent_context(
+                    playwright,
+                    headless=not self.show_browser
+                )
             
             page = context.new_page()
             print("  🌐 Navigating to notebook...")
-            page.goto(target_url, wait_until="domcontentloaded", timeout=30000)
+            with span("notebook.goto", notebook_url=target_url):
+                page.goto(target_url, wait_until="domcontentloaded", timeout=30000)
             
             if "accounts.google.com" in page.url:
                 raise RuntimeError("Authentication required.")
             
-            self._wait_for_page_ready(page)
-            
-            # Try to click paste_text_button first (dialog may already be open for new notebooks)
-            print("  📋 Looking for paste text option...")
-            paste_btn_found = False
-            try:
-                # First check if the paste text button is already visible (dialog auto-opened)
-                paste_selector = self._find_element(page, "paste_text_button", timeout=3000)
-                if paste_selector:
-                    print("    ✓ Dialog already open, clicking paste text...")
-                    self.stealth.realistic_click(page, paste_selector)
-                    paste_btn_found = True
-            except Exception:
-                pass
-            
-            # If paste button not found, try opening the add source modal
-            if not paste_btn_found:
-                print("    → Opening add source dialog...")
-                try:
-                    self._click_element(page, "add_source_button", timeout=5000)
-                    self.stealth.random_delay(1000, 1500)
-                    
-                    # Now click paste text button
-                    self._click_element(page, "paste_text_button")
-                except Exception as e:
-                    raise Exception(f"Could not open add source dialog: {e}")
-            
-            self.stealth.random_delay(500, 1000)
-            
-            # Enter text content
-            print("  📝 Entering text content...")
-            text_input_selector = self._find_element(page, "text_input", timeout=5000)
-            if text_input_selector:
-                # Use fill for large text (faster than human_type)
-                text_input = page.query_selector(text_input_selector)
-                if text_input:
-                    text_input.fill(text)
-                    print(f"    ✓ Filled {len(text)} characters")
-            else:
-                raise Exception("Could not find text input field")
-            
-            self.stealth.random_delay(500, 1000)
+            self.wait_for_page_ready(page)
             
-            # Click insert
-            print("  📤 Inserting...")
-            self._click_element(page, "insert_button")
+            text_input_selector = self.submit_text(page, text)
             
-            # Wait for processing
+            # Wait for processing (the dialog closes once NotebookLM accepts the text)
             print("  ⏳ Processing text...")
-            self.stealth.random_delay(5000, 8000)
+            with span("upload.text.process", chars=len(text)):
+                timing.wait_for(
+                    lambda t: page.wait_for_selector(text_input_selector, timeout=t, state="hidden"),
+                    (5000, 8000),
+                    bound="source_processing"
+                )
             
             print(f"  ✅ Added text content")
+            self.invalidate_cached_answers(target_url)
+            self.record_uploaded(target_url, texts=[text])
             
             return {
                 "status": "success",
@@ -772,16 +909,113 @@ class UploadManager:
                 except Exception:
                     pass
 
+    def submit_urls(self, page: Page, urls: List[str]) -> Optional[str]:
+        """Enter URLs in the add source dialog and insert them; returns the URL input selector"""
+        # Try to click website_button first (dialog may already be open for new notebooks)
+        print("  🔗 Looking for website option...")
+        website_btn_found = False
+        try:
+            website_selector = self._find_element(page, "website_button", timeout=3000)
+            if website_selector:
+                print("    ✓ Dialog already open, clicking website...")
+                self.stealth.realistic_click(page, website_selector)
+                website_btn_found = True
+        except Exception:
+            pass
+        
+        # If website button not found, try opening the add source modal
+        if not website_btn_found:
+            print("    → Opening add source dialog...")
+            try:
+                self._click_element(page, "add_source_button", timeout=5000)
+                timing.pause((1000, 1500))
+        
+                # Now click website button
+                self._click_element(page, "website_button")
+            except Exception as e:
+                raise Exception(f"Could not open add source dialog: {e}")
+        
+        timing.pause((500, 1000))
+        
+        # Enter URLs (newline separated)
+        print("  📝 Entering URLs...")
+        url_text = "\n".join(urls)
+        url_input_selector = self._find_element(page, "url_input", timeout=5000)
+        if url_input_selector:
+            self.stealth.input_text(page, url_input_selector, url_text)
+        timing.pause((500, 1000))
+        
+        # Click insert
+        print("  📤 Inserting...")
+        self._click_element(page, "insert_button")
+        
+        return url_input_selector
+        
+    def submit_text(self, page: Page, text: str) -> str:
+        """Paste text in the add source dialog and insert it; returns the text input selector"""
+        # Try to click paste_text_button first (dialog may already be open for new notebooks)
+        print("  📋 Looking for paste text option...")
+        paste_btn_found = False
+        try:
+            # First check if the paste text button is already visible (dialog auto-opened)
+            paste_selector = self._find_element(page, "paste_text_button", timeout=3000)
+            if paste_selector:
+                print("    ✓ Dialog already open, clicking paste text...")
+                self.stealth.realistic_click(page, paste_selector)
+                paste_btn_found = True
+        except Exception:
+            pass
+        
+        # If paste button not found, try opening the add source modal
+        if not paste_btn_found:
+            print("    → Opening add source dialog...")
+            try:
+                self._click_element(page, "add_source_button", timeout=5000)
+                timing.pause((1000, 1500))
+        
+                # Now click paste text button
+                self._click_element(page, "paste_text_button")
+            except Exception as e:
+                raise Exception(f"Could not open add source dialog: {e}")
+        
+        timing.pause((500, 1000))
+        
+        # Enter text content
+        print("  📝 Entering text content...")
+        text_input_selector = self._find_element(page, "text_input", timeout=5000)
+        if text_input_selector:
+            # Use fill for large text (faster than human_type)
+            text_input = page.query_selector(text_input_selector)
+            if text_input:
+                text_input.fill(text)
+                print(f"    ✓ Filled {len(text)} characters")
+        else:
+            raise Exception("Could not find text input field")
+        
+        timing.pause((500, 1000))
+        
+        # Click insert
+        print("  📤 Inserting...")
+        self._click_element(page, "insert_button")
+        
+        return text_input_selector
+
     def upload_directory(
         self,
         directory: str,
         extensions: Optional[List[str]] = None,
         notebook_url: Optional[str] = None,
         notebook_id: Optional[str] = None,
-        create_notebook: Optional[str] = None
+        create_notebook: Optional[str] = None,
+        bulk: bool = False,
+        batch_size: int = UPLOAD_BATCH_SIZE,
+        scan_options: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
-        Upload all matching files from a directory
+        Upload all matching files from a directory tree
+        
+        The directory is scanned while uploading, so the first upload starts
+        as soon as the first matching file is found.
         
         Args:
             directory: Path to directory
@@ -789,6 +1023,10 @@ class UploadManager:
             notebook_url: URL of existing notebook
             notebook_id: ID of notebook from library
             create_notebook: Name for new notebook
+            bulk: Upload in multi-file batches (see upload_files)
+            batch_size: Files per file chooser in bulk mode
+            scan_options: Extra scan_files() filters (include, exclude,
+                          recursive, min_size, max_size, modified_after)
             
         Returns:
             Dict with status and results
@@ -799,35 +1037,140 @@ class UploadManager:
         if not dir_path.exists() or not dir_path.is_dir():
             return {"status": "error", "error": f"Directory not found: {directory}"}
         
-        # Determine extensions to look for
-        if extensions:
-            exts = [f".{e.lstrip('.')}" for e in extensions]
-        else:
-            exts = list(SUPPORTED_EXTENSIONS.keys())
-        
-        # Find matching files
-        files = []
-        for ext in exts:
-            files.extend(dir_path.glob(f"*{ext}"))
-            files.extend(dir_path.glob(f"*{ext.upper()}"))
-        
-        # Remove duplicates and sort
-        files = sorted(set(str(f) for f in files))
-        
-        if not files:
+        files = self._scan_directory(dir_path, extensions, scan_options)
+        first = next(files, None)
+        if first is None:
             return {"status": "error", "error": f"No matching files found in {directory}"}
         
-        print(f"  📄 Found {len(files)} file(s)")
-        
-        # Upload all files
+        # Upload files as the scan finds them
         return self.upload_files(
-            files=files,
+            files=itertools.chain([first], files),
             notebook_url=notebook_url,
             notebook_id=notebook_id,
-            create_notebook=create_notebook
+            create_notebook=create_notebook,
+            bulk=bulk,
+            batch_size=batch_size
         )
 
-    def _resolve_notebook_url(
+    def sync_directory(
+        self,
+        directory: str,
+        extensions: Optional[List[str]] = None,
+        notebook_url: Optional[str] = None,
+        notebook_id: Optional[str] = None,
+        bulk: bool = False,
+        batch_size: int = UPLOAD_BATCH_SIZE,
+        dry_run: bool = False,
+        scan_options: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Upload only the files in a directory that are new or modified since
+        the last upload to the notebook (per its upload manifest)
+        
+        Args:
+            directory: Path to directory
+            extensions: List of extensions to include (default: all supported)
+            notebook_url: URL of existing notebook
+            notebook_id: ID of notebook from library
+            bulk: Upload in multi-file batches (see upload_files)
+            batch_size: Files per file chooser in bulk mode
+            dry_run: Only report what would be uploaded
+            scan_options: Extra scan_files() filters (see upload_directory)
+            
+        Returns:
+            Dict with status, new/modified/unchanged files and upload results
+        """
+        target_url = self.resolve_notebook_url(notebook_url, notebook_id)
+        if not target_url:
+            return {"status": "error", "error": "No notebook specified"}
+        
+        dir_path = Path(directory)
+        if not dir_path.exists() or not dir_path.is_dir():
+            return {"status": "error", "error": f"Directory not found: {directory}"}
+        
+        print(f"🔄 Syncing {directory} -> {target_url}")
+        # Classify the whole tree first: the report must cover every file even
+        # if the upload stops early
+        groups = UploadManifest(target_url).split_files(self._scan_directory(dir_path, extensions, scan_options))
+        changed = groups["new"] + groups["modified"]
+        
+        result = {"status": "success", "notebook_url": target_url}
+        if dry_run:
+            for file_path in changed:
+                print(f"  📄 {file_path}")
+        elif changed:
+            result.update(self.upload_files(files=changed, notebook_url=target_url,
+                                            bulk=bulk, batch_size=batch_size, skip_uploaded=False))
+        
+        print(f"  📄 {len(groups['new'])} new, {len(groups['modified'])} modified, "
+              f"{len(groups['unchanged'])} unchanged")
+        if groups["modified"]:
+            # NotebookLM cannot replace a source; the changed file is added next to the old one
+            print("  ⚠️ Previous versions of modified files stay in the notebook - remove them there if needed")
+        
+        result.update({"new": groups["new"], "modified": groups["modified"], "unchanged": groups["unchanged"]})
+        if dry_run:
+            result["message"] = f"{len(groups['new']) + len(groups['modified'])} file(s) to upload"
+        elif not (groups["new"] or groups["modified"]):
+            result["message"] = "Notebook is up to date"
+        return result
+
+    def _scan_directory(self, dir_path: Path, extensions: Optional[List[str]] = None,
+                        scan_options: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Stream matching files under dir_path (recursive unless scan_options says otherwise)"""
+        return scan_files(dir_path, extensions=extensions or SUPPORTED_EXTENSIONS.keys(), **(scan_options or {}))
+
+    def _valid_files(self, files: Iterable[str]) -> Iterator[str]:
+        """Absolute paths of existing files with a supported type, warning about the rest"""
+        for file_path in files:
+            path = Path(file_path)
+            if not path.exists():
+                print(f"  ⚠️ File not found: {file_path}")
+                continue
+            if path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+                print(f"  ⚠️ Unsupported file type: {path.suffix} ({file_path})")
+                continue
+            yield str(path.absolute())
+
+    def _changed_files(self, manifest: UploadManifest, files: Iterable[str],
+                       groups: Dict[str, List[str]]) -> Iterator[str]:
+        """Yield new and modified files; every file is added to groups by its status"""
+        for file_path, status in manifest.iter_files(files):
+            groups[status].append(file_path)
+            if status != "unchanged":
+                yield file_path
+
+    def record_uploaded(self, notebook_url: Optional[str], files: List[str] = (),
+                        urls: List[str] = (), texts: List[str] = ()):
+        """Add confirmed uploads to the notebook's manifest"""
+        if not notebook_url:
+            return
+        try:
+            manifest = UploadManifest(notebook_url)
+            for file_path in files:
+                manifest.record_file(file_path)
+            for url in urls:
+                manifest.record_url(url)
+            for text in texts:
+                manifest.record_text(text)
+            manifest.save()
+        except Exception as e:
+            print(f"  ⚠️ Could not update upload manifest: {e}")
+
+    def invalidate_cached_answers(self, notebook_url: Optional[str]):
+        """New sources make cached answers for the notebook stale"""
+        if not notebook_url:
+            return
+        try:
+            cache = AnswerCache()
+            removed = cache.invalidate(notebook_url)
+            cache.close()
+            if removed:
+                print(f"  🧹 Cleared {removed} cached answer(s) for this notebook")
+        except Exception as e:
+            print(f"  ⚠️ Could not clear cached answers: {e}")
+
+    def resolve_notebook_url(
         self,
         notebook_url: Optional[str],
         notebook_id: Optional[str]
@@ -840,7 +1183,10 @@ class UploadManager:
             try:
                 with open(LIBRARY_FILE, 'r') as f:
                     library = json.load(f)
-                    notebooks = library.get("notebooks", [])
+                    notebooks = library.get("notebooks", {})
+                    # notebook_manager.py stores notebooks keyed by ID
+                    if isinstance(notebooks, dict):
+                        notebooks = notebooks.values()
                     for nb in notebooks:
                         if nb.get("id") == notebook_id:
                             return nb.get("url")
@@ -850,9 +1196,35 @@ class UploadManager:
         return None
 
 
+def _positive_int(text: str) -> int:
+    """argparse type for counts that must be at least 1"""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{text}'")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1 (got {value})")
+    return value
+
+
+def _scan_options(args) -> Dict[str, Any]:
+    """scan_files() filters from the upload-dir/sync arguments"""
+    return {
+        "include": [p.strip() for p in args.include.split(",")] if args.include else None,
+        "exclude": [p.strip() for p in args.exclude.split(",")] if args.exclude else None,
+        "recursive": not args.no_recursive,
+        "min_size": args.min_size,
+        "max_size": args.max_size,
+        "modified_after": modified_within(args.modified_within_days) if args.modified_within_days else None,
+        "include_hidden": args.include_hidden
+    }
+
+
 def main():
     """CLI interface for upload manager"""
     parser = argparse.ArgumentParser(description="Upload sources to NotebookLM")
+    parser.add_argument("--timing-profile", choices=list(TIMING_PROFILES), default=TIMING_PROFILE,
+                        help=f"How long to pause/wait between UI steps (default: {TIMING_PROFILE})")
     
     subparsers = parser.add_subparsers(dest="command", help="Commands")
     
@@ -868,6 +1240,11 @@ def main():
     upload_parser.add_argument("--notebook-id", help="Target notebook ID from library")
     upload_parser.add_argument("--create-notebook", help="Create new notebook with this name")
     upload_parser.add_argument("--show-browser", action="store_true", help="Show browser")
+    upload_parser.add_argument("--force", action="store_true", help="Upload even if already uploaded before")
+    upload_parser.add_argument("--bulk", action="store_true",
+                               help="Select several files per file chooser and confirm each batch once")
+    upload_parser.add_argument("--batch-size", type=_positive_int, default=UPLOAD_BATCH_SIZE,
+                               help=f"Files per file chooser with --bulk (default: {UPLOAD_BATCH_SIZE})")
     
     # Upload directory
     dir_parser = subparsers.add_parser("upload-dir", help="Upload files from directory")
@@ -877,6 +1254,11 @@ def main():
     dir_parser.add_argument("--notebook-id", help="Target notebook ID from library")
     dir_parser.add_argument("--create-notebook", help="Create new notebook with this name")
     dir_parser.add_argument("--show-browser", action="store_true", help="Show browser")
+    dir_parser.add_argument("--force", action="store_true", help="Upload even if already uploaded before")
+    dir_parser.add_argument("--bulk", action="store_true",
+                            help="Select several files per file chooser and confirm each batch once")
+    dir_parser.add_argument("--batch-size", type=_positive_int, default=UPLOAD_BATCH_SIZE,
+                            help=f"Files per file chooser with --bulk (default: {UPLOAD_BATCH_SIZE})")
     
     # Add URLs
     url_parser = subparsers.add_parser("add-urls", help="Add website/YouTube URLs")
@@ -884,6 +1266,7 @@ def main():
     url_parser.add_argument("--notebook-url", help="Target notebook URL")
     url_parser.add_argument("--notebook-id", help="Target notebook ID from library")
     url_parser.add_argument("--show-browser", action="store_true", help="Show browser")
+    url_parser.add_argument("--force", action="store_true", help="Upload even if already uploaded before")
     
     # Add text
     text_parser = subparsers.add_parser("add-text", help="Add pasted text content")
@@ -892,6 +1275,43 @@ def main():
     text_parser.add_argument("--notebook-url", help="Target notebook URL")
     text_parser.add_argument("--notebook-id", help="Target notebook ID from library")
     text_parser.add_argument("--show-browser", action="store_true", help="Show browser")
+    text_parser.add_argument("--force", action="store_true", help="Upload even if already uploaded before")
+    
+    # Sync directory
+    sync_parser = subparsers.add_parser("sync", help="Upload only new or modified files from a directory")
+    sync_parser.add_argument("--directory", required=True, help="Directory path")
+    sync_parser.add_argument("--extensions", help="Comma-separated extensions (e.g., pdf,md,txt)")
+    sync_parser.add_argument("--notebook-url", help="Target notebook URL")
+    sync_parser.add_argument("--notebook-id", help="Target notebook ID from library")
+    sync_parser.add_argument("--bulk", action="store_true",
+                             help="Select several files per file chooser and confirm each batch once")
+    sync_parser.add_argument("--batch-size", type=_positive_int, default=UPLOAD_BATCH_SIZE,
+                             help=f"Files per file chooser with --bulk (default: {UPLOAD_BATCH_SIZE})")
+    sync_parser.add_argument("--dry-run", action="store_true", help="Only show what would be uploaded")
+    sync_parser.add_argument("--show-browser", action="store_true", help="Show browser")
+    
+    # Directory scan filters
+    for scan_parser in (dir_parser, sync_parser):
+        scan_parser.add_argument("--include", help="Comma-separated glob patterns files must match (e.g. 'docs/*,*.md')")
+        scan_parser.add_argument("--exclude", help="Comma-separated glob patterns for files/directories to skip")
+        scan_parser.add_argument("--no-recursive", action="store_true", help="Only scan the top-level directory")
+        scan_parser.add_argument("--include-hidden", action="store_true",
+                                 help="Also scan files and directories whose name starts with '.'")
+        scan_parser.add_argument("--min-size", type=parse_size, help="Skip files smaller than this (e.g. 1K)")
+        scan_parser.add_argument("--max-size", type=parse_size, help="Skip files larger than this (e.g. 50M)")
+        scan_parser.add_argument("--modified-within-days", type=float,
+                                 help="Only files modified in the last N days")
+    
+    # Parallel job file
+    jobs_parser = subparsers.add_parser("jobs", help="Fill several notebooks from a JSON job file in parallel tabs")
+    jobs_parser.add_argument("--file", required=True,
+                             help='JSON mapping notebook URL/ID to {"files": [...], "urls": [...], "texts": [...]}')
+    jobs_parser.add_argument("--tabs", type=int, default=UPLOAD_TABS,
+                             help=f"Notebooks uploaded at the same time (default: {UPLOAD_TABS})")
+    jobs_parser.add_argument("--retries", type=int, default=UPLOAD_MAX_RETRIES,
+                             help=f"Retries per source (default: {UPLOAD_MAX_RETRIES})")
+    jobs_parser.add_argument("--show-browser", action="store_true", help="Show browser")
+    jobs_parser.add_argument("--force", action="store_true", help="Upload even if already uploaded before")
     
     args = parser.parse_args()
     
@@ -899,9 +1319,11 @@ def main():
         parser.print_help()
         return
     
+    timing.set_profile(args.timing_profile)
+    
     # Initialize manager
     show_browser = getattr(args, "show_browser", False)
-    manager = UploadManager(show_browser=show_browser)
+    manager = UploadManager(show_browser=show_browser, force=getattr(args, "force", False))
     
     # Execute command
     if args.command == "create":
@@ -913,7 +1335,9 @@ def main():
             files=files,
             notebook_url=args.notebook_url,
             notebook_id=args.notebook_id,
-            create_notebook=args.create_notebook
+            create_notebook=args.create_notebook,
+            bulk=args.bulk,
+            batch_size=args.batch_size
         )
         
     elif args.command == "upload-dir":
@@ -923,7 +1347,10 @@ def main():
             extensions=extensions,
             notebook_url=args.notebook_url,
             notebook_id=args.notebook_id,
-            create_notebook=args.create_notebook
+            create_notebook=args.create_notebook,
+            bulk=args.bulk,
+            batch_size=args.batch_size,
+            scan_options=_scan_options(args)
         )
         
     elif args.command == "add-urls":
@@ -950,9 +1377,27 @@ def main():
             notebook_id=args.notebook_id
         )
     
+    elif args.command == "sync":
+        extensions = [e.strip() for e in args.extensions.split(",")] if args.extensions else None
+        result = manager.sync_directory(
+            directory=args.directory,
+            extensions=extensions,
+            notebook_url=args.notebook_url,
+            notebook_id=args.notebook_id,
+            bulk=args.bulk,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+            scan_options=_scan_options(args)
+        )
+        
+    elif args.command == "jobs":
+        from upload_jobs import run_upload_jobs
+        result = run_upload_jobs(args.file, manager, tabs=max(1, args.tabs), max_retries=args.retries)
+    
     # Output result
     print("\n" + "=" * 50)
     print(json.dumps(result, indent=2, ensure_ascii=False))
+    timing.report()
 
 
 if __name__ == "__main__":